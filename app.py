@@ -4,153 +4,213 @@ All panels visible simultaneously, keyboard-driven, fully reactive.
 Number keys 1-4 jump to each section instantly.
 """
 
+import functools
 import os
+import re
+import textwrap
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from types import MappingProxyType
 
 # Auto-load .env
 _env = Path(__file__).parent / ".env"
-if _env.exists():
-    for _line in _env.read_text().splitlines():
-        _line = _line.strip()
-        if _line and not _line.startswith("#") and "=" in _line:
-            _k, _, _v = _line.partition("=")
+if _env.is_file():
+    for _raw in _env.read_bytes().split(b"\n"):
+        _raw = _raw.strip()
+        if b"=" in _raw and not _raw.startswith(b"#"):
+            _k, _, _v = _raw.decode().partition("=")
             os.environ.setdefault(_k.strip(), _v.strip())
 
 from textual.app import App, ComposeResult
 from textual.binding import Binding
 from textual.containers import Horizontal, Vertical, ScrollableContainer
-from textual.coordinate import Coordinate
 from textual.reactive import reactive
-from textual.widgets import DataTable, Header, Input, Label, Static
-from textual import work
+from textual.widgets import DataTable, Header, Input, Static
+from textual.worker import get_current_worker
+from textual import on, work
 
+# Leading letter of a grade → Rich color; anything else (F, E, …) is red
+_GRADE_COLOR = MappingProxyType({
+    "A": "bold green",
+    "B": "green",
+    "C": "yellow",
+    "D": "dark_orange",
+})
+
+
+@functools.lru_cache(maxsize=32)   # a dozen letters, looked up per row render
 def _grade_color(letter: str) -> str:
     """Map letter grade to a Rich color."""
     if not letter or letter == "—":
         return "dim"
-    l = letter.upper()
-    if l.startswith("A"):  return "bold green"
-    if l.startswith("B"):  return "green"
-    if l.startswith("C"):  return "yellow"
-    if l.startswith("D"):  return "dark_orange"
-    return "red"
+    return _GRADE_COLOR.get(letter[0].upper(), "red")
+
+
+def _grade_summary(results: list[dict]) -> tuple[float, int]:
+    """Average score of the graded results and how many succeeded, in one pass."""
+    total, graded, ok = 0.0, 0, 0
+    for r in results:
+        if not r.get("error"):
+            ok += 1
+            if r["letter_grade"] != "—":
+                total  += r["score"]
+                graded += 1
+    return (total / graded if graded else 0), ok
+
+
+_PARA_RE = re.compile(r"\n{2,}")
+
+
+def _iwrap(text: str, width: int = 56) -> Iterator[str]:
+    """Yield text word-wrapped into indented lines of `width` chars, one
+    blank line after each paragraph."""
+    for para in _PARA_RE.split(text):
+        yield from textwrap.wrap(
+            " ".join(para.split()), width + 2,
+            initial_indent="  ", subsequent_indent="  ",
+            break_long_words=False, break_on_hyphens=False,
+        )
+        yield ""   # blank line between paragraphs
 
 
 from src.auth import get_api_token, create_canvas_connection
-from src.courses import get_courses, get_current_term_courses, format_course_info
-from src.students import get_students, format_student_grade
+from src.courses import (
+    format_course_info, get_course_cached, get_courses, get_current_term_courses,
+)
+from src.students import format_all_students, get_students
 from src.assignments import list_assignments
 from src.grading import list_submissions, format_submission
 from src.grading_ai import (
-    get_assignment_requirements, grade_one_submission, post_grades
+    GRADE_BATCH_SIZE, get_assignment_requirements, grade_many_submissions,
+    grade_one_submission, post_grades,
+)
+from src.attachments import (
+    download_attachment, fetch_attachment_content, format_size
 )
-from src.attachments import fetch_attachment_content, format_size
 
 
-# ─────────────────────────────────────────────────────────────────────────────
-# CSS
-# ─────────────────────────────────────────────────────────────────────────────
+def _att_key(att_obj) -> object:
+    """Identity of a Canvas attachment, for sharing work on it."""
+    return getattr(att_obj, "id", None) or id(att_obj)
+
+
+def _submission_text(sub: dict, fetch) -> tuple[str, str]:
+    """Text to grade for a submission (body plus readable attachments),
+    and an error that is set when it has attachments but nothing readable
+    came out of them, so it is never graded as a blank submission.
+
+    fetch(att_obj) returns a fetch_attachment_content() result dict.
+    """
+    text_parts = []
+    problems   = []
+    if sub.get("body"):
+        text_parts.append(sub["body"])
+    for att_meta in (sub.get("attachments") or []):
+        fname   = att_meta.get("filename", "unknown")
+        att_obj = att_meta.get("_att_obj")
+        if not att_obj:
+            problems.append(f"{fname}: attachment object unavailable")
+            continue
+        fetched = fetch(att_obj)
+        if fetched.get("text"):
+            text_parts.append(f"[File: {fname}]\n" + fetched["text"])
+        else:
+            problems.append(f"{fname}: {fetched.get('error') or 'no text'}")
+    text = "\n\n".join(text_parts)
+    if problems and not text.strip():
+        return text, "Could not read attachments — " + "; ".join(problems)
+    return text, ""
+
+
+def _unreadable(error: str) -> dict:
+    """Grade result for a submission whose content could not be read."""
+    return {"score": 0.0, "letter_grade": "—", "comments": "", "error": error}
+
+
+# Panel title text, shared by compose() and every title refresh
+_PANEL_TITLES = MappingProxyType({
+    "courses":     "📚 COURSES [1]",
+    "students":    "👥 STUDENTS [2]",
+    "assignments": "📝 ASSIGNMENTS [3]",
+    "submissions": "🗂 SUBMISSIONS [4]",
+    "detail":      "📄 SUBMISSION DETAIL",
+})
+
+# Table panels: panel key → column headers (panel-<key> holds tbl-<key>)
+_TABLE_COLUMNS = MappingProxyType({
+    "courses":     ("Code", "Course Name", "Stu"),
+    "students":    ("Name", "Grade", "Score", "Final"),
+    "assignments": ("Assignment Name", "Pts", "Due", "⏳"),
+    "submissions": ("Student", "Submitted", "State", "Score", "Attachments"),
+})
+
+# Cell widths (chars) that table text is clipped to
+_TITLE_W    = 36   # course / assignment names
+_STUDENT_W  = 28   # student names in the students table
+_SUBBER_W   = 24   # student names in the submissions table
+_STAMP_W    = 16   # ISO timestamps, to the minute
+_STATE_W    = 14   # workflow state
+
+
+def _table_panel(key: str) -> Vertical:
+    """Build one bordered panel wrapping the DataTable for `key`."""
+    return Vertical(
+        DataTable(id=f"tbl-{key}", cursor_type="row"),
+        id=f"panel-{key}", classes="panel",
+    )
+
+
+# Rapid course switches within this window collapse into a single load
+_SWITCH_DEBOUNCE_S = 0.04
+
+# Percentage floor for each letter, highest first; anything lower is an F
+_LETTER_CUTOFFS = ((90, "A"), (80, "B"), (70, "C"), (60, "D"))
+# Letter for each whole percentage 0–100, built from the cutoffs above
+_LETTER_LUT = "".join(
+    next((letter for cutoff, letter in _LETTER_CUTOFFS if pct >= cutoff), "F")
+    for pct in range(101)
+)
 
-CSS = """
-Screen {
-    background: #0d1117;
-    layers: default;
-}
-
-/* ── rows ── */
-#top-row {
-    height: 35%;
-    min-height: 8;
-}
-#bottom-row {
-    height: 65%;
-    min-height: 16;
-}
-
-/* ── panel base ── */
-.panel {
-    border: round #2a3a4a;
-    background: #0d1117;
-}
-.panel:focus-within {
-    border: round #00b4d8;
-}
-
-/* top panels */
-#panel-courses    { width: 28%; min-width: 24; }
-#panel-students   { width: 36%; min-width: 28; }
-#panel-assignments{ width: 36%; min-width: 28; }
-
-/* bottom panels */
-#panel-submissions { width: 50%; min-width: 30; }
-#panel-detail      { width: 50%; min-width: 30; }
-
-/* ── panel titles ── */
-.panel-title {
-    text-style: bold;
-    color: #58a6ff;
-    background: #161b22;
-    width: 100%;
-    padding: 0 1;
-    height: 1;
-}
-.panel:focus-within .panel-title {
-    color: #f0f6fc;
-    background: #00b4d8;
-}
-
-/* ── DataTable ── */
-DataTable {
-    background: #0d1117;
-    height: 1fr;
-}
-DataTable > .datatable--header {
-    background: #161b22;
-    color: #58a6ff;
-    text-style: bold;
-}
-DataTable > .datatable--cursor {
-    background: #1f4068;
-    color: #e6edf3;
-    text-style: bold;
-}
-DataTable > .datatable--hover {
-    background: #21262d;
-}
-
-/* ── detail pane ── */
-#detail-scroll {
-    height: 1fr;
-    padding: 0 1;
-}
-.detail-key {
-    color: #58a6ff;
-    text-style: bold;
-}
-.detail-val {
-    color: #c9d1d9;
-}
-.detail-body {
-    color: #8b949e;
-    margin-top: 1;
-}
-
-/* ── bars ── */
-#status-bar {
-    dock: bottom;
-    height: 1;
-    background: #161b22;
-    color: #8b949e;
-    padding: 0 2;
-}
-#key-bar {
-    dock: bottom;
-    height: 1;
-    background: #0d1117;
-    color: #484f58;
-    padding: 0 1;
-}
-"""
+# Detail-panel bodies; filled with str.format_map
+_DETAIL_HDR_TMPL = (
+    "[bold cyan]Student:[/]    {name}\n"
+    "[bold cyan]Submitted:[/]  {subat}\n"
+    "[bold cyan]Status:[/]     {status}\n"
+    "[bold cyan]Score:[/]      {score}\n"
+    "[bold cyan]Files:[/]      {nfiles} attachment(s)\n"
+    "\n[bold cyan]── Loading content… ──────────────────────────[/]"
+)
+_STUDENT_GRADE_TMPL = (
+    "[bold cyan]Student:[/]    {student}\n"
+    "[bold cyan]Assignment:[/] {assignment}\n"
+    "[bold cyan]Score:[/]      {score}\n"
+    "[bold cyan]Grade:[/]      {grade}\n"
+    "[bold cyan]Status:[/]     {state}\n"
+    "[bold cyan]Submitted:[/]  {submitted}"
+)
+
+# One line of the grading results table
+_RESULT_ROW_TMPL = (
+    "[white]{name:<26}[/] "
+    "[{color}]{score:>6}[/] "
+    "[{color}]{grade:>5}[/]  "
+    "[italic #aaaaaa]{comment}[/]"
+)
+
+# Streamed detail text, progress status and the grading progress
+# panel are painted at most this often
+_FLUSH_S = 0.1
+
+# Row-selection dispatch: table id → handler method name
+_ROW_HANDLERS = MappingProxyType({
+    "tbl-courses":     "_on_course_row",
+    "tbl-assignments": "_on_assignment_row",
+    "tbl-students":    "_on_student_row",
+    "tbl-submissions": "_on_submission_row",
+})
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -159,13 +219,13 @@ DataTable > .datatable--hover {
 
 class CanvasCommandCenter(App):
     TITLE = "Canvas Command Center"
-    CSS = CSS
+    CSS_PATH = "app.tcss"
 
     BINDINGS = [
-        Binding("1",         "focus_courses",     "Courses",     show=False),
-        Binding("2",         "focus_students",    "Students",    show=False),
-        Binding("3",         "focus_assignments", "Assignments", show=False),
-        Binding("4",         "focus_submissions", "Submissions", show=False),
+        Binding("1",         "focus_panel('courses')",     "Courses",     show=False),
+        Binding("2",         "focus_panel('students')",    "Students",    show=False),
+        Binding("3",         "focus_panel('assignments')", "Assignments", show=False),
+        Binding("4",         "focus_panel('submissions')", "Submissions", show=False),
         Binding("tab",       "focus_next",        "Next",        show=False),
         Binding("shift+tab", "focus_previous",    "Prev",        show=False),
         Binding("r",         "reload",            "Reload"),
@@ -191,8 +251,43 @@ class CanvasCommandCenter(App):
         self._grading_mode   = False          # True when pending confirm/cancel
         self._pending_grades: list[dict] = [] # graded results awaiting submit
         self._grade_req: dict | None = None   # current assignment requirements
+        self._req_future = None               # ((course, assignment), Future) prefetched on pick
         self._edit_state: str | None = None   # None / "select_student" / "enter_score"
         self._edit_idx: int = 0               # index into _pending_grades being edited
+        self._tables: dict[str, DataTable] = {}  # panel key → table, set in on_mount
+        self._panels: dict[str, Vertical] = {}   # panel key → panel container
+        self._w_status: Static | None = None  # status bar, set in on_mount
+        self._w_detail: Static | None = None  # detail panel body, set in on_mount
+        self._w_edit:   Input | None  = None  # inline grade editor, set in on_mount
+        self._row_dispatch = {                # table id → bound row handler
+            tid: getattr(self, name) for tid, name in _ROW_HANDLERS.items()
+        }
+        self._sub_cols: list = []             # submissions column keys, set in on_mount
+        self._sub_rows: dict[str, tuple] = {} # row key → cells last rendered
+        self._submissions_cache: dict[str, dict] = {}  # str(user_id) → submission
+        self._prewarm_started_for: int | None = None   # assignment being prewarmed
+        self._course_names:  dict[str, str] = {}  # row key → full name, per table
+        self._student_names: dict[str, str] = {}
+        self._assign_names:  dict[str, str] = {}
+        self._fmt_cache: dict = {}            # submission id → format_submission()
+        self._detail_seq = 0                  # bumped whenever the detail view changes owner
+        self._detail_pending: tuple[int, str] | None = None  # (seq, text) awaiting paint
+        self._status_pending: str | None = None  # progress message awaiting paint
+        self._pending_course: tuple[int, str] | None = None  # latest course pick
+        self._course_timer = None             # debounce timer for course switches
+        self._io_pool = ThreadPoolExecutor(   # shared pool for Canvas fan-out
+            max_workers=8, thread_name_prefix="canvas-io"
+        )
+        # Attachment download + parse + OCR can take minutes; kept apart so
+        # it never holds up the quick Canvas calls on _io_pool
+        self._att_pool = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="att-view"
+        )
+        # _att_key → Future of the fetch_attachment_content() call in flight,
+        # so the viewer, the grader and a regrade never parse or OCR the
+        # same attachment twice at once
+        self._att_fetches: dict[object, Future] = {}
+        self._att_fetches_lock = threading.Lock()
 
     # ── layout ───────────────────────────────────────────────────────────
 
@@ -201,28 +296,18 @@ class CanvasCommandCenter(App):
 
         # ── Top row: Courses | Students | Assignments ─────────────────
         with Horizontal(id="top-row"):
-            with Vertical(id="panel-courses", classes="panel"):
-                yield Label(" 📚 COURSES [1] ", classes="panel-title", id="title-courses")
-                yield DataTable(id="tbl-courses", cursor_type="row")
-
-            with Vertical(id="panel-students", classes="panel"):
-                yield Label(" 👥 STUDENTS [2] ", classes="panel-title", id="title-students")
-                yield DataTable(id="tbl-students", cursor_type="row")
-
-            with Vertical(id="panel-assignments", classes="panel"):
-                yield Label(" 📝 ASSIGNMENTS [3] ", classes="panel-title", id="title-assignments")
-                yield DataTable(id="tbl-assignments", cursor_type="row")
+            for key in ("courses", "students", "assignments"):
+                yield _table_panel(key)
 
         # ── Bottom row: Submissions list | Submission detail ──────────
         with Horizontal(id="bottom-row"):
-            with Vertical(id="panel-submissions", classes="panel"):
-                yield Label(" 🗂 SUBMISSIONS [4] ", classes="panel-title", id="title-submissions")
-                yield DataTable(id="tbl-submissions", cursor_type="row")
+            yield _table_panel("submissions")
 
             with Vertical(id="panel-detail", classes="panel"):
-                yield Label(" 📄 SUBMISSION DETAIL ", classes="panel-title", id="title-detail")
                 with ScrollableContainer(id="detail-scroll"):
                     yield Static("", id="detail-content")
+                    yield Input(placeholder="Student number (0=cancel)",
+                                id="grade-edit-input")
 
         yield Static(" Connecting…", id="status-bar")
         yield Static(
@@ -233,36 +318,120 @@ class CanvasCommandCenter(App):
         )
 
     def on_mount(self) -> None:
-        self.query_one("#tbl-courses", DataTable).add_columns("Code", "Course Name", "Stu")
-        self.query_one("#tbl-students", DataTable).add_columns("Name", "Grade", "Score", "Final")
-        self.query_one("#tbl-assignments", DataTable).add_columns("Assignment Name", "Pts", "Due", "⏳")
-        self.query_one("#tbl-submissions", DataTable).add_columns(
-            "Student", "Submitted", "State", "Score", "Attachments"
-        )
-        self.query_one("#tbl-courses").focus()
+        # Resolve long-lived widgets once; helpers and workers use these refs
+        self._panels = {key: self.query_one(f"#panel-{key}") for key in _PANEL_TITLES}
+        self._tables = {
+            key: self.query_one(f"#tbl-{key}", DataTable)
+            for key in _TABLE_COLUMNS
+        }
+        self._w_status = self.query_one("#status-bar", Static)
+        self._w_detail = self.query_one("#detail-content", Static)
+        self._w_edit   = self.query_one("#grade-edit-input", Input)
+        for key, title in _PANEL_TITLES.items():
+            self._set_title(key, f" {title} ")
+        self.set_interval(_FLUSH_S, self._flush_detail)
+        self.set_interval(_FLUSH_S, self._flush_status)
+        for key, columns in _TABLE_COLUMNS.items():
+            col_keys = self._tables[key].add_columns(*columns)
+            if key == "submissions":
+                self._sub_cols = col_keys
+        self._tables["courses"].focus()
         self.connect_and_load()
 
+    def on_unmount(self) -> None:
+        self._io_pool.shutdown(wait=False, cancel_futures=True)
+        self._att_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _fetch_attachment(self, att_obj, path: str | None = None) -> dict:
+        """fetch_attachment_content(att_obj, path), shared with any other
+        thread already fetching the same attachment: the first caller does
+        the work and the rest wait for its result."""
+        key = _att_key(att_obj)
+        with self._att_fetches_lock:
+            fut   = self._att_fetches.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._att_fetches[key] = Future()
+        if not owner:
+            return fut.result()
+        try:
+            result = fetch_attachment_content(att_obj, path)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            fut.set_result(result)
+            return result
+        finally:
+            with self._att_fetches_lock:
+                self._att_fetches.pop(key, None)
+
     # ── helpers ───────────────────────────────────────────────────────────
 
     def _status(self, msg: str) -> None:
+        self._status_pending = None   # supersedes any queued progress
         try:
-            self.query_one("#status-bar", Static).update(f" {msg}")
+            self._w_status.update(f" {msg}")
         except Exception:
             pass
 
+    def _post_status(self, msg: str) -> None:
+        """Queue a progress message for the next flush; safe from any thread.
+
+        Only the latest message per flush is shown. Final outcomes go
+        through _status so they are never dropped or overwritten.
+        """
+        self._status_pending = msg
+
+    def _flush_status(self) -> None:
+        msg, self._status_pending = self._status_pending, None
+        if msg is not None:
+            self._w_status.update(f" {msg}")
+
+    def _fmt_sub(self, sub: dict) -> dict:
+        """format_submission(), memoised per submission until the next load."""
+        sid  = sub.get("id", id(sub))
+        info = self._fmt_cache.get(sid)
+        if info is None:
+            info = self._fmt_cache[sid] = format_submission(sub)
+        return info
+
+    def _requirements(self, course_id: int, assign_id: int) -> dict:
+        """Assignment requirements, from the pick-time prefetch when it matches."""
+        pre = self._req_future
+        if pre is not None and pre[0] == (course_id, assign_id):
+            try:
+                return pre[1].result()
+            except Exception:
+                self._req_future = None   # don't replay a failed fetch
+                raise
+        return get_assignment_requirements(self.canvas, course_id, assign_id)
+
+    def _set_title(self, key: str, text: str) -> None:
+        if key == "detail":
+            self._detail_seq += 1   # a retitled detail panel has a new owner
+        self._panels[key].border_title = text
+
+    def _flush_detail(self) -> None:
+        """Paint the latest streamed detail text, unless its view was replaced."""
+        pending, self._detail_pending = self._detail_pending, None
+        if pending and pending[0] == self._detail_seq:
+            self._w_detail.update(pending[1])
+
     def _clear_detail(self, hint: str = "") -> None:
-        self.query_one("#detail-content", Static).update(hint)
-        self.query_one("#title-detail", Label).update(" 📄 SUBMISSION DETAIL ")
+        with self.batch_update():
+            self._w_detail.update(hint)
+            self._set_title("detail", f" {_PANEL_TITLES['detail']} ")
 
     # ── workers ───────────────────────────────────────────────────────────
 
     @work(thread=True)
     def connect_and_load(self) -> None:
-        self.call_from_thread(self._status, "🔌 Connecting to Canvas LMS…")
+        self._post_status("🔌 Connecting to Canvas LMS…")
         try:
             token = get_api_token()
             self.canvas = create_canvas_connection(token)
-            self.call_from_thread(self._status, "📥 Fetching courses…")
+            self._post_status("📥 Fetching courses…")
             all_courses = get_courses(self.canvas)
             courses = get_current_term_courses(all_courses)
             term = "2026 Spring"
@@ -280,51 +449,85 @@ class CanvasCommandCenter(App):
             self.call_from_thread(self._status, f"❌  {e}")
 
     def _populate_courses(self, courses: list, term: str) -> None:
-        tbl = self.query_one("#tbl-courses", DataTable)
-        tbl.clear()
-        self.query_one("#title-courses", Label).update(
-            f" 📚 COURSES [1] — {term} ({len(courses)}) "
+        tbl = self._tables["courses"]
+        self._set_title(
+            "courses",
+            f" {_PANEL_TITLES['courses']} — {term} ({len(courses)}) "
         )
-        for c in courses:
-            i = format_course_info(c)
-            tbl.add_row(i["code"], i["name"][:36], str(i["students"]), key=str(i["id"]))
+        infos = [format_course_info(c) for c in courses]
+        self._course_names = {str(i["id"]): i["name"] for i in infos}
+        rows = [
+            (i["code"], i["name"][:_TITLE_W], str(i["students"]), str(i["id"]))
+            for i in infos
+        ]
+        with self.batch_update():
+            tbl.clear()
+            for *cells, key in rows:
+                tbl.add_row(*cells, key=key)
 
     @work(thread=True)
-    def load_students(self, course_id: int, course_name: str) -> None:
-        self.call_from_thread(self._status, f"📥 Loading students…")
-        try:
-            students = get_students(self.canvas, course_id)
-            self.call_from_thread(self._populate_students, students, course_name)
-            self.call_from_thread(
-                self._status,
-                f"✅ {len(students)} students  │  {course_name}"
-                "  │  [2] focus students panel"
-            )
-        except Exception as e:
-            self.call_from_thread(self._status, f"❌ Students: {e}")
+    def load_course(self, course_id: int, course_name: str) -> None:
+        """Fetch students and assignments side by side; paint whichever lands first."""
+        self._post_status("📥 Loading students and assignments…")
+        futs = {
+            self._io_pool.submit(get_students, self.canvas, course_id):
+                ("Students", self._populate_students),
+            self._io_pool.submit(list_assignments, self.canvas, course_id):
+                ("Assignments", self._populate_assignments),
+        }
+        counts, errors = {}, []
+        for fut in as_completed(futs):
+            label, populate = futs[fut]
+            try:
+                items = fut.result()
+            except Exception as e:
+                errors.append(f"{label}: {e}")
+                continue
+            if course_id != self.selected_course_id:
+                return   # user moved on to another course
+            self.call_from_thread(populate, items, course_name)
+            counts[label] = len(items)
+        if errors:
+            self.call_from_thread(self._status, "❌ " + "  │  ".join(errors))
+            return
+        self.call_from_thread(
+            self._status,
+            f"✅ {counts['Students']} students, {counts['Assignments']} assignments"
+            f"  │  {course_name}"
+            "  │  [2] students  [3] assignments — Enter to load submissions"
+        )
 
     def _populate_students(self, students: list, course_name: str) -> None:
-        tbl = self.query_one("#tbl-students", DataTable)
-        tbl.clear()
-        self.query_one("#title-students", Label).update(
-            f" 👥 STUDENTS [2] — {course_name[:28]} ({len(students)}) "
+        tbl = self._tables["students"]
+        self._set_title(
+            "students",
+            f" {_PANEL_TITLES['students']} — {course_name[:28]} ({len(students)}) "
         )
-        if not students:
-            tbl.add_row("No students", "—", "—", "—")
-            return
-        for s in students:
-            i = format_student_grade(s)
-            tbl.add_row(
-                i.get("name", "?")[:28],
+        infos = format_all_students(students)
+        self._student_names = {
+            str(i.get("user_id", i.get("name", "?"))): i.get("name", "?")
+            for i in infos
+        }
+        rows = [
+            (
+                i.get("name", "?")[:_STUDENT_W],
                 i.get("current_grade") or "—",
                 str(i.get("current_score") or "—"),
                 i.get("final_grade") or "—",
-                key=str(i.get("user_id", i.get("name", "?")))
+                str(i.get("user_id", i.get("name", "?"))),
             )
+            for i in infos
+        ]
+        with self.batch_update():
+            tbl.clear()
+            if not rows:
+                tbl.add_row("No students", "—", "—", "—")
+            for *cells, key in rows:
+                tbl.add_row(*cells, key=key)
 
     @work(thread=True)
     def load_assignments(self, course_id: int, course_name: str) -> None:
-        self.call_from_thread(self._status, f"📥 Loading assignments…")
+        self._post_status("📥 Loading assignments…")
         try:
             assignments = list_assignments(self.canvas, course_id)
             self.call_from_thread(self._populate_assignments, assignments, course_name)
@@ -337,34 +540,42 @@ class CanvasCommandCenter(App):
             self.call_from_thread(self._status, f"❌ Assignments: {e}")
 
     def _populate_assignments(self, assignments: list, course_name: str) -> None:
-        tbl = self.query_one("#tbl-assignments", DataTable)
-        tbl.clear()
-        self.query_one("#title-assignments", Label).update(
-            f" 📝 ASSIGNMENTS [3] — {course_name[:26]} ({len(assignments)}) "
+        tbl = self._tables["assignments"]
+        self._set_title(
+            "assignments",
+            f" {_PANEL_TITLES['assignments']} — {course_name[:26]} ({len(assignments)}) "
         )
-        if not assignments:
-            tbl.add_row("No assignments", "—", "—", "—")
-            return
+        rows, names = [], {}
         for a in assignments:
-            due = (a.get("due_at") or "—")[:16]
+            key      = str(a.get("id", a.get("name", "?")))
+            name     = a.get("name", "Untitled")
             ungraded = a.get("needs_grading_count", 0)
-            ungraded_str = f"[red]{ungraded}[/]" if ungraded > 0 else "[dim]0[/]"
-            tbl.add_row(
-                a.get("name", "Untitled")[:36],
+            names[key] = name
+            rows.append((
+                name[:_TITLE_W],
                 str(a.get("points_possible") or "—"),
-                due,
-                ungraded_str,
-                key=str(a.get("id", a.get("name", "?")))
-            )
+                (a.get("due_at") or "—")[:_STAMP_W],
+                f"[red]{ungraded}[/]" if ungraded > 0 else "[dim]0[/]",
+                key,
+            ))
+        self._assign_names = names
+        with self.batch_update():
+            tbl.clear()
+            if not rows:
+                tbl.add_row("No assignments", "—", "—", "—")
+            for *cells, key in rows:
+                tbl.add_row(*cells, key=key)
 
     @work(thread=True)
     def load_submissions(self, course_id: int, assign_id: int, assign_name: str) -> None:
-        self.call_from_thread(self._status, f"📥 Loading submissions for {assign_name}…")
-        self.call_from_thread(self.query_one("#tbl-submissions", DataTable).clear)
+        self._post_status(f"📥 Loading submissions for {assign_name}…")
+        self.call_from_thread(self._tables["submissions"].clear)
         self.call_from_thread(self._clear_detail, "Select a submission to view details →")
+        self._fmt_cache.clear()
         try:
             subs = list_submissions(self.canvas, course_id, assign_id)
             self.call_from_thread(self._populate_submissions, subs, assign_name)
+            self.call_from_thread(self._prewarm_attachments, assign_id, subs)
             self.call_from_thread(
                 self._status,
                 f"✅ {len(subs)} submission(s)  │  {assign_name}"
@@ -373,19 +584,53 @@ class CanvasCommandCenter(App):
         except Exception as e:
             self.call_from_thread(self._status, f"❌ Submissions: {e}")
 
+    @work(thread=True)
+    def _prewarm_attachments(self, assign_id: int, subs: list) -> None:
+        """Download every attachment of a freshly loaded assignment in the
+        background, so the HTTP disk cache is warm by the time it is
+        viewed or graded. Parsing and OCR (which cost API quota) wait
+        until then. Stops once another assignment is picked."""
+        if self._prewarm_started_for == assign_id:
+            return
+        self._prewarm_started_for = assign_id
+        atts = [
+            a["_att_obj"] for s in subs
+            for a in (s.get("attachments") or []) if a.get("_att_obj")
+        ]
+        if not atts:
+            return
+        worker = get_current_worker()
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="prewarm") as pool:
+            futures = [pool.submit(self._prewarm_one, att) for att in atts]
+            for fut in as_completed(futures):
+                if worker.is_cancelled or self.selected_assign_id != assign_id:
+                    for f in futures:
+                        f.cancel()
+                    break
+        if self._prewarm_started_for == assign_id:
+            self._prewarm_started_for = None
+
+    def _prewarm_one(self, att_obj) -> None:
+        """Download one attachment into the disk cache and drop the copy,
+        unless a full fetch of it is already under way."""
+        if _att_key(att_obj) in self._att_fetches:
+            return
+        try:
+            os.unlink(download_attachment(att_obj))
+        except Exception:
+            pass   # the real fetch retries and reports
+
     def _populate_submissions(self, subs: list, assign_name: str) -> None:
-        tbl = self.query_one("#tbl-submissions", DataTable)
-        tbl.clear()
+        tbl = self._tables["submissions"]
         resubmit_count = sum(1 for s in subs if s.get("resubmitted"))
         resub_note = f"  🔄 {resubmit_count} resubmitted" if resubmit_count else ""
-        self.query_one("#title-submissions", Label).update(
-            f" 🗂 SUBMISSIONS [4] — {assign_name[:30]} ({len(subs)}){resub_note} "
+        self._set_title(
+            "submissions",
+            f" {_PANEL_TITLES['submissions']} — {assign_name[:30]} ({len(subs)}){resub_note} "
         )
-        if not subs:
-            tbl.add_row("No submissions yet", "—", "—", "—")
-            return
+        rows: dict[str, tuple] = {}
         for s in subs:
-            info  = format_submission(s)
+            info  = self._fmt_sub(s)
             name  = info.get("student") or s.get("user_name") or "?"
             atts  = s.get("attachments") or []
             att_label = f"📎 {len(atts)}" if atts else "—"
@@ -395,16 +640,37 @@ class CanvasCommandCenter(App):
             if s.get("resubmitted"):
                 state_label = f"[bold yellow]🔄 resub #{attempt}[/]"
             else:
-                state_label = info.get("status", "—")[:14]
+                state_label = info.get("status", "—")[:_STATE_W]
 
-            tbl.add_row(
-                name[:24],
-                (info.get("submitted_at") or "—")[:16],
+            rows[str(s.get("user_id", name))] = (
+                name[:_SUBBER_W],
+                (info.get("submitted_at") or "—")[:_STAMP_W],
                 state_label,
                 str(info.get("score") or "—"),
                 att_label,
-                key=str(s.get("user_id", name))
             )
+        old = self._sub_rows
+        with self.batch_update():
+            # Rebuild only when the table no longer mirrors what we last
+            # drew (cleared elsewhere, placeholder row, first load)
+            if not old or not rows or tbl.row_count != len(old):
+                tbl.clear()
+                if not rows:
+                    tbl.add_row("No submissions yet", "—", "—", "—")
+                for key, cells in rows.items():
+                    tbl.add_row(*cells, key=key)
+            else:
+                for key in old.keys() - rows.keys():
+                    tbl.remove_row(key)
+                for key, cells in rows.items():
+                    prev = old.get(key)
+                    if prev is None:
+                        tbl.add_row(*cells, key=key)
+                    elif prev != cells:
+                        for col, was, now in zip(self._sub_cols, prev, cells):
+                            if was != now:
+                                tbl.update_cell(key, col, now)
+        self._sub_rows = rows
         # Store for detail lookup
         self._submissions_cache = {
             str(s.get("user_id", "?")): s for s in subs
@@ -413,61 +679,94 @@ class CanvasCommandCenter(App):
     # ── row selection ─────────────────────────────────────────────────────
 
     def on_data_table_row_selected(self, event: DataTable.RowSelected) -> None:
-        tbl = event.data_table
-        row = event.cursor_row
-
-        if tbl.id == "tbl-courses":
-            try:
-                course_id   = int(event.row_key.value)
-                course_name = str(tbl.get_cell_at(Coordinate(row, 1)))
-                self.selected_course_id   = course_id
-                self.selected_course_name = course_name
-                self.selected_assign_id   = None
-                self.query_one("#tbl-submissions", DataTable).clear()
-                self._clear_detail(
-                    "← Select an assignment then press Enter\n"
-                    "   to load submissions"
-                )
-                self.load_students(course_id, course_name)
-                self.load_assignments(course_id, course_name)
-            except Exception as e:
-                self._status(f"⚠️  {e}")
-
-        elif tbl.id == "tbl-assignments":
-            try:
-                assign_id   = int(event.row_key.value)
-                assign_name = str(tbl.get_cell_at(Coordinate(row, 0)))
-                self.selected_assign_id   = assign_id
-                self.selected_assign_name = assign_name
-                if self.selected_course_id:
-                    self.load_submissions(
-                        self.selected_course_id, assign_id, assign_name
-                    )
-            except Exception as e:
-                self._status(f"⚠️  {e}")
+        handler = self._row_dispatch.get(event.data_table.id)
+        if handler is None:
+            return
+        self._detail_seq += 1   # any pick retires an in-flight detail stream
+        try:
+            handler(event)
+        except Exception as e:
+            self._status(f"⚠️  {e}")
+
+    def _on_course_row(self, event: DataTable.RowSelected) -> None:
+        course_name = self._course_names.get(event.row_key.value)
+        if course_name is None:
+            return   # not a known course row
+        course_id = int(event.row_key.value)
+        if course_id == self.selected_course_id:
+            # Re-selecting the active course is a no-op; [r] reloads
+            self._status(
+                f"ℹ️  {self.selected_course_name} already loaded  │  \\[r] Reload"
+            )
+            return
+        self.selected_course_id   = course_id
+        self.selected_course_name = course_name
+        self.selected_assign_id   = None
+        with self.batch_update():
+            self._tables["submissions"].clear()
+            self._clear_detail(
+                "← Select an assignment then press Enter\n"
+                "   to load submissions"
+            )
+        # Coalesce rapid course switches: only the latest pick is loaded
+        self._pending_course = (course_id, course_name)
+        if self._course_timer is None:
+            self._course_timer = self.set_timer(
+                _SWITCH_DEBOUNCE_S, self._flush_course_switch
+            )
 
-        elif tbl.id == "tbl-students":
-            try:
-                user_id = event.row_key.value
-                student_name = str(tbl.get_cell_at(Coordinate(row, 0)))
-                if self.selected_assign_id:
-                    self.load_student_assignment_grade(int(user_id), student_name)
-            except Exception as e:
-                self._status(f"⚠️  {e}")
+    def _flush_course_switch(self) -> None:
+        self._course_timer = None
+        pending, self._pending_course = self._pending_course, None
+        if pending is None:
+            return
+        self.load_course(*pending)
+
+    def _on_assignment_row(self, event: DataTable.RowSelected) -> None:
+        assign_name = self._assign_names.get(event.row_key.value)
+        if assign_name is None:
+            return   # the "No assignments" placeholder row
+        assign_id = int(event.row_key.value)
+        if assign_id == self.selected_assign_id:
+            # Re-selecting the active assignment is a no-op; [s] reloads
+            self._status(
+                f"ℹ️  {self.selected_assign_name} already loaded  │  \\[s] Reload submissions"
+            )
+            return
+        self.selected_assign_id   = assign_id
+        self.selected_assign_name = assign_name
+        if self.selected_course_id:
+            self.load_submissions(
+                self.selected_course_id, assign_id, assign_name
+            )
+            # Grading is the likely next step; fetch its requirements now
+            if self._req_future is not None:
+                self._req_future[1].cancel()
+            self._req_future = (
+                (self.selected_course_id, assign_id),
+                self._io_pool.submit(
+                    get_assignment_requirements,
+                    self.canvas, self.selected_course_id, assign_id,
+                ),
+            )
 
-        elif tbl.id == "tbl-submissions":
-            try:
-                key = str(event.row_key.value)
-                cache = getattr(self, "_submissions_cache", {})
-                sub  = cache.get(key)
-                if sub:
-                    self._show_submission_detail(sub, tbl, row)
-            except Exception as e:
-                self._status(f"⚠️  {e}")
+    def _on_student_row(self, event: DataTable.RowSelected) -> None:
+        user_id = event.row_key.value
+        student_name = self._student_names.get(user_id)
+        if student_name is None:
+            return   # the "No students" placeholder row
+        if self.selected_assign_id:
+            self.load_student_assignment_grade(int(user_id), student_name)
+
+    def _on_submission_row(self, event: DataTable.RowSelected) -> None:
+        key = str(event.row_key.value)
+        sub = self._submissions_cache.get(key)
+        if sub:
+            self._show_submission_detail(sub, event.data_table, event.cursor_row)
 
     def _show_submission_detail(self, sub: dict, tbl: DataTable, row: int) -> None:
         """Render submission detail + attachment content in right panel."""
-        info   = format_submission(sub)
+        info   = self._fmt_sub(sub)
         name   = info.get("student") or sub.get("user_name", "Unknown")
         subat  = info.get("submitted_at") or "Not submitted"
         status = info.get("status", "—")
@@ -475,24 +774,29 @@ class CanvasCommandCenter(App):
         body   = sub.get("body") or ""
         atts   = sub.get("attachments") or []
 
-        self.query_one("#title-detail", Label).update(f" 📄 DETAIL — {name} ")
-        self.query_one("#detail-content", Static).update(
-            f"[bold cyan]Student:[/]    {name}\n"
-            f"[bold cyan]Submitted:[/]  {subat}\n"
-            f"[bold cyan]Status:[/]     {status}\n"
-            f"[bold cyan]Score:[/]      {score}\n"
-            f"[bold cyan]Files:[/]      {len(atts)} attachment(s)\n"
-            "\n[bold cyan]── Loading content… ──────────────────────────[/]"
-        )
+        self._set_title("detail", f" 📄 DETAIL — {name} ")
+        self._w_detail.update(_DETAIL_HDR_TMPL.format_map({
+            "name":   name,
+            "subat":  subat,
+            "status": status,
+            "score":  score,
+            "nfiles": len(atts),
+        }))
         # Fetch content in background thread
-        self.load_submission_content(sub, name, subat, status, score, body, atts)
+        self.load_submission_content(
+            self._detail_seq, sub, name, subat, status, score, body, atts
+        )
 
     @work(thread=True)
     def load_submission_content(
-        self, sub: dict, name: str, subat: str,
+        self, seq: int, sub: dict, name: str, subat: str,
         status: str, score: str, body: str, atts: list
     ) -> None:
-        """Download & parse attachments, then render full detail."""
+        """Download & parse attachments, streaming the detail as each lands.
+
+        Renders go through _detail_pending; _flush_detail paints them at
+        most every _FLUSH_S and drops them once `seq` is stale.
+        """
         attempt    = sub.get("attempt") or 1
         graded_at  = (sub.get("graded_at") or "")[:16]
         resubmit   = sub.get("resubmitted", False)
@@ -520,7 +824,7 @@ class CanvasCommandCenter(App):
                 date   = c.get("date", "")
                 text   = c.get("text", "")
                 lines.append(f"  [bold white]{author}[/] [dim]{date}[/]")
-                lines += self._wrap_text(text, width=54)
+                lines.extend(_iwrap(text, 54))
 
         # ── Inline body ──────────────────────────────────────────────
         if body:
@@ -528,11 +832,25 @@ class CanvasCommandCenter(App):
                 "",
                 "[bold cyan]── Text Body ─────────────────────────────────────[/]",
             ]
-            lines += self._wrap_text(body, width=56)
+            lines.extend(_iwrap(body, 56))
 
         # ── Attachments ──────────────────────────────────────────────
-        for i, att_meta in enumerate(atts):
-            att_obj  = att_meta.get("_att_obj")
+        # Download them all at once on the attachment pool, then render in
+        # upload order as each becomes ready
+        futs = [
+            self._att_pool.submit(self._fetch_attachment, a["_att_obj"])
+            if a.get("_att_obj") is not None else None
+            for a in atts
+        ]
+        for i, (att_meta, fut) in enumerate(zip(atts, futs)):
+            if seq != self._detail_seq:
+                for f in futs[i:]:   # user moved on; drop queued downloads
+                    if f is not None:
+                        f.cancel()
+                return
+            self._detail_pending = (
+                seq, "\n".join(lines + ["", "[dim]  Loading attachments…[/]"])
+            )
             fname    = att_meta.get("filename", "unknown")
             ctype    = att_meta.get("content_type", "")
             size_str = format_size(att_meta.get("size") or 0)
@@ -542,11 +860,11 @@ class CanvasCommandCenter(App):
                 f"[bold cyan]── 📎 Attachment {i+1}: {fname} ({size_str}) ─────────[/]",
             ]
 
-            if att_obj is None:
+            if fut is None:
                 lines.append("[dim]  (attachment object unavailable)[/]")
                 continue
 
-            result = fetch_attachment_content(att_obj)
+            result = fut.result()
             if result["error"]:
                 lines.append(f"[red]  ⚠ {result['error']}[/]")
             elif result["text"]:
@@ -555,35 +873,31 @@ class CanvasCommandCenter(App):
                     if seg.startswith("Embedded Image"):
                         header, _, body = seg.partition(" ──\n")
                         lines.append(f"[bold yellow]── {header} ──[/]")
-                        lines += self._wrap_text(body, width=54)
+                        lines.extend(_iwrap(body, 54))
                     elif seg.startswith("Image in page"):
                         lines.append(f"[bold yellow]{seg}[/]")
                     else:
-                        lines += self._wrap_text(seg, width=56)
+                        lines.extend(_iwrap(seg, 56))
             else:
                 lines.append("[dim]  (no extractable text)[/]")
 
-        self.call_from_thread(
-            self.query_one("#detail-content", Static).update,
-            "\n".join(lines)
-        )
+        self._detail_pending = (seq, "\n".join(lines))
 
     @work(thread=True)
     def load_student_assignment_grade(self, user_id: int, student_name: str) -> None:
         """Fetch and display a student's grade for the selected assignment."""
         assign_name = self.selected_assign_name
         self.call_from_thread(
-            self.query_one("#title-detail", Label).update,
+            self._set_title, "detail",
             f" 📄 DETAIL — {student_name} "
         )
         self.call_from_thread(
-            self.query_one("#detail-content", Static).update,
+            self._w_detail.update,
             f"[bold cyan]Loading grade for {student_name}…[/]"
         )
 
         # Check submissions cache first
-        cache = getattr(self, "_submissions_cache", {})
-        sub = cache.get(str(user_id))
+        sub = self._submissions_cache.get(str(user_id))
         if sub:
             score = sub.get("score")
             state = sub.get("workflow_state", "unsubmitted")
@@ -591,7 +905,7 @@ class CanvasCommandCenter(App):
             pts = (self._grade_req or {}).get("points_possible", 100)
         else:
             try:
-                course = self.canvas.get_course(self.selected_course_id)
+                course = get_course_cached(self.canvas, self.selected_course_id)
                 assignment = course.get_assignment(self.selected_assign_id)
                 submission = assignment.get_submission(user_id)
                 score = getattr(submission, "score", None)
@@ -600,7 +914,7 @@ class CanvasCommandCenter(App):
                 pts = getattr(assignment, "points_possible", 100) or 100
             except Exception as e:
                 self.call_from_thread(
-                    self.query_one("#detail-content", Static).update,
+                    self._w_detail.update,
                     f"[red]❌ Failed to fetch grade: {e}[/]"
                 )
                 return
@@ -608,48 +922,22 @@ class CanvasCommandCenter(App):
         if score is not None:
             letter = self._score_to_letter(float(score), float(pts))
             score_str = f"{score}/{pts}"
-            color = _grade_color(letter)
-            grade_line = f"[bold cyan]Grade:[/]      [{color}]{letter}[/]"
+            grade_str = f"[{_grade_color(letter)}]{letter}[/]"
         else:
-            score_str = "—"
-            grade_line = "[bold cyan]Grade:[/]      —"
+            score_str = grade_str = "—"
 
-        lines = [
-            f"[bold cyan]Student:[/]    {student_name}",
-            f"[bold cyan]Assignment:[/] {assign_name}",
-            f"[bold cyan]Score:[/]      {score_str}",
-            grade_line,
-            f"[bold cyan]Status:[/]     {state}",
-            f"[bold cyan]Submitted:[/]  {submitted_at or 'N/A'}",
-        ]
         self.call_from_thread(
-            self.query_one("#detail-content", Static).update,
-            "\n".join(lines)
+            self._w_detail.update,
+            _STUDENT_GRADE_TMPL.format_map({
+                "student":    student_name,
+                "assignment": assign_name,
+                "score":      score_str,
+                "grade":      grade_str,
+                "state":      state,
+                "submitted":  submitted_at or "N/A",
+            })
         )
 
-    @staticmethod
-    def _wrap_text(text: str, width: int = 56) -> list[str]:
-        """Word-wrap text into lines of `width` chars."""
-        import re
-        # Split into paragraphs first
-        paragraphs = re.split(r"\n{2,}", text)
-        result = []
-        for para in paragraphs:
-            para = para.replace("\n", " ").strip()
-            words = para.split()
-            buf, buf_len = [], 0
-            for w in words:
-                if buf_len + len(w) + 1 > width:
-                    result.append("  " + " ".join(buf))
-                    buf, buf_len = [w], len(w)
-                else:
-                    buf.append(w)
-                    buf_len += len(w) + 1
-            if buf:
-                result.append("  " + " ".join(buf))
-            result.append("")   # blank line between paragraphs
-        return result
-
     # ── AI grading ────────────────────────────────────────────────────────
 
     def action_grade_all(self) -> None:
@@ -657,7 +945,7 @@ class CanvasCommandCenter(App):
         if not self.selected_course_id or not self.selected_assign_id:
             self._status("⚠️  Select a course → assignment first, then press [i]")
             return
-        cache = getattr(self, "_submissions_cache", {})
+        cache = self._submissions_cache
         submitted = [s for s in cache.values()
                      if s.get("workflow_state") not in ("unsubmitted", None)
                      or s.get("body") or s.get("attachments")]
@@ -680,70 +968,52 @@ class CanvasCommandCenter(App):
 
         force_all=True bypasses the skip-already-graded filter (for regrade-all).
         """
-        cache = getattr(self, "_submissions_cache", {})
+        cache = self._submissions_cache
 
         # ── Step 1: Fetch requirements ────────────────────────────────
         self.call_from_thread(
-            self.query_one("#title-detail", Label).update,
+            self._set_title, "detail",
             f" 🤖 AI GRADING — {assign_name[:50]} "
         )
         self.call_from_thread(
-            self.query_one("#detail-content", Static).update,
+            self._w_detail.update,
             "[bold cyan]Fetching assignment requirements…[/]"
         )
-        self._status(f"🤖 Fetching requirements for: {assign_name}")
+        self._post_status(f"🤖 Fetching requirements for: {assign_name}")
 
         try:
-            req = get_assignment_requirements(
-                self.canvas, course_id, assign_id
-            )
+            req = self._requirements(course_id, assign_id)
         except Exception as e:
             self.call_from_thread(
-                self.query_one("#detail-content", Static).update,
+                self._w_detail.update,
                 f"[red]❌ Failed to fetch requirements: {e}[/]"
             )
-            self._status(f"❌ {e}")
+            self.call_from_thread(self._status, f"❌ {e}")
             return
 
         self._grade_req = req
         pts = req["points_possible"]
 
         # ── Step 2: Determine who to grade ───────────────────────────
-        subs_to_grade = [
-            s for s in cache.values()
-            if s.get("workflow_state") not in ("unsubmitted", None)
-            or s.get("body")
-            or s.get("attachments")
-        ]
-        # Grade submitted ones; skip already-graded unless force_all
-        subs_to_grade = list(cache.values())
-        already_graded = [
-            s for s in subs_to_grade
-            if s.get("workflow_state") == "graded"
-            and s.get("score") is not None
-            and not s.get("resubmitted")   # don't count resubmissions as "already done"
-        ]
-        if force_all:
-            # Regrade all — include already-graded and resubmissions
-            submitted_only = [
-                s for s in subs_to_grade
-                if s.get("workflow_state") not in ("unsubmitted", None, "")
-                or s.get("body") or s.get("attachments")
-            ]
-        else:
-            # Normal grade-all: skip already-graded (but resubmissions still get graded)
-            submitted_only = [
-                s for s in subs_to_grade
-                if (
-                    s.get("workflow_state") not in ("unsubmitted", None, "")
-                    or s.get("body") or s.get("attachments")
-                )
-                and not (
-                    s.get("workflow_state") == "graded"
-                    and s.get("score") is not None
-                    and not s.get("resubmitted")
-                )
-            ]
+        # One pass: drop empty submissions, note already-graded ones
+        # (resubmissions don't count as done) and grade the rest, or
+        # everything with content when force_all
+        already_graded: list[dict] = []
+        submitted_only: list[dict] = []
+        for s in cache.values():
+            state = s.get("workflow_state")
+            if (state in ("unsubmitted", None, "")
+                    and not (s.get("body") or s.get("attachments"))):
+                continue
+            done = (
+                state == "graded"
+                and s.get("score") is not None
+                and not s.get("resubmitted")
+            )
+            if done:
+                already_graded.append(s)
+            if force_all or not done:
+                submitted_only.append(s)
 
         total = len(submitted_only)
         skipped = len(already_graded)
@@ -758,21 +1028,24 @@ class CanvasCommandCenter(App):
                     + (" …" if skipped > 5 else "") + "[/]"
                 )
             self.call_from_thread(
-                self.query_one("#detail-content", Static).update, msg
+                self._w_detail.update, msg
             )
-            self._status(
-                f"⚠️  No ungraded submissions"
+            self.call_from_thread(
+                self._status,
+                "⚠️  No ungraded submissions"
                 + (f"  │  {skipped} already graded (skipped)" if skipped else "")
             )
             return
 
         # Track per-student status for live display
-        import threading
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-
         status_lock  = threading.Lock()
         done_count   = 0
-        status_lines: dict[int, str] = {}   # user_id → status string
+        last_render  = 0.0
+        # One status line per student, in submitted_only order
+        status_rows  = [
+            f"  [dim]○ {(sub.get('user_name') or 'Unknown')[:28]}[/]"
+            for sub in submitted_only
+        ]
 
         def _render_progress():
             skip_note = f"  [dim](skipped {skipped} already graded)[/]" if skipped else ""
@@ -781,130 +1054,142 @@ class CanvasCommandCenter(App):
                 f"[dim]{req['description'][:120]}…[/]\n\n"
                 f"[bold]Completed: {done_count}/{total}[/]{skip_note}\n"
             )
-            rows = "\n".join(status_lines[s.get("user_id")] for s in submitted_only
-                             if s.get("user_id") in status_lines)
             self.call_from_thread(
-                self.query_one("#detail-content", Static).update,
-                header + rows
-            )
-            self.call_from_thread(
-                self._status,
-                f"🤖 Grading in parallel… {done_count}/{total} done"
+                self._w_detail.update,
+                header + "\n".join(status_rows)
             )
+            self._post_status(f"🤖 Grading in parallel… {done_count}/{total} done")
+
+        def _render_due(final: bool = False) -> bool:
+            """Throttle progress renders to one per _FLUSH_S; call under
+            status_lock, render after releasing it. The last one always
+            goes through."""
+            nonlocal last_render
+            now = time.monotonic()
+            if final or now - last_render >= _FLUSH_S:
+                last_render = now
+                return True
+            return False
+
+        def _fetch(att_obj) -> dict:
+            try:
+                path = downloads[_att_key(att_obj)].result()
+            except Exception:
+                path = None   # let the fetch retry and report
+            return self._fetch_attachment(att_obj, path)
 
-        def _grade_one(sub: dict) -> dict:
+        def _grade_batch(batch: list[tuple[int, dict]]) -> list[dict]:
+            """Grade a group of submissions with one Claude call."""
             nonlocal done_count
-            name    = sub.get("user_name") or "Unknown"
-            state   = sub.get("workflow_state", "unsubmitted")
-            user_id = sub.get("user_id")
-
             with status_lock:
-                status_lines[user_id] = f"  [dim]⏳ {name[:28]}…[/]"
+                for idx, sub in batch:
+                    name = sub.get("user_name") or "Unknown"
+                    status_rows[idx] = f"  [dim]⏳ {name[:28]}…[/]"
+                render = _render_due()
+            if render:
                 _render_progress()
 
-            # Build submission text
-            if state in ("unsubmitted", None, ""):
-                grade_result = {
-                    "score": 0.0, "letter_grade": "—",
-                    "comments": "No submission", "error": ""
-                }
+            # Build submission texts; empty submissions never reach the AI
+            grades: dict[int, dict] = {}
+            to_grade = []
+            for idx, sub in batch:
+                if sub.get("workflow_state", "unsubmitted") in ("unsubmitted", None, ""):
+                    grades[idx] = {
+                        "score": 0.0, "letter_grade": "—",
+                        "comments": "No submission", "error": ""
+                    }
+                else:
+                    name = sub.get("user_name") or "Unknown"
+                    text, error = _submission_text(sub, _fetch)
+                    if error:
+                        grades[idx] = _unreadable(error)
+                    else:
+                        to_grade.append((idx, name, text))
+            if len(to_grade) == 1:
+                _, name, text = to_grade[0]
+                graded = [grade_one_submission(req, name, text, fresh=force_all)]
             else:
-                text_parts = []
-                if sub.get("body"):
-                    text_parts.append(sub["body"])
-                for att_meta in (sub.get("attachments") or []):
-                    att_obj = att_meta.get("_att_obj")
-                    if att_obj:
-                        fetched = fetch_attachment_content(att_obj)
-                        if fetched.get("text"):
-                            text_parts.append(
-                                f"[File: {att_meta['filename']}]\n"
-                                + fetched["text"]
-                            )
-                full_text = "\n\n".join(text_parts)
-                grade_result = grade_one_submission(req, name, full_text)
+                graded = grade_many_submissions(
+                    req, [(name, text) for _, name, text in to_grade],
+                    fresh=force_all,
+                )
+            for (idx, _, _), grade_result in zip(to_grade, graded):
+                grades[idx] = grade_result
 
+            out = []
             with status_lock:
-                done_count += 1
-                sc  = grade_result["score"]
-                gr  = grade_result["letter_grade"]
-                col = _grade_color(gr)
-                pts = req["points_possible"]
-                status_lines[user_id] = (
-                    f"  [{col}]✓ {name[:28]:<28} {sc:.0f}/{pts:.0f}  {gr}[/]"
-                )
+                for idx, sub in batch:
+                    grade_result = grades[idx]
+                    name = sub.get("user_name") or "Unknown"
+                    done_count += 1
+                    sc  = grade_result["score"]
+                    gr  = grade_result["letter_grade"]
+                    col = _grade_color(gr)
+                    pts = req["points_possible"]
+                    status_rows[idx] = (
+                        f"  [{col}]✓ {name[:28]:<28} {sc:.0f}/{pts:.0f}  {gr}[/]"
+                    )
+                    out.append({
+                        "user_id":      sub.get("user_id"),
+                        "student_name": name,
+                        "score":        grade_result["score"],
+                        "letter_grade": grade_result["letter_grade"],
+                        "comments":     grade_result["comments"],
+                        "error":        grade_result["error"],
+                        "state":        sub.get("workflow_state", "unsubmitted"),
+                    })
+                render = _render_due(final=done_count == total)
+            if render:
                 _render_progress()
-
-            return {
-                "user_id":      user_id,
-                "student_name": name,
-                "score":        grade_result["score"],
-                "letter_grade": grade_result["letter_grade"],
-                "comments":     grade_result["comments"],
-                "error":        grade_result["error"],
-                "state":        state,
-            }
+            return out
 
         # ── Step 3: Grade ALL in parallel ─────────────────────────────
-        # Initialise status board
-        for sub in submitted_only:
-            status_lines[sub.get("user_id")] = (
-                f"  [dim]○ {(sub.get('user_name') or 'Unknown')[:28]}[/]"
-            )
         _render_progress()
 
-        results_map: dict = {}
-        with ThreadPoolExecutor(max_workers=min(total, 8)) as pool:
-            futures = {pool.submit(_grade_one, sub): sub for sub in submitted_only}
-            for fut in as_completed(futures):
-                r = fut.result()
-                results_map[r["user_id"]] = r
+        # Start every attachment download now, on one pool, so grading
+        # threads mostly find their files already fetched
+        # Several students per Claude call, several calls in flight
+        indexed = list(enumerate(submitted_only))
+        batches = [
+            indexed[i:i + GRADE_BATCH_SIZE]
+            for i in range(0, total, GRADE_BATCH_SIZE)
+        ]
 
-        # Preserve original order
-        results = [results_map[s.get("user_id")] for s in submitted_only
-                   if s.get("user_id") in results_map]
+        with ThreadPoolExecutor(max_workers=16, thread_name_prefix="att-dl") as dl_pool, \
+             ThreadPoolExecutor(max_workers=min(len(batches), 8)) as pool:
+            downloads: dict = {}
+            for sub in submitted_only:
+                for att_meta in (sub.get("attachments") or []):
+                    att_obj = att_meta.get("_att_obj")
+                    if att_obj and _att_key(att_obj) not in downloads:
+                        downloads[_att_key(att_obj)] = dl_pool.submit(
+                            download_attachment, att_obj
+                        )
+            try:
+                # Batches are in submitted_only order, so collecting their
+                # futures in submission order keeps the results in it too;
+                # progress is reported by the workers themselves
+                futures = [pool.submit(_grade_batch, batch) for batch in batches]
+                results = [r for fut in futures for r in fut.result()]
+            finally:
+                # Downloads land in temp files; remove them once graded
+                for dl in downloads.values():
+                    try:
+                        os.unlink(dl.result())
+                    except Exception:
+                        pass
 
         # ── Step 4: Render results table ──────────────────────────────
         self._pending_grades = results
         self._grading_mode   = True
 
-        graded_scores = [r["score"] for r in results if not r["error"]
-                         and r["letter_grade"] != "—"]
-        avg = sum(graded_scores) / len(graded_scores) if graded_scores else 0
-
-        sep   = "─" * 62
-        lines = [
-            f"[bold cyan]🤖 AI GRADING RESULTS — {assign_name[:45]}[/]",
-            f"[dim]{sep}[/]",
-            f"[bold]{'Student':<26} {'Score':>6} {'Grade':>6}  Comments[/]",
-            f"[dim]{sep}[/]",
-        ]
-        for r in results:
-            score_str = f"{r['score']:.0f}/{pts:.0f}" if r["letter_grade"] != "—" else "—"
-            grade_str = r["letter_grade"]
-            comment   = r["comments"] or ("✓ Full marks" if not r["error"] else r["error"])
-            color     = _grade_color(r["letter_grade"])
-            lines.append(
-                f"[white]{r['student_name'][:26]:<26}[/] "
-                f"[{color}]{score_str:>6}[/] "
-                f"[{color}]{grade_str:>5}[/]  "
-                f"[italic #aaaaaa]{comment}[/]"
-            )
-
-        lines += [
-            f"[dim]{sep}[/]",
-            f"[dim]{total} graded  │  avg: {avg:.1f}/{pts:.0f}  │  "
-            f"{len([r for r in results if not r['error']])} successful[/]",
-            "",
-            "  [bold bright_cyan on #003344][ e ][/] edit grade   [bold bright_green on #003300][ y ][/] submit to Canvas   [bold bright_red on #330000][ n ][/] cancel",
-        ]
-
+        avg = _grade_summary(results)[0]
         self.call_from_thread(
-            self.query_one("#detail-content", Static).update,
-            "\n".join(lines)
+            self._w_detail.update,
+            self._grading_results_text(results, pts, assign_name)
         )
         self.call_from_thread(
-            self.query_one("#title-detail", Label).update,
+            self._set_title, "detail",
             f" 🤖 GRADING RESULTS — {assign_name[:40]} ── [e]=Edit [y]=Submit [n]=Cancel "
         )
         self.call_from_thread(
@@ -921,16 +1206,13 @@ class CanvasCommandCenter(App):
         pts      = req["points_possible"] if req else 100
 
         self.call_from_thread(
-            self.query_one("#detail-content", Static).update,
+            self._w_detail.update,
             "[bold cyan]📤 Submitting grades to Canvas…[/]"
         )
-        self._status("📤 Submitting grades…")
+        self._post_status("📤 Submitting grades…")
 
         def _progress(i, total, name):
-            self.call_from_thread(
-                self._status,
-                f"📤 Posting {i}/{total}: {name}…"
-            )
+            self._post_status(f"📤 Posting {i}/{total}: {name}…")
 
         outcome = post_grades(
             self.canvas,
@@ -959,11 +1241,11 @@ class CanvasCommandCenter(App):
             )
 
         self.call_from_thread(
-            self.query_one("#detail-content", Static).update,
+            self._w_detail.update,
             "\n".join(final_lines)
         )
         self.call_from_thread(
-            self.query_one("#title-detail", Label).update,
+            self._set_title, "detail",
             f" ✅ GRADES SUBMITTED — {self.selected_assign_name[:45]} "
         )
         self.call_from_thread(
@@ -975,16 +1257,17 @@ class CanvasCommandCenter(App):
         self._pending_grades = []
 
         # ── Sync cache & refresh panels ───────────────────────────────
-        # Build set of failed student names so we don't wrongly update them
-        failed_names = {e.split(":")[0].strip() for e in errs}
-        cache = getattr(self, "_submissions_cache", {})
+        # Only mark grades Canvas confirmed; failed ones keep their old state
+        failed_ids = {str(uid) for uid in outcome.get("failed", [])}
+        cache = self._submissions_cache
         for r in results:
-            if r.get("student_name") in failed_names:
-                continue
             uid = str(r.get("user_id", ""))
+            if uid in failed_ids:
+                continue
             if uid in cache:
                 cache[uid]["score"]          = r["score"]
                 cache[uid]["workflow_state"] = "graded"
+                self._fmt_cache.pop(cache[uid].get("id"), None)
 
         # Refresh submissions table with updated data
         assign_name = self.selected_assign_name
@@ -1020,7 +1303,7 @@ class CanvasCommandCenter(App):
         if not self.selected_course_id or not self.selected_assign_id:
             self._status("⚠️  Select a course → assignment → submission first")
             return
-        tbl = self.query_one("#tbl-submissions", DataTable)
+        tbl = self._tables["submissions"]
         if tbl.cursor_row < 0:
             self._status("⚠️  No submission selected in the Submissions panel")
             return
@@ -1030,8 +1313,7 @@ class CanvasCommandCenter(App):
         except (IndexError, AttributeError):
             self._status("⚠️  Could not identify selected submission row")
             return
-        cache = getattr(self, "_submissions_cache", {})
-        sub   = cache.get(uid)
+        sub   = self._submissions_cache.get(uid)
         if sub is None:
             self._status(f"⚠️  Submission not found in cache (uid={uid})")
             return
@@ -1042,7 +1324,7 @@ class CanvasCommandCenter(App):
         if not self.selected_course_id or not self.selected_assign_id:
             self._status("⚠️  Select a course → assignment first")
             return
-        cache = getattr(self, "_submissions_cache", {})
+        cache = self._submissions_cache
         if not cache:
             self._status("⚠️  No submissions loaded. Load submissions first [s]")
             return
@@ -1062,22 +1344,22 @@ class CanvasCommandCenter(App):
         attempt = sub.get("attempt") or 1
 
         self.call_from_thread(
-            self.query_one("#title-detail", Label).update,
+            self._set_title, "detail",
             f" 🔄 REGRADING — {name} (attempt #{attempt}) "
         )
         self.call_from_thread(
-            self.query_one("#detail-content", Static).update,
+            self._w_detail.update,
             f"[bold cyan]Fetching requirements and regrading {name}…[/]"
         )
-        self._status(f"🔄 Regrading {name}…")
+        self._post_status(f"🔄 Regrading {name}…")
 
         try:
-            req = get_assignment_requirements(
-                self.canvas, self.selected_course_id, self.selected_assign_id
+            req = self._requirements(
+                self.selected_course_id, self.selected_assign_id
             )
         except Exception as e:
             self.call_from_thread(
-                self.query_one("#detail-content", Static).update,
+                self._w_detail.update,
                 f"[red]❌ Failed to fetch requirements: {e}[/]"
             )
             return
@@ -1085,20 +1367,11 @@ class CanvasCommandCenter(App):
         pts = req["points_possible"]
 
         # Build submission text
-        text_parts = []
-        if sub.get("body"):
-            text_parts.append(sub["body"])
-        for att_meta in (sub.get("attachments") or []):
-            att_obj = att_meta.get("_att_obj")
-            if att_obj:
-                fetched = fetch_attachment_content(att_obj)
-                if fetched.get("text"):
-                    text_parts.append(
-                        f"[File: {att_meta['filename']}]\n" + fetched["text"]
-                    )
-        full_text = "\n\n".join(text_parts)
-
-        result = grade_one_submission(req, name, full_text)
+        full_text, error = _submission_text(sub, self._fetch_attachment)
+        if error:
+            result = _unreadable(error)
+        else:
+            result = grade_one_submission(req, name, full_text, fresh=True)
 
         score_str = f"{result['score']:.0f}/{pts:.0f}"
         color     = _grade_color(result["letter_grade"])
@@ -1130,11 +1403,11 @@ class CanvasCommandCenter(App):
         self._grading_mode = True
 
         self.call_from_thread(
-            self.query_one("#detail-content", Static).update,
+            self._w_detail.update,
             "\n".join(lines)
         )
         self.call_from_thread(
-            self.query_one("#title-detail", Label).update,
+            self._set_title, "detail",
             f" 🔄 REGRADE — {name} ── [y] Submit  [n] Cancel "
         )
         self.call_from_thread(
@@ -1149,16 +1422,8 @@ class CanvasCommandCenter(App):
     def _score_to_letter(score, pts):
         if pts == 0:
             return "—"
-        pct = (score / pts) * 100
-        if pct >= 90:
-            return "A"
-        if pct >= 80:
-            return "B"
-        if pct >= 70:
-            return "C"
-        if pct >= 60:
-            return "D"
-        return "F"
+        # Cutoffs are whole numbers, so flooring the percentage is exact
+        return _LETTER_LUT[max(0, min(100, int(score / pts * 100)))]
 
     def action_edit_grade(self) -> None:
         """[e] Edit a student's grade from the pending results."""
@@ -1173,20 +1438,18 @@ class CanvasCommandCenter(App):
                 f"[{i + 1}] {r['student_name'][:28]:<28} {score_str:>8}  {r['letter_grade']}"
             )
         lines.append("\nEnter student number to edit (or 0 to cancel):")
-        self.query_one("#detail-content", Static).update("\n".join(lines))
-        # Remove existing edit input if any
-        try:
-            self.query_one("#grade-edit-input").remove()
-        except Exception:
-            pass
-        self.mount(
-            Input(placeholder="Student number (0=cancel)", id="grade-edit-input"),
-            after="#detail-content",
-        )
-        self.query_one("#grade-edit-input").focus()
-
-    def on_input_submitted(self, event: Input.Submitted) -> None:
-        """Handle Input widget submissions for grade editing."""
+        self._w_detail.update("\n".join(lines))
+        # The edit input is composed once (hidden) and toggled, not remounted
+        self._w_edit.value   = ""
+        self._w_edit.display = True
+        self._w_edit.focus()
+
+    def _hide_edit_input(self) -> None:
+        self._w_edit.display = False
+
+    @on(Input.Submitted, "#grade-edit-input")
+    def _grade_edit_submitted(self, event: Input.Submitted) -> None:
+        """Handle grade-edit Input submissions."""
         value = event.value.strip()
         event.input.value = ""
 
@@ -1198,16 +1461,13 @@ class CanvasCommandCenter(App):
             if num == 0 or num < 0 or num > len(self._pending_grades):
                 # Cancel or invalid — redisplay results
                 self._edit_state = None
-                try:
-                    self.query_one("#grade-edit-input").remove()
-                except Exception:
-                    pass
+                self._hide_edit_input()
                 self._redisplay_grading_results()
                 return
             self._edit_idx = num - 1
             r = self._pending_grades[self._edit_idx]
             pts = self._grade_req["points_possible"] if self._grade_req else 100
-            self.query_one("#detail-content", Static).update(
+            self._w_detail.update(
                 f"[bold cyan]Editing: {r['student_name']}[/]\n"
                 f"Current score: {r['score']:.0f}/{pts:.0f}\n\n"
                 f"Enter new score (0-{pts:.0f}) or press Enter to keep:"
@@ -1227,69 +1487,66 @@ class CanvasCommandCenter(App):
                     self._pending_grades[self._edit_idx]["letter_grade"] = (
                         self._score_to_letter(new_score, pts)
                     )
+                    # A score set by hand is postable even if grading failed
+                    self._pending_grades[self._edit_idx]["error"] = ""
                 except ValueError:
                     pass
             self._edit_state = None
-            try:
-                self.query_one("#grade-edit-input").remove()
-            except Exception:
-                pass
+            self._hide_edit_input()
             self._redisplay_grading_results()
 
-    def _redisplay_grading_results(self) -> None:
-        """Re-render the grading results table after an edit."""
-        results = self._pending_grades
-        req = self._grade_req
-        pts = req["points_possible"] if req else 100
-        assign_name = self.selected_assign_name
+    def _grading_results_text(self, results: list[dict], pts: float,
+                              assign_name: str) -> str:
+        """Markup for the grading results table shown before submitting."""
+        avg, ok_count = _grade_summary(results)
 
-        graded_scores = [r["score"] for r in results if not r.get("error")
-                         and r["letter_grade"] != "—"]
-        avg = sum(graded_scores) / len(graded_scores) if graded_scores else 0
-
-        sep = "─" * 62
+        sep   = "─" * 62
         lines = [
             f"[bold cyan]🤖 AI GRADING RESULTS — {assign_name[:45]}[/]",
             f"[dim]{sep}[/]",
             f"[bold]{'Student':<26} {'Score':>6} {'Grade':>6}  Comments[/]",
             f"[dim]{sep}[/]",
         ]
+        row = _RESULT_ROW_TMPL.format
         for r in results:
-            score_str = f"{r['score']:.0f}/{pts:.0f}" if r["letter_grade"] != "—" else "—"
-            grade_str = r["letter_grade"]
-            comment = r.get("comments") or ("✓ Full marks" if not r.get("error") else r.get("error", ""))
-            color = _grade_color(r["letter_grade"])
-            lines.append(
-                f"[white]{r['student_name'][:26]:<26}[/] "
-                f"[{color}]{score_str:>6}[/] "
-                f"[{color}]{grade_str:>5}[/]  "
-                f"[italic #aaaaaa]{comment}[/]"
-            )
+            letter = r["letter_grade"]
+            lines.append(row(
+                name=r["student_name"][:26],
+                color=_grade_color(letter),
+                score=f"{r['score']:.0f}/{pts:.0f}" if letter != "—" else "—",
+                grade=letter,
+                comment=r.get("comments") or r.get("error") or "✓ Full marks",
+            ))
         lines += [
             f"[dim]{sep}[/]",
             f"[dim]{len(results)} graded  │  avg: {avg:.1f}/{pts:.0f}  │  "
-            f"{len([r for r in results if not r.get('error')])} successful[/]",
+            f"{ok_count} successful[/]",
             "",
             "  [bold bright_cyan on #003344][ e ][/] edit grade   [bold bright_green on #003300][ y ][/] submit to Canvas   [bold bright_red on #330000][ n ][/] cancel",
         ]
-        self.query_one("#detail-content", Static).update("\n".join(lines))
-        self.query_one("#title-detail", Label).update(
+        return "\n".join(lines)
+
+    def _redisplay_grading_results(self) -> None:
+        """Re-render the grading results table after an edit."""
+        req = self._grade_req
+        pts = req["points_possible"] if req else 100
+        assign_name = self.selected_assign_name
+
+        self._w_detail.update(
+            self._grading_results_text(self._pending_grades, pts, assign_name)
+        )
+        self._set_title(
+            "detail",
             f" 🤖 GRADING RESULTS — {assign_name[:40]} ── [e]=Edit [y]=Submit [n]=Cancel "
         )
 
     # ── keyboard actions ──────────────────────────────────────────────────
 
-    def action_focus_courses(self) -> None:
-        self.query_one("#tbl-courses").focus()
-
-    def action_focus_students(self) -> None:
-        self.query_one("#tbl-students").focus()
-
-    def action_focus_assignments(self) -> None:
-        self.query_one("#tbl-assignments").focus()
-
-    def action_focus_submissions(self) -> None:
-        self.query_one("#tbl-submissions").focus()
+    def action_focus_panel(self, key: str) -> None:
+        """[1-4] Jump straight to a panel's table."""
+        tbl = self._tables.get(key)
+        if tbl is not None:
+            tbl.focus()
 
     def action_load_submissions(self) -> None:
         if self.selected_course_id and self.selected_assign_id:
@@ -1302,10 +1559,12 @@ class CanvasCommandCenter(App):
             self._status("⚠️  Select a course → assignment first, then press [s]")
 
     def action_reload(self) -> None:
-        for tid in ("tbl-courses", "tbl-students", "tbl-assignments",
-                    "tbl-submissions"):
-            self.query_one(f"#{tid}", DataTable).clear()
-        self._clear_detail()
+        with self.batch_update():
+            for tbl in self._tables.values():
+                tbl.clear()
+            self._clear_detail()
+        self.selected_course_id = None
+        self.selected_assign_id = None
         self.connect_and_load()
 
 
@@ -5,6 +5,8 @@ List, create, and update assignments for a Canvas course.
 
 from canvasapi import Canvas
 
+from src.courses import get_course_cached
+
 
 def list_assignments(canvas: Canvas, course_id: int) -> list:
     """Fetch all assignments for a course.
@@ -16,8 +18,8 @@ def list_assignments(canvas: Canvas, course_id: int) -> list:
     Raises RuntimeError on API failure.
     """
     try:
-        course = canvas.get_course(course_id)
-        assignments = list(course.get_assignments())
+        course = get_course_cached(canvas, course_id)
+        assignments = list(course.get_assignments(per_page=100))
     except Exception as e:
         raise RuntimeError(
             f"Failed to fetch assignments for course {course_id}: {e}"
@@ -47,7 +49,7 @@ def create_assignment(canvas: Canvas, course_id: int, data: dict):
     Raises RuntimeError on API failure.
     """
     try:
-        course = canvas.get_course(course_id)
+        course = get_course_cached(canvas, course_id)
         assignment = course.create_assignment(assignment=data)
     except Exception as e:
         raise RuntimeError(
@@ -66,7 +68,7 @@ def update_assignment(canvas: Canvas, course_id: int, assignment_id: int,
     Raises RuntimeError on API failure.
     """
     try:
-        course = canvas.get_course(course_id)
+        course = get_course_cached(canvas, course_id)
         assignment = course.get_assignment(assignment_id)
         updated = assignment.edit(assignment=data)
     except Exception as e:
@@ -4,40 +4,162 @@ Supports:
   Text:   .docx, .pdf, .txt, .md, .py, .html, .csv, and other plain text
   Images: .jpg/.jpeg, .png, .gif, .webp, .bmp, .tiff (standalone attachments)
   Mixed:  DOCX/PDF with embedded images — images are extracted and analyzed
+
+Extracted text and OCR results are cached under ~/.cache/cow-toolkit
+(see src.disk_cache). Downloaded files that carry an ETag or
+Last-Modified are kept there too, for conditional re-downloads, up to
+disk_cache.MAX_FILE_BYTES in total; the least recently used go first.
 """
 
+import base64
+import functools
 import io
 import os
 import re
+import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import unquote_plus
 
+from src import disk_cache
+from src.auth import http_session
+
+# Parsers and the OCR SDK are optional; imported once here rather than
+# on every call from the download threads
+try:
+    import docx as docxlib
+except ImportError:
+    docxlib = None
+try:
+    import fitz   # PyMuPDF: much faster than pypdf
+except ImportError:
+    fitz = None
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+try:
+    import anthropic
+except ImportError:
+    anthropic = None
+
 
 def _get_token() -> str:
     return os.environ.get("CANVAS_API_TOKEN", "")
 
 
-# ── Image analysis via claude CLI ────────────────────────────────────────────
+# Attachments larger than this are not downloaded for preview/grading
+_MAX_DOWNLOAD = 10_000_000
+
+
+# Skip OCR of embedded images once the document already has this much
+# text (per PDF page / whole DOCX): figures add little to a typed essay
+# and OCR is by far the most expensive step of extraction
+OCR_TEXT_THRESHOLD      = 2000
+OCR_DOCX_TEXT_THRESHOLD = 3000
+
+
+# ── Image analysis via the Anthropic API or claude CLI ──────────────────────
+
+_OCR_MODEL  = "claude-haiku-4-5"   # fast model for image OCR
+_OCR_PROMPT = (
+    "Extract ALL readable text exactly as written. "
+    "If there are charts/figures, briefly describe them. "
+    "Keep response concise. No preamble."
+)
+_OCR_BATCH_PROMPT = (
+    "For each image, extract ALL readable text exactly as written. "
+    "If there are charts/figures, briefly describe them. "
+    "Keep each answer concise. No preamble. "
+    "Return exactly one <img i=N>…</img> block per image, "
+    "where N is the image number above."
+)
+
+# Image types the API accepts inline; anything else goes to the CLI
+_API_MEDIA_TYPES = {
+    ".png":  "image/png",
+    ".jpg":  "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".gif":  "image/gif",
+    ".webp": "image/webp",
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _api_client():
+    """Anthropic SDK client, or None when the SDK or an API key is missing.
+
+    One client is shared by every OCR thread; it keeps its HTTP
+    connections alive, unlike a claude CLI process per image.
+    """
+    if anthropic is None or not os.environ.get("ANTHROPIC_API_KEY"):
+        return None
+    return anthropic.Anthropic(max_retries=2)
+
+
+def _ocr_via_api(images: list[tuple[bytes, str]]) -> list[str] | None:
+    """OCR (data, suffix) images in one API request, sending the bytes inline.
+
+    Returns one text per image, or None if the API can't be used for
+    them (no client, or an image type it doesn't accept).
+    """
+    client = _api_client()
+    if client is None or any(sfx.lower() not in _API_MEDIA_TYPES for _, sfx in images):
+        return None
+
+    single  = len(images) == 1
+    content = []
+    for n, (data, suffix) in enumerate(images, 1):
+        if not single:
+            content.append({"type": "text", "text": f"Image {n}:"})
+        content.append({"type": "image", "source": {
+            "type":       "base64",
+            "media_type": _API_MEDIA_TYPES[suffix.lower()],
+            "data":       base64.b64encode(data).decode(),
+        }})
+    content.append({"type": "text", "text": _OCR_PROMPT if single else _OCR_BATCH_PROMPT})
+
+    try:
+        resp = client.messages.create(
+            model=_OCR_MODEL,
+            max_tokens=1024 * len(images),
+            messages=[{"role": "user", "content": content}],
+            timeout=45 + 15 * (len(images) - 1),
+        )
+        raw = "".join(b.text for b in resp.content if b.type == "text").strip()
+    except Exception as e:
+        if "timeout" in type(e).__name__.lower():
+            return ["[Image: analysis timed out]"] * len(images)
+        return [f"[Image: analysis failed — {e}]"] * len(images)
+
+    if single:
+        return [raw if len(raw) > 5 else "[Image: no readable text detected]"]
+    texts = _parse_img_tags(raw)
+    return [
+        texts.get(n) or "[Image: no readable text detected]"
+        for n in range(1, len(images) + 1)
+    ]
+
 
 def _analyze_image_file(path: str) -> str:
-    """Use claude CLI to OCR / describe an image file.
-    Returns extracted text, or a fallback description on failure.
+    """Use the API (when configured) or claude CLI to OCR / describe an
+    image file. Returns extracted text, or a fallback description on failure.
     """
+    suffix = _suffix(path)
+    if suffix in _API_MEDIA_TYPES:
+        texts = _ocr_via_api([(Path(path).read_bytes(), suffix)])
+        if texts is not None:
+            return texts[0]
     try:
         result = subprocess.run(
             [
                 "claude", "--print",
                 "--dangerously-skip-permissions",
                 "--add-dir", str(Path(path).parent),
-                "--model", "claude-haiku-4-5",   # fast model for image OCR
-                (
-                    f"Analyze the image file at {path}. "
-                    "Extract ALL readable text exactly as written. "
-                    "If there are charts/figures, briefly describe them. "
-                    "Keep response concise. No preamble."
-                ),
+                "--model", _OCR_MODEL,
+                f"Analyze the image file at {path}. {_OCR_PROMPT}",
             ],
             capture_output=True, text=True, timeout=45,
         )
@@ -53,18 +175,136 @@ def _analyze_image_file(path: str) -> str:
         return f"[Image: analysis failed — {e}]"
 
 
+# OCR outcomes that may differ on a retry; never cached
+_OCR_TRANSIENT = (
+    "[Image: analysis timed out]",
+    "[Image: claude CLI not available",
+    "[Image: analysis failed",
+)
+
+
 def _analyze_image_bytes(data: bytes, suffix: str = ".png") -> str:
-    """Save image bytes to temp file, analyze, and clean up."""
+    """Save image bytes to temp file, analyze, and clean up.
+
+    Results are cached on disk by image content, so a figure that recurs
+    across submissions (or a regrade) is only sent to the CLI once.
+    """
+    key    = disk_cache.make_key(data)
+    cached = disk_cache.get("ocr", key)
+    if isinstance(cached, str):
+        return cached
+
+    texts = _ocr_via_api([(data, suffix)])
+    if texts is not None:
+        text = texts[0]
+        if not text.startswith(_OCR_TRANSIENT):
+            disk_cache.put("ocr", key, text)
+        return text
+
     with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as tf:
         tf.write(data)
         tmp_path = tf.name
     try:
-        return _analyze_image_file(tmp_path)
+        text = _analyze_image_file(tmp_path)
     finally:
         try:
             os.unlink(tmp_path)
         except Exception:
             pass
+    if not text.startswith(_OCR_TRANSIENT):
+        disk_cache.put("ocr", key, text)
+    return text
+
+
+_IMG_TAG_RE = re.compile(r"<img\s+i=\"?(\d+)\"?\s*>(.*?)</img>", re.DOTALL)
+
+
+# Images per claude OCR call, and how many such calls run at once
+_OCR_GROUP_SIZE = 4
+_OCR_WORKERS    = 4
+
+
+def _analyze_images_batch(images: list[tuple[bytes, str]]) -> list[str]:
+    """OCR several images with a few concurrent claude CLI calls.
+
+    images is a list of (data, suffix). Returns one text per image, in
+    order, with the same fallbacks as _analyze_image_file(). Cached
+    images are answered from disk; the rest are sent in groups of
+    _OCR_GROUP_SIZE, up to _OCR_WORKERS groups at a time.
+    """
+    keys    = [disk_cache.make_key(data) for data, _ in images]
+    results = [disk_cache.get("ocr", key) for key in keys]
+    todo    = [i for i, r in enumerate(results) if not isinstance(r, str)]
+
+    if len(todo) == 1:
+        results[todo[0]] = _analyze_image_bytes(*images[todo[0]])
+    elif todo:
+        groups = [
+            todo[g:g + _OCR_GROUP_SIZE]
+            for g in range(0, len(todo), _OCR_GROUP_SIZE)
+        ]
+        with tempfile.TemporaryDirectory(prefix="cow-ocr-") as tmp_dir:
+            def _ocr_group(group: list[int]) -> dict[int, str]:
+                texts = _ocr_via_api([images[i] for i in group])
+                if texts is not None:
+                    return dict(enumerate(texts, 1))
+                listing = []
+                for n, i in enumerate(group, 1):
+                    data, suffix = images[i]
+                    path = os.path.join(tmp_dir, f"img{i}{suffix}")
+                    with open(path, "wb") as fh:
+                        fh.write(data)
+                    listing.append(f"<img i={n}>: {path}")
+                return _run_ocr_batch(tmp_dir, listing)
+
+            with ThreadPoolExecutor(max_workers=min(len(groups), _OCR_WORKERS)) as pool:
+                group_texts = list(pool.map(_ocr_group, groups))
+
+        for group, texts in zip(groups, group_texts):
+            for n, i in enumerate(group, 1):
+                text = texts.get(n) or "[Image: no readable text detected]"
+                results[i] = text
+                if not text.startswith(_OCR_TRANSIENT):
+                    disk_cache.put("ocr", keys[i], text)
+    return results
+
+
+def _run_ocr_batch(tmp_dir: str, listing: list[str]) -> dict[int, str]:
+    """Run the multi-image OCR prompt; returns image number → text."""
+    try:
+        result = subprocess.run(
+            [
+                "claude", "--print",
+                "--dangerously-skip-permissions",
+                "--add-dir", tmp_dir,
+                "--model", _OCR_MODEL,
+                (
+                    f"Analyze each of these {len(listing)} image files:\n"
+                    + "\n".join(listing) + "\n\n" + _OCR_BATCH_PROMPT
+                ),
+            ],
+            capture_output=True, text=True, timeout=45 + 15 * (len(listing) - 1),
+        )
+    except subprocess.TimeoutExpired:
+        return dict.fromkeys(range(1, len(listing) + 1), "[Image: analysis timed out]")
+    except FileNotFoundError:
+        return dict.fromkeys(
+            range(1, len(listing) + 1), "[Image: claude CLI not available for OCR]"
+        )
+    except Exception as e:
+        return dict.fromkeys(range(1, len(listing) + 1), f"[Image: analysis failed — {e}]")
+
+    return _parse_img_tags(result.stdout)
+
+
+def _parse_img_tags(raw: str) -> dict[int, str]:
+    """Image number → text from <img i=N>…</img> blocks; blank ones dropped."""
+    texts = {}
+    for num, body in _IMG_TAG_RE.findall(raw):
+        body = body.strip()
+        if len(body) > 5:
+            texts[int(num)] = body
+    return texts
 
 
 def _image_metadata(data: bytes) -> str:
@@ -79,9 +319,82 @@ def _image_metadata(data: bytes) -> str:
 
 # ── Main entry point ──────────────────────────────────────────────────────────
 
-def fetch_attachment_content(att) -> dict:
+def download_attachment(att) -> str:
+    """Download a Canvas attachment object into a temporary file.
+
+    The body is streamed to disk in chunks rather than held in memory.
+    Returns the file's path (keeping the attachment's extension); the
+    caller is responsible for deleting it.
+
+    Files served with an ETag or Last-Modified are kept in the disk
+    cache and revalidated with a conditional GET, so an unchanged file
+    costs a 304 round trip instead of a second transfer.
+
+    Raises ValueError if the attachment has no URL or is too large to
+    preview, and requests' exceptions if the download itself fails.
+    """
+    url  = getattr(att, "url", "")
+    size = getattr(att, "size", 0) or 0
+    if not url:
+        raise ValueError("No download URL available")
+    if size > _MAX_DOWNLOAD:
+        raise ValueError(f"File too large ({size // 1_000_000} MB) to preview")
+
+    headers  = {"Authorization": f"Bearer {_get_token()}"}
+    http_key = disk_cache.make_key(url)
+    cached   = disk_cache.get_file("http", http_key)
+    meta     = disk_cache.get("http", http_key)
+    # Opened before asking, so a prune by another download meanwhile
+    # cannot take the body away from under a 304
+    cached_fh = None
+    if isinstance(meta, dict) and cached is not None:
+        try:
+            cached_fh = open(cached, "rb")
+        except OSError:
+            pass   # pruned already; fetch it in full
+        else:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+    suffix = _suffix(unquote_plus(getattr(att, "filename", "") or ""))
+    fd, path = tempfile.mkstemp(prefix="cow-att-", suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as fh, http_session().get(
+            url, headers=headers, timeout=30, stream=True,
+        ) as resp:
+            if resp.status_code == 304 and cached_fh is not None:
+                shutil.copyfileobj(cached_fh, fh)
+                return path
+            resp.raise_for_status()
+            for chunk in resp.iter_content(chunk_size=1 << 16):
+                fh.write(chunk)
+                if fh.tell() > _MAX_DOWNLOAD:
+                    raise ValueError("File too large to preview")
+            validators = {
+                "etag":          resp.headers.get("ETag", ""),
+                "last_modified": resp.headers.get("Last-Modified", ""),
+            }
+    except BaseException:
+        os.unlink(path)
+        raise
+    finally:
+        if cached_fh is not None:
+            cached_fh.close()
+
+    if any(validators.values()) and disk_cache.put_file("http", http_key, path):
+        disk_cache.put("http", http_key, validators)
+    return path
+
+
+def fetch_attachment_content(att, path: str | None = None) -> dict:
     """Download and extract full content from a Canvas attachment object.
 
+    Pass `path` when the file was already fetched with
+    download_attachment() to skip the download; it is left in place for
+    the caller to delete.
+
     Returns dict:
         filename       str
         content_type   str
@@ -89,12 +402,9 @@ def fetch_attachment_content(att) -> dict:
         text           str    (all extracted text, including image OCR)
         error          str    (non-empty on failure)
     """
-    import requests
-
     filename     = unquote_plus(getattr(att, "filename", "unknown"))
     content_type = getattr(att, "content-type", "") or ""
     size         = getattr(att, "size", 0) or 0
-    url          = getattr(att, "url", "")
 
     result = {
         "filename":     filename,
@@ -104,82 +414,98 @@ def fetch_attachment_content(att) -> dict:
         "error":        "",
     }
 
-    if not url:
-        result["error"] = "No download URL available"
-        return result
-
-    if size and size > 10_000_000:
-        result["error"] = f"File too large ({size // 1_000_000} MB) to preview"
+    if path is not None:
+        result.update(_parse_attachment(filename, content_type, path))
         return result
 
     try:
-        token = _get_token()
-        resp  = requests.get(
-            url,
-            headers={"Authorization": f"Bearer {token}"},
-            timeout=30,
-        )
-        resp.raise_for_status()
-        data = resp.content
+        path = download_attachment(att)
+    except ValueError as e:
+        result["error"] = str(e)
+        return result
     except Exception as e:
         result["error"] = f"Download failed: {e}"
         return result
-
-    lname = filename.lower()
-    ct    = content_type.lower()
-
     try:
-        # ── DOCX ──────────────────────────────────────────────────────────
-        if "wordprocessingml" in ct or lname.endswith(".docx"):
-            result["text"] = _extract_docx(data)
-
-        # ── PDF ───────────────────────────────────────────────────────────
-        elif "pdf" in ct or lname.endswith(".pdf"):
-            result["text"] = _extract_pdf(data)
+        result.update(_parse_attachment(filename, content_type, path))
+    finally:
+        os.unlink(path)
+    return result
 
-        # ── Standalone images ─────────────────────────────────────────────
-        elif _is_image(ct, lname):
-            suffix = Path(lname).suffix or ".jpg"
-            result["text"] = _analyze_image_bytes(data, suffix)
 
-        # ── Plain text ────────────────────────────────────────────────────
-        elif _is_plaintext(ct, lname):
-            result["text"] = data.decode("utf-8", errors="replace")
+def _parse_attachment(filename: str, content_type: str, path: str) -> dict:
+    """Extract text from a downloaded attachment file, via the disk cache.
 
-        else:
-            result["error"] = f"Unsupported format: {filename}"
+    Returns dict with keys text and error (one of them empty).
+    """
+    # The parser is picked from type + extension, so both are in the key
+    key    = disk_cache.make_file_key(path, content_type.lower(), _suffix(filename))
+    cached = disk_cache.get("attach", key)
+    if isinstance(cached, dict):
+        return cached
+
+    parsed = _parse_uncached(filename, content_type, path)
+    # Keep failures, and results that embed a transient OCR failure, out
+    # of the cache: a missing parser or a timed-out OCR call may well
+    # succeed next time
+    if not parsed["error"] and not any(m in parsed["text"] for m in _OCR_TRANSIENT):
+        disk_cache.put("attach", key, parsed)
+    return parsed
+
+
+def _parse_uncached(filename: str, content_type: str, path: str) -> dict:
+    try:
+        handler = EXT_HANDLERS.get(_suffix(filename)) or _content_type_handler(content_type.lower())
+        if handler is None:
+            return {"text": "", "error": f"Unsupported format: {filename}"}
+        return {"text": handler(path), "error": ""}
 
     except Exception as e:
-        result["error"] = f"Parse error: {e}"
+        return {"text": "", "error": f"Parse error: {e}"}
 
-    return result
+
+def _content_type_handler(ct: str):
+    """Pick a parser from the MIME type, for files without a known extension."""
+    if "wordprocessingml" in ct:
+        return _extract_docx
+    if "pdf" in ct:
+        return _extract_pdf
+    if ct.startswith("image/"):
+        return _analyze_image_file
+    if "text/" in ct:
+        return _read_text
+    return None
 
 
 # ── Helpers ───────────────────────────────────────────────────────────────────
 
-_IMAGE_EXTS = {
+_IMAGE_EXTS = frozenset({
     ".jpg", ".jpeg", ".png", ".gif", ".webp",
     ".bmp", ".tiff", ".tif", ".avif", ".heic",
-}
-_TEXT_EXTS = {
+})
+_TEXT_EXTS = frozenset({
     ".txt", ".md", ".py", ".js", ".ts", ".java", ".c", ".cpp", ".h",
     ".css", ".html", ".htm", ".csv", ".json", ".xml", ".sh", ".yaml",
     ".yml", ".rst", ".rb", ".go", ".rs", ".kt", ".swift",
-}
+})
 
 
-def _is_image(ct: str, fname: str) -> bool:
-    return ct.startswith("image/") or Path(fname).suffix.lower() in _IMAGE_EXTS
+def _suffix(fname: str) -> str:
+    """Lower-cased extension including the dot, like Path.suffix but
+    without building a Path."""
+    dot = fname.rfind(".")
+    return fname[dot:].lower() if dot >= 0 else ""
 
 
-def _is_plaintext(ct: str, fname: str) -> bool:
-    return "text/" in ct or Path(fname).suffix.lower() in _TEXT_EXTS
+def _read_text(path: str) -> str:
+    return Path(path).read_bytes().decode("utf-8", errors="replace")
 
 
-def _extract_docx(data: bytes) -> str:
-    import docx as docxlib
+def _extract_docx(path: str) -> str:
+    if docxlib is None:
+        raise ImportError("python-docx is not installed")
 
-    doc    = docxlib.Document(io.BytesIO(data))
+    doc    = docxlib.Document(path)
     parts  = []
 
     # ── Text paragraphs ───────────────────────────────────────────────────
@@ -198,54 +524,119 @@ def _extract_docx(data: bytes) -> str:
         if rows:
             parts.append("\n── Table ──\n" + "\n".join(rows))
 
-    # ── Embedded images ───────────────────────────────────────────────────
+    # ── Embedded images (OCR'd together in one call) ─────────────────────
+    images = []   # (img_count, img_name, data, suffix) or (img_count, error)
     img_count = 0
+    ocr       = sum(map(len, parts)) < OCR_DOCX_TEXT_THRESHOLD
     for rel in doc.part.rels.values():
-        if "image" in rel.reltype:
+        if ocr and "image" in rel.reltype:
             img_count += 1
             try:
-                img_data  = rel.target_part.blob
-                img_name  = rel.target_part.partname.split("/")[-1].lower()
-                suffix    = Path(img_name).suffix or ".png"
-                ocr_text  = _analyze_image_bytes(img_data, suffix)
-                parts.append(f"\n── Embedded Image {img_count} ({img_name}) ──\n{ocr_text}")
+                img_data = rel.target_part.blob
+                img_name = rel.target_part.partname.split("/")[-1].lower()
+                suffix   = _suffix(img_name) or ".png"
+                images.append((img_count, img_name, img_data, suffix))
             except Exception as e:
-                parts.append(f"\n── Embedded Image {img_count} ──\n[extraction failed: {e}]")
+                images.append((img_count, e))
+
+    ocr_texts = iter(_analyze_images_batch(
+        [(img[2], img[3]) for img in images if len(img) == 4]
+    ))
+    for img in images:
+        if len(img) == 4:
+            parts.append(f"\n── Embedded Image {img[0]} ({img[1]}) ──\n{next(ocr_texts)}")
+        else:
+            parts.append(f"\n── Embedded Image {img[0]} ──\n[extraction failed: {img[1]}]")
 
     return "\n".join(parts)
 
 
-def _extract_pdf(data: bytes) -> str:
-    from pypdf import PdfReader
-
-    reader     = PdfReader(io.BytesIO(data))
-    page_texts = []
-
-    for page_num, page in enumerate(reader.pages, 1):
-        text = (page.extract_text() or "").strip()
-
-        # Try to extract embedded images from this page
-        img_parts = []
+def _extract_pdf(path: str) -> str:
+    if fitz is None:
+        pages = _pdf_pages_pypdf(path)
+    else:
         try:
-            for img_obj in page.images:
-                img_data = img_obj.data
-                suffix   = Path(img_obj.name.lower()).suffix if img_obj.name else ".png"
-                if not suffix:
-                    suffix = ".png"
-                ocr_text = _analyze_image_bytes(img_data, suffix)
-                if ocr_text and "[Image:" not in ocr_text:
-                    img_parts.append(f"[Image in page {page_num}]: {ocr_text}")
-        except Exception:
-            pass  # image extraction not always available
-
+            pages = _pdf_pages_fitz(path)
+        except fitz.FileDataError:
+            pages = _pdf_pages_pypdf(path)   # let pypdf have a go at it
+
+    # All pages' images go to OCR together
+    ocr_texts  = iter(_analyze_images_batch(
+        [img for _, _, page_images in pages for img in page_images]
+    ))
+    page_texts = []
+    for page_num, text, page_images in pages:
         if text:
             page_texts.append(text)
-        if img_parts:
-            page_texts.extend(img_parts)
+        for _ in page_images:
+            ocr_text = next(ocr_texts)
+            # Drop "no readable text" and similar, but keep transient
+            # failures visible (and so out of the disk cache)
+            if ocr_text and ("[Image:" not in ocr_text
+                             or ocr_text.startswith(_OCR_TRANSIENT)):
+                page_texts.append(f"[Image in page {page_num}]: {ocr_text}")
 
     return "\n\n".join(page_texts)
 
 
+def _pdf_pages_fitz(path: str) -> list:
+    """Text and embedded images of each page, read with PyMuPDF.
+
+    Returns [(page_num, text, [(data, suffix), …]), …]; images are only
+    collected from text-light pages.
+    """
+    pages = []
+    with fitz.open(path) as doc:
+        for page_num, page in enumerate(doc, 1):
+            text = page.get_text("text").strip()
+
+            page_images = []
+            if len(text) < OCR_TEXT_THRESHOLD:
+                for img in page.get_images(full=True):
+                    try:
+                        pix = fitz.Pixmap(doc, img[0])
+                        if pix.n - pix.alpha >= 4:   # CMYK → RGB for PNG
+                            pix = fitz.Pixmap(fitz.csRGB, pix)
+                        page_images.append((pix.tobytes("png"), ".png"))
+                    except Exception:
+                        pass  # skip images MuPDF cannot decode
+            pages.append((page_num, text, page_images))
+    return pages
+
+
+def _pdf_pages_pypdf(path: str) -> list:
+    """Same as _pdf_pages_fitz(), read with pypdf."""
+    if PdfReader is None:
+        raise ImportError("pypdf is not installed")
+
+    reader = PdfReader(path)
+    pages  = []
+
+    for page_num, page in enumerate(reader.pages, 1):
+        text = (page.extract_text() or "").strip()
+
+        page_images = []
+        if len(text) < OCR_TEXT_THRESHOLD:
+            try:
+                for img_obj in page.images:
+                    suffix = _suffix(img_obj.name) if img_obj.name else ".png"
+                    page_images.append((img_obj.data, suffix or ".png"))
+            except Exception:
+                pass  # image extraction not always available
+        pages.append((page_num, text, page_images))
+
+    return pages
+
+
+# Extension → parser; anything else is tried by content type
+EXT_HANDLERS = {
+    ".docx": _extract_docx,
+    ".pdf":  _extract_pdf,
+    **dict.fromkeys(_IMAGE_EXTS, _analyze_image_file),
+    **dict.fromkeys(_TEXT_EXTS, _read_text),
+}
+
+
 def format_size(size: int) -> str:
     if size < 1024:
         return f"{size} B"
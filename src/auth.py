@@ -4,13 +4,31 @@ Handles loading API token, establishing Canvas API connection,
 and verifying the connection by fetching current user info.
 """
 
+import functools
 import os
 
+import requests
 from canvasapi import Canvas
+from requests.adapters import HTTPAdapter
 
 BASE_URL = "https://frostburg.instructure.com/"
 
 
+@functools.lru_cache(maxsize=1)
+def http_session():
+    """Shared requests.Session for direct HTTP calls (file downloads).
+
+    Pools up to 32 keep-alive connections so concurrent downloads reuse
+    TCP/TLS connections instead of opening one per file, and retries
+    failed connection attempts.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=3)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 def get_api_token() -> str:
     """Load CANVAS_API_TOKEN from environment.
 
@@ -4,8 +4,19 @@ Fetches enrolled courses (as instructor) from Canvas API and
 provides formatting for TUI display.
 """
 
+import re
+import weakref
+
 from canvasapi import Canvas
 
+# "2026 Spring" → year, season
+_TERM_RE = re.compile(r"(\d{4})\s+(\w+)", re.IGNORECASE)
+_SEASON_ORDER = {"intersession": 0, "spring": 1, "summer": 2, "fall": 3}
+
+# Course objects per connection; dropped along with the Canvas instance
+_course_cache: "weakref.WeakKeyDictionary[Canvas, dict]" = weakref.WeakKeyDictionary()
+_assignment_cache: "weakref.WeakKeyDictionary[Canvas, dict]" = weakref.WeakKeyDictionary()
+
 
 def get_courses(canvas: Canvas) -> list:
     """Fetch all courses where the user is enrolled as a teacher.
@@ -17,22 +28,54 @@ def get_courses(canvas: Canvas) -> list:
         courses = list(canvas.get_courses(
             enrollment_type="teacher",
             include=["term", "total_students"],
+            per_page=100,
         ))
         return courses
     except Exception as e:
         raise RuntimeError(f"Failed to fetch courses: {e}") from e
 
 
+def get_course_cached(canvas: Canvas, course_id: int):
+    """Return the course object for course_id, fetched once per connection.
+
+    Callers only use it to reach sub-resources (assignments, enrollments,
+    submissions), which are still fetched fresh each time.
+    Raises whatever canvas.get_course raises.
+    """
+    courses = _course_cache.get(canvas)
+    if courses is None:
+        courses = _course_cache.setdefault(canvas, {})
+    course = courses.get(course_id)
+    if course is None:
+        course = courses[course_id] = canvas.get_course(course_id)
+    return course
+
+
+def get_assignment_cached(canvas: Canvas, course_id: int, assignment_id: int):
+    """Return the assignment object, fetched once per connection.
+
+    Same contract as get_course_cached(): only for reaching
+    sub-resources such as submissions. Code that reads the assignment's
+    own fields (description, points) should fetch it fresh.
+    Raises whatever the Canvas lookups raise.
+    """
+    assignments = _assignment_cache.get(canvas)
+    if assignments is None:
+        assignments = _assignment_cache.setdefault(canvas, {})
+    key = (course_id, assignment_id)
+    assignment = assignments.get(key)
+    if assignment is None:
+        course = get_course_cached(canvas, course_id)
+        assignment = assignments[key] = course.get_assignment(assignment_id)
+    return assignment
+
+
 def get_current_term_courses(courses: list) -> list:
     """Filter courses to only those in the most recent academic term.
 
     Ignores non-year terms like 'Default Term'. Detects the latest
     year+season term automatically (e.g. '2026 Spring').
     """
-    import re
-
-    season_order = {"intersession": 0, "spring": 1, "summer": 2, "fall": 3}
-
     def term_sort_key(course):
         term = getattr(course, "term", None)
         name = ""
@@ -41,19 +84,20 @@ def get_current_term_courses(courses: list) -> list:
         elif hasattr(term, "name"):
             name = term.name or ""
         name = name.strip()
-        m = re.match(r"(\d{4})\s+(\w+)", name, re.IGNORECASE)
+        m = _TERM_RE.match(name)
         if m:
             year = int(m.group(1))
-            season = season_order.get(m.group(2).lower(), -1)
+            season = _SEASON_ORDER.get(m.group(2).lower(), -1)
             return (year, season)
         return (-1, -1)
 
-    year_based = [c for c in courses if term_sort_key(c) != (-1, -1)]
+    # Work out each course's term once
+    year_based = [(k, c) for c in courses if (k := term_sort_key(c)) != (-1, -1)]
     if not year_based:
         return courses
 
-    best = max(term_sort_key(c) for c in year_based)
-    return [c for c in year_based if term_sort_key(c) == best]
+    best = max(k for k, _ in year_based)
+    return [c for k, c in year_based if k == best]
 
 
 def format_course_info(course) -> dict:
@@ -0,0 +1,151 @@
+"""Small persistent JSON cache under ~/.cache/cow-toolkit.
+
+Used for results that are expensive to recompute but fully determined
+by their inputs (attachment text extraction, image OCR), so a regrade
+or a second look at the same files skips the work.
+
+Entries live in one JSON file each, grouped by namespace directory;
+raw file bodies (put_file) sit next to them as .bin files. Bodies are
+kept until a namespace's bodies pass MAX_FILE_BYTES, at which point the
+least recently used are deleted (with their JSON entry); JSON entries
+are small and are never pruned on their own.
+Every failure to read or write is treated as a cache miss; the cache
+can be deleted at any time.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+CACHE_DIR = Path(
+    os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+) / "cow-toolkit"
+
+# Bump when the shape or meaning of cached values changes
+CACHE_VERSION = "v1"
+
+# Total size of put_file() bodies kept per namespace
+MAX_FILE_BYTES = 500_000_000
+
+
+def make_key(*parts: bytes | str) -> str:
+    """Content-hash key for the given inputs, tagged with CACHE_VERSION."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode() if isinstance(part, str) else part)
+        h.update(b"\0")
+    return f"{h.hexdigest()}-{CACHE_VERSION}"
+
+
+def make_file_key(path: str | os.PathLike, *parts: bytes | str) -> str:
+    """Like make_key(), with the file's contents as the first part.
+
+    The file is hashed in chunks, so it never has to fit in memory.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            h.update(chunk)
+    h.update(b"\0")
+    for part in parts:
+        h.update(part.encode() if isinstance(part, str) else part)
+        h.update(b"\0")
+    return f"{h.hexdigest()}-{CACHE_VERSION}"
+
+
+def _path(namespace: str, key: str) -> Path:
+    return CACHE_DIR / namespace / f"{key}.json"
+
+
+def get(namespace: str, key: str):
+    """Return the cached value, or None if absent or unreadable."""
+    try:
+        return json.loads(_path(namespace, key).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def put(namespace: str, key: str, value) -> None:
+    """Store a JSON-serialisable value; silently gives up on I/O errors."""
+    path = _path(namespace, key)
+    tmp  = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(value), encoding="utf-8")
+        os.replace(tmp, path)   # atomic: readers never see a partial file
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+
+
+def file_path(namespace: str, key: str) -> Path:
+    """Where put_file() keeps the body for this key (may not exist)."""
+    return CACHE_DIR / namespace / f"{key}.bin"
+
+
+def get_file(namespace: str, key: str) -> Path | None:
+    """Path of the body stored for this key, or None if there is none.
+
+    Marks the body as just used, so pruning takes it last.
+    """
+    path = file_path(namespace, key)
+    try:
+        os.utime(path)
+    except OSError:
+        return None
+    return path
+
+
+def put_file(namespace: str, key: str, src: str | os.PathLike,
+             max_bytes: int | None = None) -> bool:
+    """Store a copy of the file at src; returns False on I/O errors.
+
+    Bodies beyond max_bytes (default MAX_FILE_BYTES) in the namespace
+    are then pruned, least recently used first; a file larger than the
+    limit on its own is not stored.
+    """
+    limit = MAX_FILE_BYTES if max_bytes is None else max_bytes
+    path  = file_path(namespace, key)
+    tmp   = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        if os.path.getsize(src) > limit:
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(src, tmp)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        return False
+    _prune_files(namespace, limit)
+    return True
+
+
+def _prune_files(namespace: str, max_bytes: int) -> None:
+    """Delete the least recently used bodies until the rest fit max_bytes."""
+    bodies = []
+    for entry in os.scandir(CACHE_DIR / namespace):
+        if entry.name.endswith(".bin"):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue   # removed meanwhile
+            bodies.append((st.st_mtime, st.st_size, entry.path))
+
+    total = sum(size for _, size, _ in bodies)
+    for _, size, body in sorted(bodies):
+        if total <= max_bytes:
+            break
+        for victim in (body, body[:-len(".bin")] + ".json"):
+            try:
+                os.unlink(victim)
+            except OSError:
+                pass
+        total -= size
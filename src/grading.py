@@ -5,8 +5,21 @@ View submissions per assignment and grade them using supportive
 grammar or syntax errors.
 """
 
+import functools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
 from canvasapi import Canvas
 
+from src.courses import get_assignment_cached
+from src.letter_grades import score_to_letter
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 # ---------------------------------------------------------------------------
 # list_submissions
@@ -23,9 +36,11 @@ def list_submissions(canvas: Canvas, course_id: int,
     Raises RuntimeError on API failure.
     """
     try:
-        course = canvas.get_course(course_id)
-        assignment = course.get_assignment(assignment_id)
-        submissions = list(assignment.get_submissions(include=["user", "submission_comments"]))
+        assignment = get_assignment_cached(canvas, course_id, assignment_id)
+        # Canvas pages at 10 by default; 100 (its max) cuts round-trips 10x
+        submissions = list(assignment.get_submissions(
+            include=["user", "submission_comments"], per_page=100,
+        ))
     except Exception as e:
         raise RuntimeError(
             f"Failed to fetch submissions for assignment {assignment_id} "
@@ -90,44 +105,90 @@ def list_submissions(canvas: Canvas, course_id: int,
     return result
 
 
+def list_submissions_many(canvas: Canvas, pairs: list[tuple[int, int]],
+                          max_workers: int = 8) -> list[list]:
+    """Fetch submissions for several assignments concurrently.
+
+    pairs is a list of (course_id, assignment_id). Each fetch waits on
+    Canvas, so they overlap on threads rather than running back to back.
+
+    Returns one list_submissions() result per pair, in order.
+    Raises RuntimeError if any fetch fails.
+    """
+    if not pairs:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as pool:
+        return list(pool.map(lambda p: list_submissions(canvas, *p), pairs))
+
+
 # ---------------------------------------------------------------------------
 # calculate_grade  –  'Professor' grading logic
 # ---------------------------------------------------------------------------
 
-_LETTER_GRADES = [
-    (97, "A+"),
-    (93, "A"),
-    (90, "A-"),
-    (87, "B+"),
-    (83, "B"),
-    (80, "B-"),
-    (77, "C+"),
-    (73, "C"),
-    (70, "C-"),
-    (67, "D+"),
-    (63, "D"),
-    (60, "D-"),
-    (0,  "F"),
-]
-
-
-def _score_to_letter(score: int) -> str:
-    for threshold, letter in _LETTER_GRADES:
-        if score >= threshold:
-            return letter
-    return "F"
-
-
-def _coverage_ratio(text: str, key_points: list[str]) -> float:
-    """Return the fraction of key_points found (case-insensitive) in text."""
-    if not key_points:
+@functools.lru_cache(maxsize=64)
+def _prep_kps(key_points: tuple[str, ...]) -> tuple[str, ...]:
+    """Case-folded key points; a class shares one list, so this is cached."""
+    return tuple(kp.casefold() for kp in key_points)
+
+
+@dataclass(frozen=True, slots=True)
+class Rubric:
+    """A key-point list, case-folded once up front.
+
+    Pass one Rubric for a whole grading run instead of the raw list, so
+    each submission skips rebuilding and re-hashing the list.
+    """
+
+    key_points: tuple[str, ...]
+    folded:     tuple[str, ...] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        key_points = tuple(self.key_points)
+        object.__setattr__(self, "key_points", key_points)
+        object.__setattr__(self, "folded", _prep_kps(key_points))
+
+
+def _prepared(key_points: list[str] | Rubric) -> tuple[str, ...]:
+    if isinstance(key_points, Rubric):
+        return key_points.folded
+    return _prep_kps(tuple(key_points))
+
+
+# Below this many key points, K plain substring scans beat building
+# and walking an Aho-Corasick automaton
+_AC_MIN_KEY_POINTS = 8
+
+
+@functools.lru_cache(maxsize=64)
+def _build_automaton(prepared: tuple[str, ...]):
+    """Aho-Corasick automaton over the non-empty prepared key points.
+
+    Each word maps to itself and how often it appears in the list, so
+    duplicated key points still count once per copy.
+    """
+    automaton = ahocorasick.Automaton()
+    for kp, count in Counter(kp for kp in prepared if kp).items():
+        automaton.add_word(kp, (kp, count))
+    automaton.make_automaton()
+    return automaton
+
+
+def _coverage_ratio(text: str, prepared: tuple[str, ...]) -> float:
+    """Return the fraction of prepared (case-folded) key points found in text."""
+    if not prepared:
         return 1.0
-    text_lower = text.lower()
-    matched = sum(1 for kp in key_points if kp.lower() in text_lower)
-    return matched / len(key_points)
+    text_folded = text.casefold()
+    if ahocorasick is not None and len(prepared) >= _AC_MIN_KEY_POINTS:
+        # One pass over the text finds every key point at once
+        found = {value for _, value in _build_automaton(prepared).iter(text_folded)}
+        matched = sum(count for _, count in found) + prepared.count("")
+    else:
+        matched = sum(1 for kp in prepared if kp in text_folded)
+    return matched / len(prepared)
 
 
-def calculate_grade(submission_text: str, key_points: list[str]) -> dict:
+def calculate_grade(submission_text: str,
+                    key_points: list[str] | Rubric) -> dict:
     """Grade a submission using supportive 'Professor' logic.
 
     Rules:
@@ -137,11 +198,34 @@ def calculate_grade(submission_text: str, key_points: list[str]) -> dict:
     - Partial coverage scales proportionally.
     - Empty submission → near-zero score.
 
+    key_points may be a plain list or a Rubric built from one.
+
     Returns dict with:
         score      (int 0-100)
         feedback   (str, supportive tone)
         letter_grade (str)
     """
+    return dict(_grade(submission_text, _prepared(key_points)))
+
+
+def calculate_grades_bulk(texts: list[str],
+                          key_points: list[str] | Rubric) -> list[dict]:
+    """Grade a whole class against one key-point list or Rubric.
+
+    Same results as calling calculate_grade() on each text, in order;
+    the key points are prepared once for the batch.
+    """
+    prepared = _prepared(key_points)
+    return [dict(_grade(text, prepared)) for text in texts]
+
+
+@functools.lru_cache(maxsize=1024)
+def _grade(submission_text: str, prepared: tuple[str, ...]) -> dict:
+    """calculate_grade() against already-prepared key points.
+
+    Cached, since identical resubmissions against the same list are
+    common; callers hand out copies so the cached dict is never mutated.
+    """
     if not submission_text.strip():
         return {
             "score": 0,
@@ -152,7 +236,7 @@ def calculate_grade(submission_text: str, key_points: list[str]) -> dict:
             "letter_grade": "F",
         }
 
-    ratio = _coverage_ratio(submission_text, key_points)
+    ratio = _coverage_ratio(submission_text, prepared)
 
     # Map ratio → score: full coverage → 95-100, partial scales down
     if ratio >= 1.0:
@@ -202,7 +286,7 @@ def calculate_grade(submission_text: str, key_points: list[str]) -> dict:
     return {
         "score": score,
         "feedback": feedback,
-        "letter_grade": _score_to_letter(score),
+        "letter_grade": score_to_letter(score),
     }
 
 
@@ -219,11 +303,12 @@ def format_submission(submission: dict) -> dict:
     Returns dict with keys:
         student, submitted_at, status, body_preview, score.
     """
-    body = submission.get("body", "") or ""
-    if body:
-        body_preview = (body[:_PREVIEW_MAX_LEN] + "...") if len(body) > _PREVIEW_MAX_LEN else body
+    # One bounded slice: never copies more than the preview, however long the body
+    head = (submission.get("body", "") or "")[:_PREVIEW_MAX_LEN + 1]
+    if len(head) > _PREVIEW_MAX_LEN:
+        body_preview = head[:_PREVIEW_MAX_LEN] + "..."
     else:
-        body_preview = "[No submission text]"
+        body_preview = head or "[No submission text]"
 
     submitted_at = submission.get("submitted_at")
     score = submission.get("score")
@@ -8,15 +8,30 @@ Flow:
   5. On confirmation, post grades back to Canvas via API
 """
 
+import hashlib
 import json
 import os
 import re
+import signal
 import subprocess
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from html.parser import HTMLParser
 
 import requests
 from canvasapi import Canvas
 
+from src.courses import get_assignment_cached, get_course_cached
+from src.letter_grades import score_to_letter
+
+try:
+    import lxml.html   # C parser for strip_html; optional
+except ImportError:
+    lxml = None
+
 
 # ── HTML → plain text ────────────────────────────────────────────────────────
 
@@ -29,12 +44,21 @@ class _HTMLStripper(HTMLParser):
         self.parts.append(data)
 
     def get_text(self) -> str:
-        return re.sub(r"\s+", " ", " ".join(self.parts)).strip()
+        return _WS_RE.sub(" ", " ".join(self.parts)).strip()
+
+
+_WS_RE = re.compile(r"\s+")
 
 
 def strip_html(html: str) -> str:
     if not html:
         return ""
+    if lxml is not None:
+        try:
+            # Text nodes joined with spaces, as _HTMLStripper does
+            return _WS_RE.sub(" ", " ".join(lxml.html.fromstring(html).itertext())).strip()
+        except Exception:
+            pass   # e.g. whitespace-only input; the pure-Python parser copes
     s = _HTMLStripper()
     s.feed(html)
     return s.get_text()
@@ -120,7 +144,7 @@ def get_assignment_requirements(canvas: Canvas, course_id: int,
         rubric_text     str   (formatted rubric criteria, or "")
     """
     try:
-        course     = canvas.get_course(course_id)
+        course     = get_course_cached(canvas, course_id)
         assignment = course.get_assignment(assignment_id)
     except Exception as e:
         raise RuntimeError(f"Failed to fetch assignment: {e}") from e
@@ -171,28 +195,49 @@ _GRADE_SYSTEM = """You are a supportive professor's grading assistant with one g
 if a student addresses a key point with any reasonable detail, they earn FULL marks for that point.
 Grading is about recognising understanding, not hunting for perfection."""
 
-def grade_one_submission(
-    req: dict,
-    student_name: str,
-    submission_text: str,
-) -> dict:
-    """Grade one submission with Claude.
-
-    Args:
-        req              dict from get_assignment_requirements()
-        student_name     str
-        submission_text  str  (full extracted text from body + attachments)
-
-    Returns:
-        score         float
-        letter_grade  str
-        comments      str   (≤ 15 words, empty if full score)
-        error         str   (non-empty on failure)
-    """
+_FINAL_RULE = """FINAL RULE: When in doubt, give the benefit of the doubt and award full points for that item.
+A student who shows genuine effort and addresses the key points — even briefly — earns full marks.
+For full-score submissions, write a short human-sounding comment a real professor might say — casual and warm, not stiff or corporate (e.g. "Really solid work here." / "You nailed it." / "This is exactly what I was looking for." / "Good stuff, keep it up.").
+For partial scores, briefly describe only what was missing in plain, direct language (25 words max)."""
+
+_COMMENT_SPEC = "<if full score: one casual human-sounding sentence a real professor would say (e.g. 'Really solid work.' / 'You nailed it.' / 'This is exactly what I was looking for.'); if not full score: plain description of what was missing, 25 words or fewer>"
+
+_FULL_SCORE_COMMENTS = (
+    "Really solid work here.",
+    "This is exactly what I was looking for.",
+    "You nailed it — nice work.",
+    "Clear and well done, keep it up.",
+    "Good stuff, you clearly put in the effort.",
+    "Spot on, nothing missing here.",
+    "This came together really well.",
+    "You've got a good handle on this material.",
+)
+
+# Submissions sent to Claude per call by grade_many_submissions()
+GRADE_BATCH_SIZE = 5
+
+# grade_one_submission() results by hash of assignment prompt + text,
+# least recently used first; trimmed to _GRADE_CACHE_MAX entries
+_GRADE_CACHE_MAX = 4000
+_grade_cache: OrderedDict[bytes, dict] = OrderedDict()
+_grade_cache_lock = threading.Lock()
+
+
+def _cap(s: str, n: int) -> str:
+    """Cut s to at most n characters, at a word boundary, marked with "…"."""
+    if len(s) <= n:
+        return s
+    head = s[:n]
+    if " " in head:
+        head = head.rsplit(" ", 1)[0]
+    return head + "…"
+
+
+def _assignment_header(req: dict) -> str:
+    """Prompt section shared by every grading call for one assignment."""
     points = req["points_possible"]
-    desc   = (req["description"] or "")[:2500]
+    desc   = _cap(req["description"] or "", 2500)
     rubric = req["rubric_text"] or ""
-    text   = (submission_text or "")[:4000]
 
     if rubric:
         scoring_section = f"""RUBRIC (use these criteria — they define the score breakdown):
@@ -213,7 +258,7 @@ SCORING METHOD — rubric-based:
 • Never deduct for grammar, spelling, or writing quality.
 • Sum across all key points to get the total."""
 
-    prompt = f"""{_GRADE_SYSTEM}
+    return f"""{_GRADE_SYSTEM}
 
 ASSIGNMENT: {req['name']}
 POINTS POSSIBLE: {points}
@@ -221,106 +266,392 @@ POINTS POSSIBLE: {points}
 ASSIGNMENT DESCRIPTION:
 {desc}
 
-{scoring_section}
+{scoring_section}"""
+
+
+_JSON = json.JSONDecoder()
+
+
+def _first_json(raw: str, kind: type):
+    """Return the first JSON value of `kind` (dict or list) embedded in raw.
+
+    Tries raw_decode at each opening bracket in turn, so nested objects
+    and surrounding prose are fine. Raises ValueError if there is none.
+    """
+    opener = "{" if kind is dict else "["
+    i = raw.find(opener)
+    while i >= 0:
+        try:
+            value, _ = _JSON.raw_decode(raw, i)
+            if isinstance(value, kind):
+                return value
+        except json.JSONDecodeError:
+            pass
+        i = raw.find(opener, i + 1)
+    label = "JSON" if kind is dict else "JSON array"
+    raise ValueError(f"No {label} in response: {raw[:200]}")
+
+
+def _kill_tree(proc: subprocess.Popen) -> None:
+    """Kill proc and, on POSIX, everything else in its session."""
+    try:
+        if os.name == "posix":
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except OSError:
+        pass   # already gone
+
+
+# Lines of the claude CLI's stderr kept for error messages
+_STDERR_TAIL_LINES = 5
+
+
+def _claude_json(prompt: str, timeout: int, kind: type):
+    """Run one non-interactive claude CLI call; return its JSON `kind`.
+
+    stdout is read line by line, and the process is stopped as soon as
+    a complete value starting at the first bracket has arrived, instead
+    of waiting for it to exit. Anything less clear-cut is left to
+    _first_json() once the output ends.
+
+    Raises subprocess.TimeoutExpired if the call outlives `timeout`
+    seconds, ValueError if the output holds no such value; its message
+    ends with the last lines the CLI wrote to stderr (auth, quota and
+    similar failures are only reported there).
+    """
+    cmd = [
+        "claude", "--print",
+        "--dangerously-skip-permissions",
+        "--model", "claude-haiku-4-5",
+        "--no-session-persistence",
+        prompt,
+    ]
+    opener = "{" if kind is dict else "["
+    # Own session, so the whole process tree can be stopped at once
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, text=True,
+                            start_new_session=(os.name == "posix"))
+    # Drained on its own thread so a chatty stderr can never fill its
+    # pipe and stall the CLI; only the tail is kept for error messages
+    err_tail: deque[str] = deque(maxlen=_STDERR_TAIL_LINES)
+    drain = threading.Thread(target=err_tail.extend, args=(proc.stderr,),
+                             daemon=True)
+    drain.start()
+    expired = threading.Event()
+
+    def _expire():
+        expired.set()
+        _kill_tree(proc)
+
+    watchdog = threading.Timer(timeout, _expire)
+    watchdog.daemon = True
+    watchdog.start()
+    buf = ""
+    try:
+        for line in proc.stdout:
+            buf += line
+            start = buf.find(opener)
+            if start < 0:
+                continue
+            try:
+                value, _ = _JSON.raw_decode(buf, start)
+            except json.JSONDecodeError:
+                continue   # not complete yet
+            if isinstance(value, kind):
+                return value
+    finally:
+        watchdog.cancel()
+        _kill_tree(proc)
+        proc.wait()
+        proc.stdout.close()
+        drain.join(timeout=1)
+        if not drain.is_alive():
+            proc.stderr.close()
+
+    if expired.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    try:
+        return _first_json(buf.strip(), kind)
+    except ValueError as e:
+        stderr = " ".join(line.strip() for line in err_tail if line.strip())
+        if stderr:
+            raise ValueError(f"{e} (claude: {stderr[-300:]})") from None
+        raise
+
+
+def _to_result(data: dict, points: float) -> dict:
+    """Normalise one parsed grading object into the result dict."""
+    score   = float(data.get("score", 0))
+    score   = max(0.0, min(float(points), score))
+    grade   = str(data.get("letter_grade", score_to_letter(score, points)))
+    comment = str(data.get("comments", "")).strip()
+
+    # Enforce 25-word limit on comments
+    words = comment.split()
+    if len(words) > 25:
+        comment = " ".join(words[:25]) + "…"
+
+    # Ensure full-score submissions always get an encouraging message
+    if score >= float(points) and not comment:
+        import random
+        comment = random.choice(_FULL_SCORE_COMMENTS)
+
+    return {
+        "score":        score,
+        "letter_grade": grade,
+        "comments":     comment,
+        "error":        "",
+    }
+
+
+def _failed(error: str) -> dict:
+    return {"score": 0, "letter_grade": "—", "comments": "", "error": error}
+
+
+def _blank(points: float) -> dict:
+    """Result for a submission with no text: zero, without asking Claude."""
+    return {
+        "score":        0.0,
+        "letter_grade": score_to_letter(0.0, points),
+        "comments":     "No submission text to grade.",
+        "error":        "",
+    }
+
+
+def _cache_key(header: str, text: str) -> bytes:
+    """_grade_cache key for one (capped) submission text."""
+    return hashlib.blake2b(f"{header}\0{text}".encode(), digest_size=16).digest()
+
+
+def _cache_get(key: bytes) -> dict | None:
+    """Copy of the remembered result for key, or None."""
+    with _grade_cache_lock:
+        cached = _grade_cache.get(key)
+        if cached is None:
+            return None
+        _grade_cache.move_to_end(key)
+        return dict(cached)
+
+
+def _cache_put(key: bytes, result: dict) -> None:
+    """Remember result for key, dropping the least recently used extras."""
+    with _grade_cache_lock:
+        _grade_cache[key] = dict(result)
+        _grade_cache.move_to_end(key)
+        while len(_grade_cache) > _GRADE_CACHE_MAX:
+            _grade_cache.popitem(last=False)
+
+
+def grade_one_submission(
+    req: dict,
+    student_name: str,
+    submission_text: str,
+    fresh: bool = False,
+) -> dict:
+    """Grade one submission with Claude.
+
+    Blank submissions score zero without a Claude call. Results are
+    remembered for this process by assignment and submission text (the
+    most recent _GRADE_CACHE_MAX of them), so identical text is graded
+    once; pass fresh=True to ask Claude again.
+
+    Args:
+        req              dict from get_assignment_requirements()
+        student_name     str
+        submission_text  str  (full extracted text from body + attachments)
+        fresh            bool (skip the remembered result, if any)
+
+    Returns:
+        score         float
+        letter_grade  str
+        comments      str   (≤ 15 words, empty if full score)
+        error         str   (non-empty on failure)
+    """
+    points = req["points_possible"]
+    text   = _cap(submission_text or "", 4000)
+    if not text.strip():
+        return _blank(points)
+
+    header = _assignment_header(req)
+    key    = _cache_key(header, text)
+    if not fresh and (cached := _cache_get(key)) is not None:
+        return cached
+
+    prompt = f"""{header}
 
 STUDENT: {student_name}
 
 STUDENT SUBMISSION:
 {text}
 
-FINAL RULE: When in doubt, give the benefit of the doubt and award full points for that item.
-A student who shows genuine effort and addresses the key points — even briefly — earns full marks.
-For full-score submissions, write a short human-sounding comment a real professor might say — casual and warm, not stiff or corporate (e.g. "Really solid work here." / "You nailed it." / "This is exactly what I was looking for." / "Good stuff, keep it up.").
-For partial scores, briefly describe only what was missing in plain, direct language (25 words max).
+{_FINAL_RULE}
 
 Respond ONLY with valid JSON (no other text):
-{{"score": <number 0-{points}>, "letter_grade": "A+/A/A-/B+/B/B-/C+/C/C-/D+/D/D-/F", "comments": "<if full score: one casual human-sounding sentence a real professor would say (e.g. 'Really solid work.' / 'You nailed it.' / 'This is exactly what I was looking for.'); if not full score: plain description of what was missing, 25 words or fewer>"}}"""
+{{"score": <number 0-{points}>, "letter_grade": "A+/A/A-/B+/B/B-/C+/C/C-/D+/D/D-/F", "comments": "{_COMMENT_SPEC}"}}"""
 
     max_attempts = 3
     last_error = ""
     for attempt in range(1, max_attempts + 1):
         try:
-            result = subprocess.run(
-                [
-                    "claude", "--print",
-                    "--dangerously-skip-permissions",
-                    "--model", "claude-haiku-4-5",
-                    "--no-session-persistence",
-                    prompt,
-                ],
-                capture_output=True, text=True, timeout=60,
-            )
-            raw = result.stdout.strip()
-
-            # Extract JSON from output (may have surrounding text)
-            match = re.search(r"\{[^{}]+\}", raw, re.DOTALL)
-            if not match:
-                raise ValueError(f"No JSON in response: {raw[:200]}")
-
-            data = json.loads(match.group())
-            score   = float(data.get("score", 0))
-            score   = max(0.0, min(float(points), score))
-            grade   = str(data.get("letter_grade", _score_to_letter(score, points)))
-            comment = str(data.get("comments", "")).strip()
-
-            # Enforce 25-word limit on comments
-            words = comment.split()
-            if len(words) > 25:
-                comment = " ".join(words[:25]) + "…"
-
-            # Ensure full-score submissions always get an encouraging message
-            if score >= float(points) and not comment:
-                import random
-                comment = random.choice([
-                    "Really solid work here.",
-                    "This is exactly what I was looking for.",
-                    "You nailed it — nice work.",
-                    "Clear and well done, keep it up.",
-                    "Good stuff, you clearly put in the effort.",
-                    "Spot on, nothing missing here.",
-                    "This came together really well.",
-                    "You've got a good handle on this material.",
-                ])
-
-            return {
-                "score":        score,
-                "letter_grade": grade,
-                "comments":     comment,
-                "error":        "",
-            }
+            result = _to_result(_claude_json(prompt, 60, dict), points)
+            _cache_put(key, result)
+            return result
 
         except subprocess.TimeoutExpired:
             last_error = f"AI timeout (attempt {attempt}/{max_attempts})"
             # Retry unless this was the last attempt
             continue
         except Exception as e:
-            return {"score": 0, "letter_grade": "—", "comments": "", "error": str(e)}
+            return _failed(str(e))
 
     # All attempts exhausted
-    return {"score": 0, "letter_grade": "—", "comments": "", "error": last_error}
-
-
-def _score_to_letter(score: float, total: float) -> str:
-    if total <= 0:
-        return "—"
-    pct = (score / total) * 100
-    if pct >= 97: return "A+"
-    if pct >= 93: return "A"
-    if pct >= 90: return "A-"
-    if pct >= 87: return "B+"
-    if pct >= 83: return "B"
-    if pct >= 80: return "B-"
-    if pct >= 77: return "C+"
-    if pct >= 73: return "C"
-    if pct >= 70: return "C-"
-    if pct >= 67: return "D+"
-    if pct >= 63: return "D"
-    if pct >= 60: return "D-"
-    return "F"
+    return _failed(last_error)
+
+
+def grade_many_submissions(
+    req: dict,
+    items: list[tuple[str, str]],
+    fresh: bool = False,
+) -> list[dict]:
+    """Grade several submissions for one assignment in a single Claude call.
+
+    The assignment description and scoring rules are sent once for the
+    whole group instead of once per student. Keep groups to about
+    GRADE_BATCH_SIZE so the prompt stays well inside the model's budget.
+    Blank submissions and (unless fresh=True) text already graded in
+    this process are answered as grade_one_submission() would, and left
+    out of the call.
+
+    Args:
+        req    dict from get_assignment_requirements()
+        items  list of (student_name, submission_text)
+        fresh  bool (ask Claude again even for remembered text)
+
+    Returns one result dict per item, in order, shaped like
+    grade_one_submission()'s. Submissions the model left out of its
+    answer, or answered unusably, are regraded one by one with
+    grade_one_submission().
+    """
+    if not items:
+        return []
+    points = req["points_possible"]
+    header = _assignment_header(req)
+
+    results: list[dict | None] = [None] * len(items)
+    pending = []   # (position in items, name, text, capped text, cache key)
+    for i, (name, text) in enumerate(items):
+        capped = _cap(text or "", 4000)
+        if not capped.strip():
+            results[i] = _blank(points)
+            continue
+        key = _cache_key(header, capped)
+        if not fresh and (cached := _cache_get(key)) is not None:
+            results[i] = cached
+        else:
+            pending.append((i, name, text, capped, key))
+
+    if len(pending) == 1:
+        i, name, text, _, _ = pending[0]
+        results[i] = grade_one_submission(req, name, text, fresh=fresh)
+    if len(pending) <= 1:
+        return results
+
+    sections = "\n\n".join(
+        f'<submission id="{n}" student="{name}">\n{capped}\n</submission>'
+        for n, (_, name, _, capped, _) in enumerate(pending, 1)
+    )
+    prompt = f"""{header}
+
+Grade each of the {len(pending)} student submissions below on its own merits, independently of the others.
+
+{sections}
+
+{_FINAL_RULE}
+
+Respond ONLY with a valid JSON array holding one object per submission, in the same order (no other text):
+[{{"id": <submission id>, "score": <number 0-{points}>, "letter_grade": "A+/A/A-/B+/B/B-/C+/C/C-/D+/D/D-/F", "comments": "{_COMMENT_SPEC}"}}, ...]"""
+
+    max_attempts = 3
+    last_error = ""
+    for attempt in range(1, max_attempts + 1):
+        try:
+            entries = _claude_json(prompt, 60 + 30 * (len(pending) - 1), list)
+        except subprocess.TimeoutExpired:
+            last_error = f"AI timeout (attempt {attempt}/{max_attempts})"
+            continue
+        except ValueError:
+            break   # no usable array; everyone is graded on their own below
+        except Exception as e:
+            for i, *_ in pending:
+                results[i] = _failed(str(e))
+            return results
+
+        by_id = {}
+        for entry in entries:
+            if isinstance(entry, dict) and "id" in entry:
+                by_id[str(entry["id"])] = entry
+        for n, (i, *_, key) in enumerate(pending, 1):
+            entry = by_id.get(str(n))
+            if entry is not None:
+                try:
+                    results[i] = _to_result(entry, points)
+                except (TypeError, ValueError):
+                    continue   # e.g. a non-numeric score
+                _cache_put(key, results[i])
+        break
+    else:
+        for i, *_ in pending:
+            results[i] = _failed(last_error)
+        return results
+
+    # Submissions the batch answer left out or garbled get their own call
+    missing = [p for p in pending if results[p[0]] is None]
+    for j, result in grade_many(req, [(name, text) for _, name, text, *_ in missing],
+                                fresh=fresh):
+        results[missing[j][0]] = result
+    return results
+
+
+def grade_many(
+    req: dict,
+    students: list[tuple[str, str]],
+    max_workers: int = 8,
+    fresh: bool = False,
+) -> Iterator[tuple[int, dict]]:
+    """Grade submissions concurrently, one Claude call per student.
+
+    Each call is a child process waiting on the network, so up to
+    max_workers of them run at once. Retries stay inside
+    grade_one_submission().
+
+    Args:
+        req          dict from get_assignment_requirements()
+        students     list of (student_name, submission_text)
+        max_workers  concurrent Claude calls
+        fresh        bool (passed on to grade_one_submission())
+
+    Yields (index, result) as each grade finishes, so callers can show
+    progress; index is the student's position in `students`.
+    """
+    if not students:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(students))) as pool:
+        futures = {
+            pool.submit(grade_one_submission, req, name, text, fresh): i
+            for i, (name, text) in enumerate(students)
+        }
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
 
 
 # ── Post grades to Canvas ────────────────────────────────────────────────────
 
+# Polling for Canvas' asynchronous bulk grade update
+_BULK_POLL_S    = 1.0
+_BULK_TIMEOUT_S = 120
+
+
 def post_grades(
     canvas: Canvas,
     course_id: int,
@@ -331,26 +662,137 @@ def post_grades(
     """Submit graded results to Canvas.
 
     grades is a list of:
-        {user_id, student_name, score, letter_grade, comments}
+        {user_id, student_name, score, letter_grade, comments, error}
 
-    progress_cb(i, total, name) is called before each submission.
+    Grades whose error is set (grading failed, so the score means
+    nothing) are not posted; they come back in errors and failed.
+
+    All grades go to Canvas in one bulk update_grades request, which
+    Canvas applies as a background job that is polled until done, and
+    Canvas' stored scores are then checked user by user. Only if the bulk
+    request itself is rejected are grades posted one user at a time
+    instead (up to 8 concurrently); once Canvas has accepted the job,
+    nothing is ever posted twice.
+
+    progress_cb(i, total, name) reports progress: while the bulk job runs
+    i follows its completion percentage; per user it is called before
+    each submission, from the posting threads but never from two at once.
 
     Returns:
         ok      int   (number of successfully posted grades)
-        errors  list  (list of error strings)
+        errors  list  (list of "student: reason" strings)
+        failed  list  (user_ids whose grade is not confirmed as posted)
     """
     try:
-        course     = canvas.get_course(course_id)
-        assignment = course.get_assignment(assignment_id)
+        assignment = get_assignment_cached(canvas, course_id, assignment_id)
     except Exception as e:
-        return {"ok": 0, "errors": [f"Failed to fetch assignment: {e}"]}
+        return {"ok": 0, "errors": [f"Failed to fetch assignment: {e}"],
+                "failed": [g["user_id"] for g in grades]}
+
+    held   = [g for g in grades if g.get("error")]
+    grades = [g for g in grades if not g.get("error")]
+    if grades:
+        outcome = _post_grades_bulk(assignment, grades, progress_cb)
+        if outcome is None:
+            outcome = _post_grades_each(assignment, grades, progress_cb)
+    else:
+        outcome = {"ok": 0, "errors": [], "failed": []}
+    if held:
+        outcome["errors"] = [
+            f"{g.get('student_name', '?')}: not posted ({g['error']})" for g in held
+        ] + outcome["errors"]
+        outcome["failed"] = [g["user_id"] for g in held] + outcome["failed"]
+    return outcome
+
+
+def _post_grades_bulk(assignment, grades: list[dict], progress_cb=None) -> dict | None:
+    """Post every grade with one submissions_bulk_update call.
+
+    Returns the outcome dict, or None when the caller should fall back to
+    posting per user, which is only when the bulk request itself raised.
+    A job that fails, times out or can no longer be polled may have been
+    partly applied, so it is reported, never retried.
+    """
+    total      = len(grades)
+    grade_data = {}
+    for g in grades:
+        entry = {"posted_grade": g["score"]}
+        if g.get("comments"):
+            entry["text_comment"] = g["comments"]
+        grade_data[str(g["user_id"])] = entry
+
+    try:
+        progress = assignment.submissions_bulk_update(grade_data=grade_data)
+    except Exception:
+        return None
+
+    # From here on Canvas has the job; anything unclear is an error
+    reason = "Canvas did not record the grade"
+    try:
+        deadline = time.monotonic() + _BULK_TIMEOUT_S
+        while getattr(progress, "workflow_state", "") not in ("completed", "failed"):
+            if progress_cb:
+                done = int((getattr(progress, "completion", 0) or 0) * total / 100)
+                progress_cb(done, total, "bulk update")
+            if time.monotonic() > deadline:
+                reason = (f"Canvas bulk update still running after "
+                          f"{_BULK_TIMEOUT_S}s; check the gradebook before resubmitting")
+                break
+            time.sleep(_BULK_POLL_S)
+            progress = progress.query()
+        else:
+            if progress.workflow_state == "failed":
+                reason = ("Canvas bulk update failed; check the gradebook "
+                          "before resubmitting")
+    except Exception as e:
+        reason = (f"lost track of the Canvas bulk update ({e}); "
+                  "check the gradebook before resubmitting")
+
+    if progress_cb:
+        progress_cb(total, total, "bulk update")
+    return _confirm_posted(assignment, grades, reason)
 
-    ok_count = 0
-    errors   = []
 
-    for i, g in enumerate(grades):
+def _confirm_posted(assignment, grades: list[dict], reason: str) -> dict:
+    """Outcome of a bulk update, from the scores Canvas now holds.
+
+    Users whose stored score differs from the one sent get an error with
+    `reason`; if the scores cannot be read, that is every user.
+    """
+    try:
+        stored = {
+            str(sub.user_id): getattr(sub, "score", None)
+            for sub in assignment.get_submissions(per_page=100)
+        }
+    except Exception as e:
+        stored = {}
+        reason = f"{reason} (could not read back grades: {e})"
+
+    errors, failed = [], []
+    for g in grades:
+        score = stored.get(str(g["user_id"]))
+        try:
+            posted = score is not None and abs(float(score) - float(g["score"])) < 0.005
+        except (TypeError, ValueError):
+            posted = False
+        if not posted:
+            errors.append(f"{g.get('student_name', g['user_id'])}: {reason}")
+            failed.append(g["user_id"])
+    return {"ok": len(grades) - len(failed), "errors": errors, "failed": failed}
+
+
+def _post_grades_each(assignment, grades: list[dict], progress_cb=None) -> dict:
+    """Post grades one user at a time, up to 8 concurrently."""
+    lock    = threading.Lock()
+    started = 0
+
+    def _post(g: dict) -> str:
+        """Post one grade; returns an error string, empty on success."""
+        nonlocal started
         if progress_cb:
-            progress_cb(i + 1, len(grades), g.get("student_name", "?"))
+            with lock:
+                started += 1
+                progress_cb(started, len(grades), g.get("student_name", "?"))
         try:
             sub = assignment.get_submission(g["user_id"])
             sub.edit(
@@ -361,8 +803,13 @@ def post_grades(
                     "text_comment": g["comments"],
                 } if g.get("comments") else {},
             )
-            ok_count += 1
+            return ""
         except Exception as e:
-            errors.append(f"{g.get('student_name', g['user_id'])}: {e}")
+            return f"{g.get('student_name', g['user_id'])}: {e}"
+
+    with ThreadPoolExecutor(max_workers=min(len(grades), 8)) as pool:
+        outcomes = list(pool.map(_post, grades))   # in grades order
 
-    return {"ok": ok_count, "errors": errors}
+    errors = [e for e in outcomes if e]
+    failed = [g["user_id"] for g, e in zip(grades, outcomes) if e]
+    return {"ok": len(grades) - len(errors), "errors": errors, "failed": failed}
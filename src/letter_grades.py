@@ -0,0 +1,20 @@
+"""Letter grades on the A+ … F scale used by Professor and AI grading."""
+
+import bisect
+
+# Lowest percentage for each letter, ascending; _LETTERS lines up with it
+_THRESHOLDS = (0, 60, 63, 67, 70, 73, 77, 80, 83, 87, 90, 93, 97)
+_LETTERS    = ("F", "D-", "D", "D+", "C-", "C", "C+",
+               "B-", "B", "B+", "A-", "A", "A+")
+
+
+def score_to_letter(score: float, total: float = 100) -> str:
+    """Return the letter grade for score out of total.
+
+    Returns "—" when total is not positive.
+    """
+    if total <= 0:
+        return "—"
+    # Rounded so float noise (9.7 / 10 * 100 → 96.999…) can't drop a letter
+    pct = round(score * 100 / total, 9)
+    return _LETTERS[max(0, bisect.bisect_right(_THRESHOLDS, pct) - 1)]
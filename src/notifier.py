@@ -1,20 +1,48 @@
 """Module 6: Discord Notifier.
 
-Checks for new student submissions on Canvas and sends
-Discord notifications via the openclaw CLI.
+Checks for new student submissions on Canvas and sends Discord
+notifications, by webhook when DISCORD_WEBHOOK_URL is set and via the
+openclaw CLI otherwise.
 """
 
+import json
+import os
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
 
+import requests
 from canvasapi import Canvas
 
+from src.auth import http_session
+from src.courses import get_assignment_cached
+
 
 DISCORD_CHANNEL = "channel:1476308111034810482"
 
+# Fixed part of the openclaw command line; only the message varies
+_OPENCLAW_PREFIX = (
+    "openclaw", "message", "send",
+    "--channel", "discord",
+    "--target", DISCORD_CHANNEL,
+    "--message",
+)
+
+# Environment variable holding the channel's webhook URL
+DISCORD_WEBHOOK_ENV = "DISCORD_WEBHOOK_URL"
+
+# Discord rejects message content longer than this
+_DISCORD_MAX_CHARS = 2000
+
+# Webhook posts tried per message while Discord answers 429, and the
+# longest Retry-After honoured before giving up on the message
+_WEBHOOK_ATTEMPTS  = 3
+_MAX_RETRY_AFTER_S = 30.0
+
 
 def check_new_submissions(canvas: Canvas, course_id: int,
                           assignment_id: int,
-                          last_seen_ids: set) -> list:
+                          last_seen_ids: set) -> list[dict]:
     """Check for new submissions not in last_seen_ids.
 
     Skips unsubmitted entries (workflow_state == 'unsubmitted').
@@ -25,32 +53,88 @@ def check_new_submissions(canvas: Canvas, course_id: int,
     Raises RuntimeError on API failure.
     """
     try:
-        course = canvas.get_course(course_id)
-        assignment = course.get_assignment(assignment_id)
-        submissions = list(assignment.get_submissions())
+        assignment = get_assignment_cached(canvas, course_id, assignment_id)
+        submissions = list(assignment.get_submissions(per_page=100))
     except Exception as e:
         raise RuntimeError(
             f"Failed to check submissions for assignment {assignment_id} "
             f"in course {course_id}: {e}"
         ) from e
 
-    new_submissions = []
-    for sub in submissions:
-        workflow = getattr(sub, "workflow_state", "unsubmitted")
-        if workflow == "unsubmitted":
-            continue
-        if sub.id in last_seen_ids:
-            continue
+    current = {
+        sub.id: sub for sub in submissions
+        if getattr(sub, "workflow_state", "unsubmitted") != "unsubmitted"
+    }
+    new_ids = current.keys() - last_seen_ids
+    if not new_ids:
+        return []
+
+    # Keep Canvas's order
+    return [_to_record(sub) for sid, sub in current.items() if sid in new_ids]
+
+
+def check_new_submissions_iter(canvas: Canvas, course_id: int,
+                               assignment_id: int, last_seen_ids: set):
+    """Streaming check_new_submissions(): yield each new submission as
+    soon as its page arrives, instead of after every page is fetched.
+
+    For poll loops that notify as they go; the first notification no
+    longer waits on the slowest page.
+
+    Raises RuntimeError on API failure, possibly after some submissions
+    have already been yielded.
+    """
+    yielded = set()
+    try:
+        assignment = get_assignment_cached(canvas, course_id, assignment_id)
+        for sub in assignment.get_submissions(per_page=100):
+            if (getattr(sub, "workflow_state", "unsubmitted") == "unsubmitted"
+                    or sub.id in last_seen_ids or sub.id in yielded):
+                continue
+            yielded.add(sub.id)
+            yield _to_record(sub)
+    except Exception as e:
+        raise RuntimeError(
+            f"Failed to check submissions for assignment {assignment_id} "
+            f"in course {course_id}: {e}"
+        ) from e
+
+
+def _to_record(sub) -> dict:
+    user_info = getattr(sub, "user", None) or {}
+    return {
+        "id":           sub.id,
+        "user_id":      sub.user_id,
+        "user_name":    user_info.get("name", "Unknown"),
+        "submitted_at": getattr(sub, "submitted_at", None),
+    }
 
-        user_info = getattr(sub, "user", None) or {}
-        new_submissions.append({
-            "id": sub.id,
-            "user_id": sub.user_id,
-            "user_name": user_info.get("name", "Unknown"),
-            "submitted_at": getattr(sub, "submitted_at", None),
-        })
 
-    return new_submissions
+def load_seen(path: str | os.PathLike) -> set:
+    """Load submission ids saved by save_seen().
+
+    Returns an empty set if the file is missing or unreadable, so a
+    first run (or a deleted state file) just starts fresh.
+    """
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return set(json.load(fh))
+    except (OSError, ValueError, TypeError):
+        return set()
+
+
+def save_seen(path: str | os.PathLike, ids) -> None:
+    """Persist submission ids so a restart doesn't re-notify.
+
+    Raises RuntimeError if the file cannot be written.
+    """
+    tmp = f"{os.fspath(path)}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(sorted(ids), fh)
+        os.replace(tmp, path)   # atomic: never leaves a half-written file
+    except OSError as e:
+        raise RuntimeError(f"Failed to save seen submissions to {path}: {e}") from e
 
 
 def format_notification_message(submission: dict, course_name: str,
@@ -68,21 +152,97 @@ def format_notification_message(submission: dict, course_name: str,
 
 def send_discord_notification(submission: dict, course_name: str,
                               assignment_name: str) -> bool:
-    """Send a Discord notification about a new submission via openclaw CLI.
+    """Send a Discord notification about a new submission.
 
     Returns True on success, False on failure.
     """
     message = format_notification_message(submission, course_name,
                                           assignment_name)
-    cmd = [
-        "openclaw", "message", "send",
-        "--channel", "discord",
-        "--target", DISCORD_CHANNEL,
-        "--message", message,
+    return _send_message(message)
+
+
+def send_discord_batch(submissions: list, course_name: str,
+                       assignment_name: str) -> bool:
+    """Send one Discord message covering several new submissions.
+
+    Lines are packed into as few messages as Discord's length limit
+    allows, so a burst of submissions costs one request, not one each.
+
+    Returns True if every message was sent, False otherwise.
+    """
+    lines = [
+        format_notification_message(sub, course_name, assignment_name)
+        for sub in submissions
     ]
+    chunks, current = [], ""
+    for line in lines:
+        line = line[:_DISCORD_MAX_CHARS]
+        if current and len(current) + 1 + len(line) > _DISCORD_MAX_CHARS:
+            chunks.append(current)
+            current = line
+        else:
+            current = f"{current}\n{line}" if current else line
+    if current:
+        chunks.append(current)
+
+    return all([_send_message(chunk) for chunk in chunks])
+
 
+def send_all(submissions: list, course_name: str, assignment_name: str,
+             max_workers: int = 8) -> list[bool]:
+    """Send one notification per submission, several at a time.
+
+    Each send waits on the network or openclaw, so they overlap on
+    threads rather than running back to back. Prefer send_discord_batch()
+    when one combined message will do.
+
+    Returns send_discord_notification()'s result for each submission, in order.
+    """
+    if not submissions:
+        return []
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(submissions))) as pool:
+        return list(pool.map(
+            lambda sub: send_discord_notification(sub, course_name, assignment_name),
+            submissions,
+        ))
+
+
+def _send_message(message: str) -> bool:
+    """Post to the webhook if configured, else send with openclaw.
+
+    openclaw is only a fallback when the webhook cannot be reached at
+    all. Once Discord may have seen the request (a read timeout, an error
+    status) the message is reported as failed rather than sent a second
+    way, and a 429 is retried on the webhook after its Retry-After.
+    """
+    url = os.environ.get(DISCORD_WEBHOOK_ENV, "")
+    if not url:
+        return _send_openclaw(message)
+    for _ in range(_WEBHOOK_ATTEMPTS):
+        try:
+            resp = http_session().post(url, json={"content": message}, timeout=10)
+        except requests.ConnectionError:
+            return _send_openclaw(message)   # never reached Discord
+        except requests.RequestException:
+            return False
+        if resp.ok:
+            return True
+        if resp.status_code != 429:
+            return False
+        try:
+            wait = float(resp.headers.get("Retry-After", 1))
+        except (TypeError, ValueError):
+            wait = 1.0
+        if wait > _MAX_RETRY_AFTER_S:
+            return False
+        time.sleep(max(wait, 0.0))
+    return False
+
+
+def _send_openclaw(message: str) -> bool:
+    """Send a message to DISCORD_CHANNEL with the openclaw CLI."""
     try:
-        result = subprocess.run(cmd, timeout=30)
+        result = subprocess.run([*_OPENCLAW_PREFIX, message], timeout=30)
         return result.returncode == 0
     except (FileNotFoundError, subprocess.TimeoutExpired, OSError):
         return False
@@ -6,6 +6,8 @@ and provides formatting for TUI display.
 
 from canvasapi import Canvas
 
+from src.courses import get_course_cached
+
 
 def get_students(canvas: Canvas, course_id: int) -> list:
     """Fetch all students in a course with their current grades.
@@ -17,10 +19,11 @@ def get_students(canvas: Canvas, course_id: int) -> list:
     Raises RuntimeError on API failure.
     """
     try:
-        course = canvas.get_course(course_id)
+        course = get_course_cached(canvas, course_id)
         enrollments = list(course.get_enrollments(
             type=["StudentEnrollment"],
             include=["current_points", "grades"],
+            per_page=100,
         ))
     except Exception as e:
         raise RuntimeError(f"Failed to fetch students for course {course_id}: {e}") from e
@@ -43,6 +46,15 @@ def get_students(canvas: Canvas, course_id: int) -> list:
     return students
 
 
+def _fmt_score(score):
+    if score is None:
+        return None
+    try:
+        return f"{float(score):.1f}%"
+    except (TypeError, ValueError):
+        return str(score)
+
+
 def format_student_grade(student: dict) -> dict:
     """Format a student's grade data for display.
 
@@ -50,14 +62,6 @@ def format_student_grade(student: dict) -> dict:
         user_id, name, sortable_name,
         current_grade, current_score, final_grade, final_score.
     """
-    def _fmt_score(score):
-        if score is None:
-            return None
-        try:
-            return f"{float(score):.1f}%"
-        except (TypeError, ValueError):
-            return str(score)
-
     return {
         "user_id":       student["user_id"],
         "name":          student["name"],
@@ -67,3 +71,11 @@ def format_student_grade(student: dict) -> dict:
         "final_grade":   student.get("final_grade"),
         "final_score":   _fmt_score(student.get("final_score")),
     }
+
+
+def format_all_students(students: list) -> list:
+    """Format a whole roster for display, in order.
+
+    Same dicts as format_student_grade(), for one call per table fill.
+    """
+    return [format_student_grade(s) for s in students]
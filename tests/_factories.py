@@ -0,0 +1,95 @@
+"""Stand-in Canvas objects shared by the test modules.
+
+The code under test only reads attributes from canvasapi objects, so
+plain namespaces do; unlike a MagicMock, a missing attribute on one
+really is missing.
+"""
+
+from types import SimpleNamespace
+
+
+def make_course(name, code, term_name, enrollments_count=25):
+    """Create a stand-in Canvas course object."""
+    return SimpleNamespace(
+        name=name,
+        course_code=code,
+        id=1001,
+        # Term is a dict attribute on the course object
+        term={"name": term_name},
+        # total_students is an attribute returned when include[]=total_students
+        total_students=enrollments_count,
+    )
+
+
+def make_assignment(assignment_id, name, points=100, due_at=None,
+                    description="", submission_types=None, published=True):
+    """Create a stand-in Canvas assignment object."""
+    return SimpleNamespace(
+        id=assignment_id,
+        name=name,
+        points_possible=points,
+        due_at=due_at,
+        description=description,
+        submission_types=submission_types or ["online_text_entry"],
+        published=published,
+    )
+
+
+def make_submission(submission_id, user_id, body="Some answer",
+                    submitted_at="2025-11-01T10:00:00Z",
+                    workflow_state="submitted", score=None,
+                    user_name="Jane Doe", graded_at=None, attempt=1):
+    """Create a stand-in Canvas submission object."""
+    return SimpleNamespace(
+        id=submission_id,
+        user_id=user_id,
+        body=body,
+        submitted_at=submitted_at,
+        workflow_state=workflow_state,
+        score=score,
+        graded_at=graded_at,
+        attempt=attempt,
+        user={"id": user_id, "name": user_name},
+    )
+
+
+def make_enrollment(user_id, user_name, sortable_name,
+                    current_score=None, current_grade=None,
+                    final_score=None, final_grade=None, grades=None):
+    """Create a stand-in Canvas enrollment object with grade info.
+
+    grades, if given, is used as the enrollment's grades mapping as-is
+    (e.g. a shared read-only one) instead of building it from the
+    score/grade arguments.
+    """
+    if grades is None:
+        # Grades dict as returned by Canvas API
+        grades = {
+            "current_score": current_score,
+            "current_grade": current_grade,
+            "final_score": final_score,
+            "final_grade": final_grade,
+        }
+    return SimpleNamespace(
+        user_id=user_id,
+        type="StudentEnrollment",
+        # User info nested in enrollment
+        user={"id": user_id, "name": user_name, "sortable_name": sortable_name},
+        grades=grades,
+    )
+
+
+def raising(exc):
+    """A plain function that raises exc, to stand in for a failing call.
+
+    Cheaper than a MagicMock with side_effect for error-path tests that
+    never inspect the call afterwards.
+    """
+    def _raise(*args, **kwargs):
+        raise exc
+    return _raise
+
+
+def fail_call(obj, attr, exc=None):
+    """Make obj.attr a function that raises exc ("API error" by default)."""
+    setattr(obj, attr, raising(exc or Exception("API error")))
@@ -0,0 +1,61 @@
+"""Fixtures shared across the test modules."""
+
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from src import disk_cache
+from tests._factories import make_assignment, make_submission
+
+
+@pytest.fixture(scope="session")
+def canonical():
+    """One sample course/assignment/submission set, built once per run.
+
+    Shared by every test that asks for it, so treat it as read-only;
+    build your own with tests._factories to change anything.
+    """
+    return SimpleNamespace(
+        course_id=1001,
+        assignment_id=42,
+        user_id=201,
+        sample_assignment=make_assignment(
+            42, "Essay 1", 50, "2025-11-01T23:59:00Z",
+            description="Write an essay", submission_types=["online_upload"],
+            published=True,
+        ),
+        sample_submission=make_submission(
+            10, 201, body="My essay text",
+            submitted_at="2025-11-05T08:30:00Z",
+            workflow_state="submitted", score=None,
+            user_name="Alice",
+        ),
+    )
+
+
+@pytest.fixture
+def canvas_with_enrollments():
+    """Factory: a fresh Canvas mock whose course lists the given enrollments.
+
+    The course is reachable as canvas.get_course.return_value.
+    """
+    def _make(enrollments):
+        course = Mock()
+        course.get_enrollments.return_value = enrollments
+        canvas = Mock()
+        canvas.get_course.return_value = course
+        return canvas
+    return _make
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point src.disk_cache at an empty directory under tmp_path.
+
+    CACHE_DIR is read from XDG_CACHE_HOME at import, so it is patched too.
+    """
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    path = tmp_path / "cow-toolkit"
+    monkeypatch.setattr(disk_cache, "CACHE_DIR", path)
+    return path
@@ -5,65 +5,62 @@ from unittest.mock import MagicMock
 import pytest
 
 from src.assignments import list_assignments, create_assignment, update_assignment
+from tests._factories import fail_call, make_assignment
 
 
-def _make_mock_assignment(assignment_id, name, points=100, due_at=None,
-                          description="", submission_types=None,
-                          published=True):
-    """Helper to create a mock Canvas assignment object."""
+@pytest.fixture
+def mock_course():
+    return MagicMock()
+
+
+@pytest.fixture
+def mock_canvas(mock_course):
+    canvas = MagicMock()
+    canvas.get_course.return_value = mock_course
+    return canvas
+
+
+@pytest.fixture
+def mock_assignment(mock_course):
     assignment = MagicMock()
-    assignment.id = assignment_id
-    assignment.name = name
-    assignment.points_possible = points
-    assignment.due_at = due_at
-    assignment.description = description
-    assignment.submission_types = submission_types or ["online_text_entry"]
-    assignment.published = published
+    mock_course.get_assignment.return_value = assignment
+    assignment.edit.return_value = assignment
     return assignment
 
 
 class TestListAssignments:
     """Tests for listing assignments in a course."""
 
-    def test_returns_list_of_assignments(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-
+    def test_returns_list_of_assignments(self, mock_canvas, mock_course):
         assignments = [
-            _make_mock_assignment(1, "Homework 1", 100, "2025-10-01T23:59:00Z"),
-            _make_mock_assignment(2, "Midterm Exam", 200, "2025-10-15T23:59:00Z"),
-            _make_mock_assignment(3, "Final Project", 300, "2025-12-01T23:59:00Z"),
+            make_assignment(1, "Homework 1", 100, "2025-10-01T23:59:00Z"),
+            make_assignment(2, "Midterm Exam", 200, "2025-10-15T23:59:00Z"),
+            make_assignment(3, "Final Project", 300, "2025-12-01T23:59:00Z"),
         ]
         mock_course.get_assignments.return_value = assignments
 
         result = list_assignments(mock_canvas, 1001)
         assert len(result) == 3
 
-    def test_fetches_correct_course(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+    def test_fetches_correct_course(self, mock_canvas, mock_course):
         mock_course.get_assignments.return_value = []
 
         list_assignments(mock_canvas, 9999)
-        mock_canvas.get_course.assert_called_once_with(9999)
+        assert mock_canvas.get_course.call_count == 1
+        assert mock_canvas.get_course.call_args.args == (9999,)
 
-    def test_returns_dicts_with_expected_keys(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+    def test_requests_full_pages(self, mock_canvas, mock_course):
+        mock_course.get_assignments.return_value = []
 
-        assignments = [
-            _make_mock_assignment(
-                42, "Essay 1", 50, "2025-11-01T23:59:00Z",
-                description="Write an essay", submission_types=["online_upload"],
-                published=True,
-            ),
-        ]
-        mock_course.get_assignments.return_value = assignments
+        list_assignments(mock_canvas, 1001)
+        _, kwargs = mock_course.get_assignments.call_args
+        assert kwargs["per_page"] == 100
 
-        result = list_assignments(mock_canvas, 1001)
+    def test_returns_dicts_with_expected_keys(self, mock_canvas, mock_course,
+                                              canonical):
+        mock_course.get_assignments.return_value = [canonical.sample_assignment]
+
+        result = list_assignments(mock_canvas, canonical.course_id)
         a = result[0]
         assert a["id"] == 42
         assert a["name"] == "Essay 1"
@@ -73,106 +70,52 @@ class TestListAssignments:
         assert a["submission_types"] == ["online_upload"]
         assert a["published"] is True
 
-    def test_returns_empty_list_when_no_assignments(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+    def test_returns_empty_list_when_no_assignments(self, mock_canvas, mock_course):
         mock_course.get_assignments.return_value = []
 
         result = list_assignments(mock_canvas, 1001)
         assert result == []
 
-    def test_handles_missing_due_at(self):
-        """Assignment with no due date should return None for due_at."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-
-        assignment = _make_mock_assignment(1, "No Due Date HW", 100)
-        assignment.due_at = None
+    @pytest.mark.parametrize("attr,default", [
+        ("due_at", None),
+        ("description", ""),
+        ("points_possible", 0),
+        ("needs_grading_count", 0),
+    ])
+    def test_missing_attr_defaults(self, mock_canvas, mock_course, attr, default):
+        """An attribute Canvas leaves out gets its documented default."""
+        assignment = make_assignment(1, "HW1", 100)
+        vars(assignment).pop(attr, None)
         mock_course.get_assignments.return_value = [assignment]
 
         result = list_assignments(mock_canvas, 1001)
-        assert result[0]["due_at"] is None
-
-    def test_handles_missing_description(self):
-        """Assignment with no description should return empty string."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-
-        assignment = _make_mock_assignment(1, "HW1", 100)
-        del assignment.description
-        mock_course.get_assignments.return_value = [assignment]
-
-        result = list_assignments(mock_canvas, 1001)
-        assert result[0]["description"] == ""
-
-    def test_handles_missing_points_possible(self):
-        """Assignment with no points_possible should return 0."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-
-        assignment = _make_mock_assignment(1, "Ungraded", 100)
-        del assignment.points_possible
-        mock_course.get_assignments.return_value = [assignment]
-
-        result = list_assignments(mock_canvas, 1001)
-        assert result[0]["points_possible"] == 0
-
-    def test_raises_on_course_fetch_error(self):
-        mock_canvas = MagicMock()
-        mock_canvas.get_course.side_effect = Exception("Course not found")
-
-        with pytest.raises(RuntimeError, match="Failed to fetch assignments"):
-            list_assignments(mock_canvas, 1001)
+        assert result[0][attr] == default
 
-    def test_raises_on_assignments_fetch_error(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignments.side_effect = Exception("API timeout")
+    @pytest.mark.parametrize("owner,attr", [
+        ("mock_canvas", "get_course"),
+        ("mock_course", "get_assignments"),
+    ])
+    def test_raises_on_api_error(self, request, mock_canvas, owner, attr):
+        fail_call(request.getfixturevalue(owner), attr)
 
         with pytest.raises(RuntimeError, match="Failed to fetch assignments"):
             list_assignments(mock_canvas, 1001)
 
-    def test_includes_needs_grading_count(self):
+    def test_includes_needs_grading_count(self, mock_canvas, mock_course):
         """Returned dicts should include needs_grading_count."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-
-        assignment = _make_mock_assignment(1, "HW1", 100)
+        assignment = make_assignment(1, "HW1", 100)
         assignment.needs_grading_count = 5
         mock_course.get_assignments.return_value = [assignment]
 
         result = list_assignments(mock_canvas, 1001)
         assert result[0]["needs_grading_count"] == 5
 
-    def test_needs_grading_count_defaults_to_zero(self):
-        """Missing needs_grading_count should default to 0."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-
-        assignment = _make_mock_assignment(1, "HW1", 100)
-        del assignment.needs_grading_count
-        mock_course.get_assignments.return_value = [assignment]
-
-        result = list_assignments(mock_canvas, 1001)
-        assert result[0]["needs_grading_count"] == 0
-
 
 class TestCreateAssignment:
     """Tests for creating a new assignment in a course."""
 
-    def test_creates_assignment_with_required_fields(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-
-        mock_new = _make_mock_assignment(10, "New HW", 100)
+    def test_creates_assignment_with_required_fields(self, mock_canvas, mock_course):
+        mock_new = make_assignment(10, "New HW", 100)
         mock_course.create_assignment.return_value = mock_new
 
         data = {"name": "New HW", "points_possible": 100}
@@ -181,10 +124,7 @@ class TestCreateAssignment:
         assert result.id == 10
         assert result.name == "New HW"
 
-    def test_passes_data_under_assignment_key(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+    def test_passes_data_under_assignment_key(self, mock_canvas, mock_course):
         mock_course.create_assignment.return_value = MagicMock()
 
         data = {
@@ -195,23 +135,18 @@ class TestCreateAssignment:
         }
         create_assignment(mock_canvas, 1001, data)
 
-        mock_course.create_assignment.assert_called_once_with(
-            assignment=data
-        )
+        assert mock_course.create_assignment.call_count == 1
+
+        assert mock_course.create_assignment.call_args.kwargs == {"assignment": data}
 
-    def test_fetches_correct_course(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+    def test_fetches_correct_course(self, mock_canvas, mock_course):
         mock_course.create_assignment.return_value = MagicMock()
 
         create_assignment(mock_canvas, 5555, {"name": "Test"})
-        mock_canvas.get_course.assert_called_once_with(5555)
+        assert mock_canvas.get_course.call_count == 1
+        assert mock_canvas.get_course.call_args.args == (5555,)
 
-    def test_creates_assignment_with_all_optional_fields(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+    def test_creates_assignment_with_all_optional_fields(self, mock_canvas, mock_course):
         mock_course.create_assignment.return_value = MagicMock()
 
         data = {
@@ -223,20 +158,15 @@ class TestCreateAssignment:
             "published": False,
         }
         create_assignment(mock_canvas, 1001, data)
-        mock_course.create_assignment.assert_called_once_with(assignment=data)
-
-    def test_raises_on_course_fetch_error(self):
-        mock_canvas = MagicMock()
-        mock_canvas.get_course.side_effect = Exception("Course not found")
+        assert mock_course.create_assignment.call_count == 1
+        assert mock_course.create_assignment.call_args.kwargs == {"assignment": data}
 
-        with pytest.raises(RuntimeError, match="Failed to create assignment"):
-            create_assignment(mock_canvas, 1001, {"name": "Test"})
-
-    def test_raises_on_create_api_error(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.create_assignment.side_effect = Exception("Validation error")
+    @pytest.mark.parametrize("owner,attr", [
+        ("mock_canvas", "get_course"),
+        ("mock_course", "create_assignment"),
+    ])
+    def test_raises_on_api_error(self, request, mock_canvas, owner, attr):
+        fail_call(request.getfixturevalue(owner), attr)
 
         with pytest.raises(RuntimeError, match="Failed to create assignment"):
             create_assignment(mock_canvas, 1001, {"name": "Bad Assignment"})
@@ -245,78 +175,38 @@ class TestCreateAssignment:
 class TestUpdateAssignment:
     """Tests for updating an existing assignment."""
 
-    def test_updates_assignment_successfully(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
-        mock_assignment.edit.return_value = mock_assignment
-
+    def test_updates_assignment_successfully(self, mock_canvas, mock_assignment):
         data = {"name": "Updated HW", "points_possible": 150}
         result = update_assignment(mock_canvas, 1001, 42, data)
 
         assert result == mock_assignment
 
-    def test_fetches_correct_course_and_assignment(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
-        mock_assignment.edit.return_value = mock_assignment
-
+    def test_fetches_correct_course_and_assignment(self, mock_canvas, mock_course):
         update_assignment(mock_canvas, 1001, 42, {"name": "Test"})
-        mock_canvas.get_course.assert_called_once_with(1001)
-        mock_course.get_assignment.assert_called_once_with(42)
-
-    def test_passes_data_under_assignment_key(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
-        mock_assignment.edit.return_value = mock_assignment
+        assert mock_canvas.get_course.call_count == 1
+        assert mock_canvas.get_course.call_args.args == (1001,)
+        assert mock_course.get_assignment.call_count == 1
+        assert mock_course.get_assignment.call_args.args == (42,)
 
+    def test_passes_data_under_assignment_key(self, mock_canvas, mock_assignment):
         data = {"name": "Renamed", "due_at": "2025-12-15T23:59:00Z"}
         update_assignment(mock_canvas, 1001, 42, data)
-        mock_assignment.edit.assert_called_once_with(assignment=data)
-
-    def test_updates_single_field(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
-        mock_assignment.edit.return_value = mock_assignment
+        assert mock_assignment.edit.call_count == 1
+        assert mock_assignment.edit.call_args.kwargs == {"assignment": data}
 
+    def test_updates_single_field(self, mock_canvas, mock_assignment):
         data = {"published": True}
         update_assignment(mock_canvas, 1001, 42, data)
-        mock_assignment.edit.assert_called_once_with(assignment={"published": True})
-
-    def test_raises_on_course_fetch_error(self):
-        mock_canvas = MagicMock()
-        mock_canvas.get_course.side_effect = Exception("Course not found")
-
-        with pytest.raises(RuntimeError, match="Failed to update assignment"):
-            update_assignment(mock_canvas, 1001, 42, {"name": "Test"})
-
-    def test_raises_on_assignment_fetch_error(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.side_effect = Exception("Assignment not found")
-
-        with pytest.raises(RuntimeError, match="Failed to update assignment"):
-            update_assignment(mock_canvas, 1001, 42, {"name": "Test"})
-
-    def test_raises_on_edit_api_error(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
-        mock_assignment.edit.side_effect = Exception("Forbidden")
+        assert mock_assignment.edit.call_count == 1
+        assert mock_assignment.edit.call_args.kwargs == {"assignment": {"published": True}}
+
+    @pytest.mark.parametrize("owner,attr", [
+        ("mock_canvas", "get_course"),
+        ("mock_course", "get_assignment"),
+        ("mock_assignment", "edit"),
+    ])
+    def test_raises_on_api_error(self, request, mock_canvas, owner, attr):
+        fail_call(request.getfixturevalue(owner), attr)
 
         with pytest.raises(RuntimeError, match="Failed to update assignment"):
             update_assignment(mock_canvas, 1001, 42, {"name": "Test"})
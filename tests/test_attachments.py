@@ -0,0 +1,190 @@
+"""Tests for attachment download and content extraction (src.attachments)."""
+
+import os
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+import src.attachments as attachments
+from src.attachments import _parse_attachment, download_attachment
+
+
+def _cached_entries(cache_dir, namespace):
+    return list((cache_dir / namespace).glob("*.json"))
+
+
+class _Response:
+    """Just enough of a streamed requests.Response for download_attachment()."""
+
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body        = body
+        self.headers     = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error")
+
+    def iter_content(self, chunk_size):
+        yield self.body
+
+
+@pytest.fixture
+def http(monkeypatch):
+    """Mock session behind download_attachment(); queue responses on .get."""
+    session = MagicMock()
+    monkeypatch.setattr(attachments, "http_session", lambda: session)
+    return session
+
+
+def _download(att):
+    """download_attachment()'s file contents, removing the file."""
+    path = download_attachment(att)
+    try:
+        with open(path, "rb") as fh:
+            return fh.read()
+    finally:
+        os.unlink(path)
+
+
+_ATT = SimpleNamespace(url="https://canvas.test/files/1/download",
+                       filename="essay.pdf", size=5)
+
+
+# ===========================================================================
+# download_attachment
+# ===========================================================================
+
+class TestDownloadAttachment:
+    """Tests for downloads and conditional re-downloads."""
+
+    def test_revalidates_with_etag_and_reuses_body_on_304(self, cache_dir, http):
+        http.get.side_effect = [
+            _Response(200, b"%PDF1", {"ETag": '"v1"'}),
+            _Response(304),
+        ]
+
+        assert _download(_ATT) == b"%PDF1"
+        assert _download(_ATT) == b"%PDF1"
+        first, second = (c.kwargs["headers"] for c in http.get.call_args_list)
+        assert "If-None-Match" not in first
+        assert second["If-None-Match"] == '"v1"'
+
+    @pytest.mark.skipif(os.name != "posix", reason="unlinks an open file")
+    def test_body_pruned_during_revalidation_is_still_served(self, cache_dir,
+                                                             http):
+        http.get.return_value = _Response(200, b"%PDF1", {"ETag": '"v1"'})
+        _download(_ATT)
+
+        def pruned_then_304(url, **kwargs):
+            for body in (cache_dir / "http").glob("*.bin"):
+                body.unlink()
+            return _Response(304)
+        http.get.side_effect = pruned_then_304
+
+        assert _download(_ATT) == b"%PDF1"
+
+    def test_changed_file_replaces_cached_body(self, cache_dir, http):
+        http.get.side_effect = [
+            _Response(200, b"%PDF1", {"ETag": '"v1"'}),
+            _Response(200, b"%PDF2", {"ETag": '"v2"'}),
+            _Response(304),
+        ]
+
+        _download(_ATT)
+        assert _download(_ATT) == b"%PDF2"
+        assert _download(_ATT) == b"%PDF2"
+        assert http.get.call_args.kwargs["headers"]["If-None-Match"] == '"v2"'
+
+    def test_without_validators_nothing_is_kept(self, cache_dir, http):
+        http.get.side_effect = [_Response(200, b"%PDF1"), _Response(200, b"%PDF1")]
+
+        _download(_ATT)
+        _download(_ATT)
+        assert "If-None-Match" not in http.get.call_args.kwargs["headers"]
+        assert not (cache_dir / "http").exists()
+
+    def test_http_error_leaves_no_temp_file(self, cache_dir, http, monkeypatch,
+                                            tmp_path):
+        monkeypatch.setattr(attachments.tempfile, "tempdir", str(tmp_path))
+        http.get.return_value = _Response(404)
+
+        with pytest.raises(requests.HTTPError):
+            download_attachment(_ATT)
+        assert list(tmp_path.glob("cow-att-*")) == []
+
+    def test_too_large_is_refused_before_download(self, http):
+        big = SimpleNamespace(url="https://canvas.test/f", filename="a.pdf",
+                              size=attachments._MAX_DOWNLOAD + 1)
+
+        with pytest.raises(ValueError, match="too large"):
+            download_attachment(big)
+        http.get.assert_not_called()
+
+
+# ===========================================================================
+# _parse_attachment
+# ===========================================================================
+
+class TestParseAttachmentCache:
+    """Tests for which extraction results are kept in the disk cache."""
+
+    def test_text_result_is_cached(self, cache_dir, tmp_path):
+        path = tmp_path / "essay.txt"
+        path.write_text("My essay")
+
+        first = _parse_attachment("essay.txt", "text/plain", str(path))
+
+        assert first == {"text": "My essay", "error": ""}
+        assert len(_cached_entries(cache_dir, "attach")) == 1
+        assert _parse_attachment("essay.txt", "text/plain", str(path)) == first
+
+    def test_parse_error_is_not_cached(self, cache_dir, tmp_path, monkeypatch):
+        monkeypatch.setattr(attachments, "docxlib", None)
+        path = tmp_path / "essay.docx"
+        path.write_bytes(b"PK\x03\x04 not really a docx")
+
+        result = _parse_attachment("essay.docx", "", str(path))
+
+        assert "python-docx is not installed" in result["error"]
+        assert _cached_entries(cache_dir, "attach") == []
+
+    @pytest.fixture
+    def fake_pdf(self, tmp_path, monkeypatch):
+        """A PDF whose one page holds some text and one image."""
+        monkeypatch.setattr(attachments, "fitz", None)
+        monkeypatch.setattr(
+            attachments, "_pdf_pages_pypdf",
+            lambda path: [(1, "Page text", [(b"img", ".png")])],
+        )
+        path = tmp_path / "scan.pdf"
+        path.write_bytes(b"%PDF-1.4")
+        return str(path)
+
+    def test_pdf_with_transient_ocr_failure_is_not_cached(self, cache_dir,
+                                                          fake_pdf, monkeypatch):
+        monkeypatch.setattr(attachments, "_analyze_images_batch",
+                            lambda images: ["[Image: analysis timed out]"])
+
+        result = _parse_attachment("scan.pdf", "application/pdf", fake_pdf)
+
+        assert "[Image: analysis timed out]" in result["text"]
+        assert _cached_entries(cache_dir, "attach") == []
+
+    def test_pdf_without_readable_image_text_is_cached(self, cache_dir,
+                                                       fake_pdf, monkeypatch):
+        monkeypatch.setattr(attachments, "_analyze_images_batch",
+                            lambda images: ["[Image: no readable text detected]"])
+
+        result = _parse_attachment("scan.pdf", "application/pdf", fake_pdf)
+
+        assert result == {"text": "Page text", "error": ""}
+        assert len(_cached_entries(cache_dir, "attach")) == 1
@@ -1,48 +1,55 @@
 """Tests for Module 1: Auth & Canvas Connection."""
 
-import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 
 import pytest
 
-from src.auth import get_api_token, create_canvas_connection, verify_connection
+from src.auth import (
+    get_api_token, create_canvas_connection, http_session, verify_connection,
+)
+from tests._factories import raising
 
 
 class TestGetApiToken:
     """Tests for loading CANVAS_API_TOKEN from environment."""
 
-    def test_returns_token_when_set(self):
-        with patch.dict(os.environ, {"CANVAS_API_TOKEN": "test-token-123"}):
-            token = get_api_token()
-            assert token == "test-token-123"
+    def test_returns_token_when_set(self, monkeypatch):
+        monkeypatch.setenv("CANVAS_API_TOKEN", "test-token-123")
+        token = get_api_token()
+        assert token == "test-token-123"
 
-    def test_raises_when_token_missing(self):
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(EnvironmentError, match="CANVAS_API_TOKEN"):
-                get_api_token()
+    def test_raises_when_token_missing(self, monkeypatch):
+        monkeypatch.delenv("CANVAS_API_TOKEN", raising=False)
+        with pytest.raises(EnvironmentError, match="CANVAS_API_TOKEN"):
+            get_api_token()
 
-    def test_raises_when_token_empty(self):
-        with patch.dict(os.environ, {"CANVAS_API_TOKEN": ""}):
-            with pytest.raises(EnvironmentError, match="CANVAS_API_TOKEN"):
-                get_api_token()
+    def test_raises_when_token_empty(self, monkeypatch):
+        monkeypatch.setenv("CANVAS_API_TOKEN", "")
+        with pytest.raises(EnvironmentError, match="CANVAS_API_TOKEN"):
+            get_api_token()
+
+
+@pytest.fixture
+def patched_canvas(monkeypatch):
+    """Replace src.auth.Canvas with a MagicMock for one test."""
+    canvas_cls = MagicMock()
+    monkeypatch.setattr("src.auth.Canvas", canvas_cls)
+    return canvas_cls
 
 
 class TestCreateCanvasConnection:
     """Tests for establishing canvasapi connection."""
 
-    @patch("src.auth.Canvas")
-    def test_creates_canvas_with_correct_url_and_token(self, mock_canvas_cls):
-        mock_canvas_cls.return_value = MagicMock()
+    def test_creates_canvas_with_correct_url_and_token(self, patched_canvas):
         conn = create_canvas_connection("test-token")
-        mock_canvas_cls.assert_called_once_with(
+        patched_canvas.assert_called_once_with(
             "https://frostburg.instructure.com/", "test-token"
         )
-        assert conn is mock_canvas_cls.return_value
+        assert conn is patched_canvas.return_value
 
-    @patch("src.auth.Canvas")
-    def test_returns_canvas_instance(self, mock_canvas_cls):
+    def test_returns_canvas_instance(self, patched_canvas):
         mock_instance = MagicMock()
-        mock_canvas_cls.return_value = mock_instance
+        patched_canvas.return_value = mock_instance
         result = create_canvas_connection("token")
         assert result == mock_instance
 
@@ -64,7 +71,18 @@ class TestVerifyConnection:
 
     def test_verify_raises_on_failure(self):
         mock_canvas = MagicMock()
-        mock_canvas.get_current_user.side_effect = Exception("Unauthorized")
+        mock_canvas.get_current_user = raising(Exception("Unauthorized"))
 
         with pytest.raises(ConnectionError, match="Failed to verify"):
             verify_connection(mock_canvas)
+
+
+class TestHttpSession:
+    """Tests for the shared keep-alive HTTP session."""
+
+    def test_returns_same_session(self):
+        assert http_session() is http_session()
+
+    def test_retries_failed_connections(self):
+        adapter = http_session().get_adapter("https://example.com/")
+        assert adapter.max_retries.total == 3
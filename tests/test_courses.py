@@ -1,26 +1,14 @@
 """Tests for Module 2: Course List Screen."""
 
-from unittest.mock import MagicMock, patch, PropertyMock
+from unittest.mock import MagicMock
 
 import pytest
 
-from src.courses import get_courses, format_course_info
-
-
-def _make_mock_course(name, code, term_name, enrollments_count=25):
-    """Helper to create a mock Canvas course object."""
-    course = MagicMock()
-    course.name = name
-    course.course_code = code
-    course.id = 1001
-
-    # Term is a dict attribute on the course object
-    course.term = {"name": term_name}
-
-    # total_students is an attribute returned when include[]=total_students
-    course.total_students = enrollments_count
-
-    return course
+from src.courses import (
+    get_assignment_cached, get_courses, get_course_cached, get_current_term_courses,
+    format_course_info,
+)
+from tests._factories import make_course, raising
 
 
 class TestGetCourses:
@@ -29,8 +17,8 @@ class TestGetCourses:
     def test_returns_list_of_courses(self):
         mock_canvas = MagicMock()
         mock_courses = [
-            _make_mock_course("Intro to CS", "CS101", "Fall 2025", 30),
-            _make_mock_course("Data Structures", "CS201", "Fall 2025", 22),
+            make_course("Intro to CS", "CS101", "Fall 2025", 30),
+            make_course("Data Structures", "CS201", "Fall 2025", 22),
         ]
         mock_canvas.get_courses.return_value = mock_courses
 
@@ -56,6 +44,14 @@ class TestGetCourses:
         assert "term" in includes
         assert "total_students" in includes
 
+    def test_requests_full_pages(self):
+        mock_canvas = MagicMock()
+        mock_canvas.get_courses.return_value = []
+
+        get_courses(mock_canvas)
+        call_kwargs = mock_canvas.get_courses.call_args[1]
+        assert call_kwargs["per_page"] == 100
+
     def test_returns_empty_list_when_no_courses(self):
         mock_canvas = MagicMock()
         mock_canvas.get_courses.return_value = []
@@ -65,17 +61,93 @@ class TestGetCourses:
 
     def test_raises_on_api_error(self):
         mock_canvas = MagicMock()
-        mock_canvas.get_courses.side_effect = Exception("API error")
+        mock_canvas.get_courses = raising(Exception("API error"))
 
         with pytest.raises(RuntimeError, match="Failed to fetch courses"):
             get_courses(mock_canvas)
 
 
+class TestGetCourseCached:
+    """Tests for the per-connection course object cache."""
+
+    def test_fetches_each_course_once(self):
+        mock_canvas = MagicMock()
+
+        first = get_course_cached(mock_canvas, 1001)
+        second = get_course_cached(mock_canvas, 1001)
+        assert first is second
+        mock_canvas.get_course.assert_called_once_with(1001)
+
+    def test_caches_per_connection(self):
+        canvas_a, canvas_b = MagicMock(), MagicMock()
+
+        get_course_cached(canvas_a, 1001)
+        get_course_cached(canvas_b, 1001)
+        canvas_a.get_course.assert_called_once_with(1001)
+        canvas_b.get_course.assert_called_once_with(1001)
+
+    def test_does_not_cache_failures(self):
+        mock_canvas = MagicMock()
+        mock_canvas.get_course.side_effect = [Exception("API error"), MagicMock()]
+
+        with pytest.raises(Exception, match="API error"):
+            get_course_cached(mock_canvas, 1001)
+        get_course_cached(mock_canvas, 1001)
+        assert mock_canvas.get_course.call_count == 2
+
+
+class TestGetAssignmentCached:
+    """Tests for the per-connection assignment object cache."""
+
+    def test_fetches_each_assignment_once(self):
+        mock_canvas = MagicMock()
+        mock_course = mock_canvas.get_course.return_value
+
+        first = get_assignment_cached(mock_canvas, 1001, 42)
+        second = get_assignment_cached(mock_canvas, 1001, 42)
+        assert first is second
+        mock_course.get_assignment.assert_called_once_with(42)
+
+    def test_keys_by_course_and_assignment(self):
+        mock_canvas = MagicMock()
+        mock_course = mock_canvas.get_course.return_value
+
+        get_assignment_cached(mock_canvas, 1001, 42)
+        get_assignment_cached(mock_canvas, 1001, 43)
+        get_assignment_cached(mock_canvas, 1002, 42)
+        assert mock_course.get_assignment.call_count == 3
+        assert mock_canvas.get_course.call_count == 2
+
+
+class TestGetCurrentTermCourses:
+    """Tests for picking out the latest academic term's courses."""
+
+    def test_keeps_only_latest_term(self):
+        old = make_course("Old", "CS100", "2025 Fall")
+        new_a = make_course("New A", "CS101", "2026 Spring")
+        new_b = make_course("New B", "CS102", "2026 spring")
+        assert get_current_term_courses([old, new_a, new_b]) == [new_a, new_b]
+
+    def test_season_order_within_year(self):
+        spring = make_course("Spring", "CS101", "2026 Spring")
+        fall = make_course("Fall", "CS102", "2026 Fall")
+        assert get_current_term_courses([fall, spring]) == [fall]
+
+    def test_ignores_non_year_terms(self):
+        default = make_course("Sandbox", "SBX", "Default Term")
+        current = make_course("Intro", "CS101", "2026 Spring")
+        assert get_current_term_courses([default, current]) == [current]
+
+    def test_returns_all_when_no_year_terms(self):
+        courses = [make_course("Sandbox", "SBX", "Default Term")]
+        assert get_current_term_courses(courses) == courses
+
+
 class TestFormatCourseInfo:
     """Tests for formatting course data for display."""
 
     def test_formats_single_course(self):
-        course = _make_mock_course("Intro to CS", "CS101", "Fall 2025", 30)
+        course = make_course("Intro to CS", "CS101", "Fall 2025", 30)
         info = format_course_info(course)
 
         assert info["name"] == "Intro to CS"
@@ -84,7 +156,7 @@ class TestFormatCourseInfo:
         assert info["term"] == "Fall 2025"
 
     def test_handles_missing_term(self):
-        course = _make_mock_course("Intro to CS", "CS101", "Fall 2025", 30)
+        course = make_course("Intro to CS", "CS101", "Fall 2025", 30)
         # Simulate missing term attribute
         del course.term
         course.term = None
@@ -93,7 +165,7 @@ class TestFormatCourseInfo:
         assert info["term"] == "N/A"
 
     def test_handles_missing_total_students(self):
-        course = _make_mock_course("Intro to CS", "CS101", "Fall 2025", 30)
+        course = make_course("Intro to CS", "CS101", "Fall 2025", 30)
         del course.total_students
         course.total_students = None
 
@@ -101,6 +173,6 @@ class TestFormatCourseInfo:
         assert info["students"] == 0
 
     def test_includes_course_id(self):
-        course = _make_mock_course("Intro to CS", "CS101", "Fall 2025", 30)
+        course = make_course("Intro to CS", "CS101", "Fall 2025", 30)
         info = format_course_info(course)
         assert info["id"] == 1001
@@ -0,0 +1,98 @@
+"""Tests for the persistent JSON/file cache (src.disk_cache)."""
+
+import os
+
+from src import disk_cache
+
+
+def _src_file(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+# ===========================================================================
+# make_key / make_file_key
+# ===========================================================================
+
+class TestKeys:
+    """Tests for content-hash cache keys."""
+
+    def test_same_parts_same_key(self):
+        assert disk_cache.make_key("a", b"b") == disk_cache.make_key(b"a", "b")
+
+    def test_part_boundaries_matter(self):
+        assert disk_cache.make_key("ab", "c") != disk_cache.make_key("a", "bc")
+
+    def test_tagged_with_version(self):
+        assert disk_cache.make_key("a").endswith(f"-{disk_cache.CACHE_VERSION}")
+
+    def test_file_key_hashes_contents_first(self, tmp_path):
+        path = _src_file(tmp_path, "a.txt", 3)
+
+        assert disk_cache.make_file_key(path, ".txt") == \
+            disk_cache.make_key(b"xxx", ".txt")
+
+
+# ===========================================================================
+# get / put
+# ===========================================================================
+
+class TestEntries:
+    """Tests for JSON entries."""
+
+    def test_round_trip(self, cache_dir):
+        disk_cache.put("attach", "k", {"text": "hi", "error": ""})
+
+        assert disk_cache.get("attach", "k") == {"text": "hi", "error": ""}
+        assert disk_cache.get("attach", "other") is None
+
+    def test_corrupt_entry_is_a_miss(self, cache_dir):
+        disk_cache.put("attach", "k", "fine")
+        (cache_dir / "attach" / "k.json").write_text("{not json")
+
+        assert disk_cache.get("attach", "k") is None
+
+    def test_unwritable_cache_is_ignored(self, cache_dir):
+        cache_dir.parent.mkdir(exist_ok=True)
+        cache_dir.write_text("a file where the directory should be")
+
+        disk_cache.put("attach", "k", "value")   # must not raise
+        assert disk_cache.get("attach", "k") is None
+
+
+# ===========================================================================
+# put_file / get_file
+# ===========================================================================
+
+class TestFileBodies:
+    """Tests for stored file bodies and their size cap."""
+
+    def test_round_trip(self, cache_dir, tmp_path):
+        src = _src_file(tmp_path, "a.pdf", 10)
+
+        assert disk_cache.put_file("http", "k1", src) is True
+        assert disk_cache.get_file("http", "k1").read_bytes() == b"x" * 10
+        assert disk_cache.get_file("http", "missing") is None
+
+    def test_prunes_least_recently_used(self, cache_dir, tmp_path):
+        for n, key in enumerate(["old", "used", "new"]):
+            disk_cache.put_file("http", key, _src_file(tmp_path, key, 40))
+            disk_cache.put("http", key, {"etag": key})
+            os.utime(disk_cache.file_path("http", key), (n, n))
+        disk_cache.get_file("http", "used")   # now the most recently used
+
+        disk_cache.put_file("http", "newest", _src_file(tmp_path, "newest", 40),
+                            max_bytes=100)
+
+        assert disk_cache.get_file("http", "old") is None
+        assert disk_cache.get("http", "old") is None
+        assert disk_cache.get_file("http", "new") is None
+        assert disk_cache.get_file("http", "used") is not None
+        assert disk_cache.get_file("http", "newest") is not None
+
+    def test_file_over_the_limit_is_not_stored(self, cache_dir, tmp_path):
+        src = _src_file(tmp_path, "big.pdf", 200)
+
+        assert disk_cache.put_file("http", "big", src, max_bytes=100) is False
+        assert disk_cache.get_file("http", "big") is None
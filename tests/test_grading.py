@@ -4,29 +4,30 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from src.grading import list_submissions, calculate_grade, format_submission
+from src.grading import (
+    Rubric, list_submissions, list_submissions_many, calculate_grade,
+    calculate_grades_bulk, format_submission, _grade, _prep_kps,
+)
+from tests._factories import fail_call, make_submission, raising
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _make_mock_submission(submission_id, user_id, body="Some answer",
-                          submitted_at="2025-11-01T10:00:00Z",
-                          workflow_state="submitted", score=None,
-                          user_name="Jane Doe", graded_at=None, attempt=1):
-    """Helper to create a mock Canvas submission object."""
-    sub = MagicMock()
-    sub.id = submission_id
-    sub.user_id = user_id
-    sub.body = body
-    sub.submitted_at = submitted_at
-    sub.workflow_state = workflow_state
-    sub.score = score
-    sub.graded_at = graded_at
-    sub.attempt = attempt
-    sub.user = {"id": user_id, "name": user_name}
-    return sub
+# Marks an attribute the test deletes rather than sets
+_MISSING = object()
+
+
+@pytest.fixture
+def submission_ctx():
+    """(canvas, course, assignment) mocks wired canvas → course → assignment."""
+    canvas = MagicMock()
+    course = MagicMock()
+    assignment = MagicMock()
+    canvas.get_course.return_value = course
+    course.get_assignment.return_value = assignment
+    return canvas, course, assignment
 
 
 # ===========================================================================
@@ -36,53 +37,43 @@ def _make_mock_submission(submission_id, user_id, body="Some answer",
 class TestListSubmissions:
     """Tests for listing submissions for an assignment."""
 
-    def test_returns_list_of_submissions(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
-
+    def test_returns_list_of_submissions(self, submission_ctx):
+        mock_canvas, _, mock_assignment = submission_ctx
         subs = [
-            _make_mock_submission(1, 101, body="Answer 1"),
-            _make_mock_submission(2, 102, body="Answer 2"),
-            _make_mock_submission(3, 103, body="Answer 3"),
+            make_submission(1, 101, body="Answer 1"),
+            make_submission(2, 102, body="Answer 2"),
+            make_submission(3, 103, body="Answer 3"),
         ]
         mock_assignment.get_submissions.return_value = subs
 
         result = list_submissions(mock_canvas, 1001, 42)
         assert len(result) == 3
 
-    def test_fetches_correct_course_and_assignment(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
+    def test_fetches_correct_course_and_assignment(self, submission_ctx):
+        mock_canvas, mock_course, mock_assignment = submission_ctx
         mock_assignment.get_submissions.return_value = []
 
         list_submissions(mock_canvas, 9999, 55)
-        mock_canvas.get_course.assert_called_once_with(9999)
-        mock_course.get_assignment.assert_called_once_with(55)
+        assert mock_canvas.get_course.call_count == 1
+        assert mock_canvas.get_course.call_args.args == (9999,)
+        assert mock_course.get_assignment.call_count == 1
+        assert mock_course.get_assignment.call_args.args == (55,)
 
-    def test_returns_dicts_with_expected_keys(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
+    def test_requests_full_pages(self, submission_ctx):
+        mock_canvas, _, mock_assignment = submission_ctx
+        mock_assignment.get_submissions.return_value = []
 
-        subs = [
-            _make_mock_submission(
-                10, 201, body="My essay text",
-                submitted_at="2025-11-05T08:30:00Z",
-                workflow_state="submitted", score=None,
-                user_name="Alice",
-            ),
-        ]
-        mock_assignment.get_submissions.return_value = subs
+        list_submissions(mock_canvas, 9999, 55)
+        _, kwargs = mock_assignment.get_submissions.call_args
+        assert kwargs["per_page"] == 100
 
-        result = list_submissions(mock_canvas, 1001, 42)
+    def test_returns_dicts_with_expected_keys(self, submission_ctx, canonical):
+        mock_canvas, _, mock_assignment = submission_ctx
+        mock_assignment.get_submissions.return_value = [canonical.sample_submission]
+
+        result = list_submissions(
+            mock_canvas, canonical.course_id, canonical.assignment_id
+        )
         s = result[0]
         assert s["id"] == 10
         assert s["user_id"] == 201
@@ -96,87 +87,78 @@ class TestListSubmissions:
         assert "resubmitted" in s
         assert s["resubmitted"] is False  # not graded yet
 
-    def test_returns_empty_list_when_no_submissions(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
+    def test_returns_empty_list_when_no_submissions(self, submission_ctx):
+        mock_canvas, _, mock_assignment = submission_ctx
         mock_assignment.get_submissions.return_value = []
 
         result = list_submissions(mock_canvas, 1001, 42)
         assert result == []
 
-    def test_handles_missing_body(self):
-        """Submission with no body should return empty string."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
-
-        sub = _make_mock_submission(1, 101, body="placeholder")
-        del sub.body
-        mock_assignment.get_submissions.return_value = [sub]
-
-        result = list_submissions(mock_canvas, 1001, 42)
-        assert result[0]["body"] == ""
-
-    def test_handles_none_body(self):
-        """Submission with body=None should return empty string."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
-
-        sub = _make_mock_submission(1, 101, body=None)
+    @pytest.mark.parametrize("attr,value,expected", [
+        ("body", _MISSING, ""),
+        ("body", None, ""),
+        ("submitted_at", _MISSING, None),
+    ])
+    def test_missing_attr_defaults(self, submission_ctx, attr, value, expected):
+        """A missing or None attribute gets its documented default."""
+        mock_canvas, _, mock_assignment = submission_ctx
+        sub = make_submission(1, 101)
+        if value is _MISSING:
+            delattr(sub, attr)
+        else:
+            setattr(sub, attr, value)
         mock_assignment.get_submissions.return_value = [sub]
 
         result = list_submissions(mock_canvas, 1001, 42)
-        assert result[0]["body"] == ""
-
-    def test_handles_missing_submitted_at(self):
-        """Submission with no submitted_at should return None."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
+        assert result[0][attr] == expected
+
+    # owner is the position in submission_ctx: canvas, course, assignment
+    @pytest.mark.parametrize("owner,attr", [
+        (0, "get_course"),
+        (1, "get_assignment"),
+        (2, "get_submissions"),
+    ])
+    def test_raises_on_api_error(self, submission_ctx, owner, attr):
+        mock_canvas = submission_ctx[0]
+        fail_call(submission_ctx[owner], attr)
 
-        sub = _make_mock_submission(1, 101)
-        del sub.submitted_at
-        mock_assignment.get_submissions.return_value = [sub]
+        with pytest.raises(RuntimeError, match="Failed to fetch submissions"):
+            list_submissions(mock_canvas, 1001, 42)
 
-        result = list_submissions(mock_canvas, 1001, 42)
-        assert result[0]["submitted_at"] is None
 
-    def test_raises_on_course_fetch_error(self):
-        mock_canvas = MagicMock()
-        mock_canvas.get_course.side_effect = Exception("Course not found")
+# ===========================================================================
+# list_submissions_many
+# ===========================================================================
 
-        with pytest.raises(RuntimeError, match="Failed to fetch submissions"):
-            list_submissions(mock_canvas, 1001, 42)
+class TestListSubmissionsMany:
+    """Tests for fetching several assignments' submissions at once."""
 
-    def test_raises_on_assignment_fetch_error(self):
+    def test_returns_results_in_pair_order(self):
         mock_canvas = MagicMock()
         mock_course = MagicMock()
         mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.side_effect = Exception("Assignment not found")
+        assignments = {}
+        for aid in (42, 43, 44):
+            assignments[aid] = MagicMock()
+            assignments[aid].get_submissions.return_value = [
+                make_submission(aid, 100 + aid, body=f"Answer {aid}"),
+            ]
+        mock_course.get_assignment.side_effect = lambda aid: assignments[aid]
+
+        result = list_submissions_many(
+            mock_canvas, [(1001, 44), (1001, 42), (1001, 43)]
+        )
+        assert [r[0]["body"] for r in result] == ["Answer 44", "Answer 42", "Answer 43"]
 
-        with pytest.raises(RuntimeError, match="Failed to fetch submissions"):
-            list_submissions(mock_canvas, 1001, 42)
+    def test_empty_pairs(self):
+        assert list_submissions_many(MagicMock(), []) == []
 
-    def test_raises_on_submissions_fetch_error(self):
+    def test_raises_if_any_fetch_fails(self):
         mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_assignment = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_assignment.return_value = mock_assignment
-        mock_assignment.get_submissions.side_effect = Exception("API timeout")
+        mock_canvas.get_course = raising(Exception("API error"))
 
         with pytest.raises(RuntimeError, match="Failed to fetch submissions"):
-            list_submissions(mock_canvas, 1001, 42)
+            list_submissions_many(mock_canvas, [(1001, 42), (1002, 43)])
 
 
 # ===========================================================================
@@ -356,6 +338,68 @@ class TestCalculateGrade:
         )
         assert result["score"] >= 90
 
+    def test_key_points_prepared_once_per_list(self):
+        """Grading a class against one key-point list case-folds it once."""
+        key_points = ["Recursion", "Base Case", "Stack Frame"]
+        calculate_grade("recursion needs a base case", key_points)
+        before = _prep_kps.cache_info().hits
+        calculate_grade("a stack frame per call", key_points)
+        assert _prep_kps.cache_info().hits == before + 1
+
+    def test_matching_uses_unicode_case_folding(self):
+        """'ß' and 'SS' fold to the same letters, unlike with lower()."""
+        result = calculate_grade("Die STRASSE ist lang", ["Straße"])
+        assert result["score"] == 97
+
+    def test_repeat_grading_is_cached_and_returns_copies(self):
+        key_points = ["recursion", "base case"]
+        first = calculate_grade("recursion with a base case", key_points)
+        first["score"] = -1
+        hits = _grade.cache_info().hits
+        second = calculate_grade("recursion with a base case", key_points)
+        assert _grade.cache_info().hits == hits + 1
+        assert second["score"] == 97
+
+    def test_many_key_points_counts_each_match(self):
+        """Long key-point lists score the same with or without pyahocorasick."""
+        key_points = ["alpha", "beta", "gamma", "delta", "epsilon",
+                      "zeta", "eta", "theta", "beta", "omega"]
+        text = "Alpha and BETA, then gamma; eta shows up inside zeta and theta"
+        # matched: alpha, beta x2, gamma, zeta, eta, theta → 7 of 10
+        result = calculate_grade(text, key_points)
+        assert result["score"] == int(70 + (0.7 - 0.5) * 60)
+
+
+class TestCalculateGradesBulk:
+    """Tests for grading a whole class against one key-point list."""
+
+    def test_matches_calculate_grade_in_order(self):
+        key_points = ["recursion", "base case", "stack"]
+        texts = [
+            "Recursion needs a base case and uses the stack.",
+            "Recursion is neat.",
+            "",
+            "Nothing relevant here.",
+        ]
+        assert calculate_grades_bulk(texts, key_points) == [
+            calculate_grade(t, key_points) for t in texts
+        ]
+
+    def test_empty_class(self):
+        assert calculate_grades_bulk([], ["recursion"]) == []
+
+    def test_rubric_matches_plain_list(self):
+        key_points = ["Recursion", "Base Case", "stack"]
+        rubric = Rubric(key_points)
+        texts = ["recursion needs a BASE CASE", "", "unrelated"]
+
+        assert rubric.key_points == tuple(key_points)
+        assert rubric.folded == ("recursion", "base case", "stack")
+        assert calculate_grades_bulk(texts, rubric) == \
+            calculate_grades_bulk(texts, key_points)
+        assert calculate_grade(texts[0], rubric) == \
+            calculate_grade(texts[0], key_points)
+
 
 # ===========================================================================
 # format_submission
@@ -0,0 +1,367 @@
+"""Tests for the AI grading pipeline (src.grading_ai)."""
+
+import os
+import subprocess
+import time
+from collections import OrderedDict
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+import src.grading_ai as grading_ai
+from src.grading_ai import (
+    _claude_json, _first_json, grade_many_submissions, grade_one_submission,
+    post_grades,
+)
+from tests._factories import make_submission, raising
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+_GRADES = [
+    {"user_id": 101, "student_name": "Alice", "score": 9.0,
+     "letter_grade": "A", "comments": "Nice work."},
+    {"user_id": 102, "student_name": "Bob", "score": 7.5,
+     "letter_grade": "C", "comments": ""},
+]
+
+
+@pytest.fixture
+def bulk_ctx(monkeypatch):
+    """(canvas, assignment) mocks, with bulk-update polling made instant."""
+    monkeypatch.setattr(grading_ai, "_BULK_POLL_S", 0)
+    canvas = MagicMock()
+    course = MagicMock()
+    assignment = MagicMock()
+    canvas.get_course.return_value = course
+    course.get_assignment.return_value = assignment
+    return canvas, assignment
+
+
+_REQ = {
+    "name": "Essay 1", "points_possible": 10,
+    "description": "Write an essay", "rubric_text": "",
+}
+
+
+class _Calls(list):
+    """A call log the fake_claude fixture can hang a canned reply on."""
+
+
+@pytest.fixture
+def fake_claude(monkeypatch):
+    """Replace the claude CLI call; returns the list of (prompt, kind) calls.
+
+    Batch prompts get one entry per <submission> (score 8, or what the
+    test sets in fake_claude.batch_reply); single prompts get score 9.
+    """
+    monkeypatch.setattr(grading_ai, "_grade_cache", OrderedDict())
+    calls = _Calls()
+
+    def _claude_json(prompt, timeout, kind):
+        calls.append((prompt, kind))
+        if kind is dict:
+            return {"score": 9, "letter_grade": "A", "comments": "Single."}
+        reply = getattr(calls, "batch_reply", None)
+        if isinstance(reply, Exception):
+            raise reply
+        if reply is not None:
+            return reply
+        return [
+            {"id": n, "score": 8, "letter_grade": "B", "comments": "Batch."}
+            for n in range(1, prompt.count("<submission id=") + 1)
+        ]
+
+    monkeypatch.setattr(grading_ai, "_claude_json", _claude_json)
+    return calls
+
+
+def _progress(state, completion=100):
+    return SimpleNamespace(workflow_state=state, completion=completion)
+
+
+def _stored(*scores):
+    """Canvas submissions holding the given scores for _GRADES' users."""
+    return [
+        make_submission(i, g["user_id"], score=score)
+        for i, (g, score) in enumerate(zip(_GRADES, scores), 1)
+    ]
+
+
+# ===========================================================================
+# post_grades
+# ===========================================================================
+
+class TestPostGrades:
+    """Tests for posting grades through Canvas' bulk update."""
+
+    def test_bulk_update_confirmed(self, bulk_ctx):
+        canvas, assignment = bulk_ctx
+        assignment.submissions_bulk_update.return_value = _progress("completed")
+        assignment.get_submissions.return_value = _stored(9.0, 7.5)
+
+        outcome = post_grades(canvas, 1001, 42, _GRADES)
+
+        assert outcome == {"ok": 2, "errors": [], "failed": []}
+        grade_data = assignment.submissions_bulk_update.call_args[1]["grade_data"]
+        assert grade_data == {
+            "101": {"posted_grade": 9.0, "text_comment": "Nice work."},
+            "102": {"posted_grade": 7.5},
+        }
+        assignment.get_submission.assert_not_called()
+
+    def test_user_canvas_skipped_is_an_error(self, bulk_ctx):
+        canvas, assignment = bulk_ctx
+        assignment.submissions_bulk_update.return_value = _progress("completed")
+        assignment.get_submissions.return_value = _stored(9.0, None)
+
+        outcome = post_grades(canvas, 1001, 42, _GRADES)
+
+        assert outcome["ok"] == 1
+        assert outcome["failed"] == [102]
+        assert outcome["errors"][0].startswith("Bob: ")
+
+    def test_polling_error_is_reported_not_reposted(self, bulk_ctx):
+        canvas, assignment = bulk_ctx
+        running = _progress("running", 10)
+        running.query = raising(ConnectionError("connection reset"))
+        assignment.submissions_bulk_update.return_value = running
+        assignment.get_submissions.return_value = _stored(None, None)
+
+        outcome = post_grades(canvas, 1001, 42, _GRADES)
+
+        assert assignment.submissions_bulk_update.call_count == 1
+        assignment.get_submission.assert_not_called()
+        assert outcome["ok"] == 0
+        assert outcome["failed"] == [101, 102]
+        assert all("connection reset" in e for e in outcome["errors"])
+
+    def test_failed_job_is_reported_not_reposted(self, bulk_ctx):
+        canvas, assignment = bulk_ctx
+        assignment.submissions_bulk_update.return_value = _progress("failed")
+        # The job got as far as Alice before failing
+        assignment.get_submissions.return_value = _stored(9.0, None)
+
+        outcome = post_grades(canvas, 1001, 42, _GRADES)
+
+        assignment.get_submission.assert_not_called()
+        assert outcome["ok"] == 1
+        assert outcome["failed"] == [102]
+
+    def test_timeout_is_reported_not_reposted(self, bulk_ctx, monkeypatch):
+        monkeypatch.setattr(grading_ai, "_BULK_TIMEOUT_S", -1)
+        canvas, assignment = bulk_ctx
+        assignment.submissions_bulk_update.return_value = _progress("running", 0)
+        assignment.get_submissions.return_value = _stored(None, None)
+
+        outcome = post_grades(canvas, 1001, 42, _GRADES)
+
+        assignment.get_submission.assert_not_called()
+        assert outcome["failed"] == [101, 102]
+        assert all("still running" in e for e in outcome["errors"])
+
+    def test_unreadable_scores_fail_everyone(self, bulk_ctx):
+        canvas, assignment = bulk_ctx
+        assignment.submissions_bulk_update.return_value = _progress("completed")
+        assignment.get_submissions = raising(ConnectionError("offline"))
+
+        outcome = post_grades(canvas, 1001, 42, _GRADES)
+
+        assert outcome["ok"] == 0
+        assert outcome["failed"] == [101, 102]
+
+    def test_rejected_bulk_request_falls_back_per_user(self, bulk_ctx):
+        canvas, assignment = bulk_ctx
+        assignment.submissions_bulk_update = raising(Exception("404"))
+        sub = MagicMock()
+        assignment.get_submission.return_value = sub
+
+        outcome = post_grades(canvas, 1001, 42, _GRADES)
+
+        assert outcome == {"ok": 2, "errors": [], "failed": []}
+        assert sub.edit.call_count == 2
+
+    def test_failed_grading_is_held_back(self, bulk_ctx):
+        canvas, assignment = bulk_ctx
+        assignment.submissions_bulk_update.return_value = _progress("completed")
+        assignment.get_submissions.return_value = _stored(9.0, None)
+        grades = [_GRADES[0], {**_GRADES[1], "score": 0.0, "error": "AI timeout"}]
+
+        outcome = post_grades(canvas, 1001, 42, grades)
+
+        grade_data = assignment.submissions_bulk_update.call_args[1]["grade_data"]
+        assert list(grade_data) == ["101"]
+        assert outcome["ok"] == 1
+        assert outcome["failed"] == [102]
+        assert outcome["errors"] == ["Bob: not posted (AI timeout)"]
+
+    def test_per_user_failures_name_the_user(self, bulk_ctx):
+        canvas, assignment = bulk_ctx
+        assignment.submissions_bulk_update = raising(Exception("404"))
+
+        def get_submission(user_id):
+            if user_id == 102:
+                raise Exception("locked")
+            return MagicMock()
+        assignment.get_submission.side_effect = get_submission
+
+        outcome = post_grades(canvas, 1001, 42, _GRADES)
+
+        assert outcome["ok"] == 1
+        assert outcome["failed"] == [102]
+        assert outcome["errors"] == ["Bob: locked"]
+
+
+# ===========================================================================
+# grade_many_submissions
+# ===========================================================================
+
+class TestGradeManySubmissions:
+    """Tests for grading a group of submissions in one Claude call."""
+
+    def test_batches_everyone_in_one_call(self, fake_claude):
+        results = grade_many_submissions(_REQ, [("Ann", "one"), ("Ben", "two")])
+
+        assert [r["score"] for r in results] == [8.0, 8.0]
+        assert len(fake_claude) == 1
+        assert fake_claude[0][1] is list
+
+    def test_blank_and_remembered_text_skip_the_call(self, fake_claude):
+        grade_one_submission(_REQ, "Ann", "already graded")
+        fake_claude.clear()
+
+        results = grade_many_submissions(_REQ, [
+            ("Ann", "already graded"), ("Ben", "   "),
+            ("Cat", "new one"), ("Dan", "new two"),
+        ])
+
+        assert [r["score"] for r in results] == [9.0, 0.0, 8.0, 8.0]
+        (prompt, _), = fake_claude
+        assert prompt.count("<submission id=") == 2
+        assert "already graded" not in prompt
+
+    def test_fresh_regrades_remembered_text(self, fake_claude):
+        grade_many_submissions(_REQ, [("Ann", "one"), ("Ben", "two")])
+        fake_claude.clear()
+
+        cached = grade_many_submissions(_REQ, [("Ann", "one"), ("Ben", "two")])
+        assert fake_claude == []
+
+        fresh = grade_many_submissions(_REQ, [("Ann", "one"), ("Ben", "two")],
+                                       fresh=True)
+        assert len(fake_claude) == 1
+        assert cached == fresh
+
+    def test_fresh_reaches_single_submission_path(self, fake_claude):
+        grade_one_submission(_REQ, "Ann", "one")
+        fake_claude.clear()
+
+        grade_many_submissions(_REQ, [("Ann", "one"), ("Ben", "")], fresh=True)
+        assert [kind for _, kind in fake_claude] == [dict]
+
+    def test_remembered_results_are_bounded(self, fake_claude, monkeypatch):
+        monkeypatch.setattr(grading_ai, "_GRADE_CACHE_MAX", 2)
+        for text in ("one", "two", "one", "three"):
+            grade_one_submission(_REQ, "Ann", text)
+        fake_claude.clear()
+
+        grade_one_submission(_REQ, "Ann", "one")
+        grade_one_submission(_REQ, "Ann", "two")
+
+        # "one" was used most recently, so "two" was the one dropped
+        assert len(grading_ai._grade_cache) == 2
+        assert len(fake_claude) == 1
+
+    def test_missing_entries_are_graded_one_by_one(self, fake_claude):
+        fake_claude.batch_reply = [
+            {"id": 1, "score": 8, "letter_grade": "B", "comments": "Batch."},
+            {"id": 2, "score": "n/a"},
+        ]
+
+        results = grade_many_submissions(
+            _REQ, [("Ann", "one"), ("Ben", "two"), ("Cat", "three")]
+        )
+
+        assert [r["score"] for r in results] == [8.0, 9.0, 9.0]
+        assert [kind for _, kind in fake_claude] == [list, dict, dict]
+
+    def test_unparseable_answer_grades_everyone_alone(self, fake_claude):
+        fake_claude.batch_reply = ValueError("No JSON array in response")
+
+        results = grade_many_submissions(_REQ, [("Ann", "one"), ("Ben", "two")])
+
+        assert [r["score"] for r in results] == [9.0, 9.0]
+        assert [r["error"] for r in results] == ["", ""]
+
+
+# ===========================================================================
+# _first_json / _claude_json
+# ===========================================================================
+
+class TestFirstJson:
+    """Tests for pulling the first JSON value out of model output."""
+
+    def test_skips_prose_and_nested_values(self):
+        raw = 'Sure! Here it is: {"score": 5, "detail": {"a": [1]}} Hope that helps.'
+        assert _first_json(raw, dict) == {"score": 5, "detail": {"a": [1]}}
+
+    def test_skips_brackets_that_are_not_json(self):
+        raw = 'Grades [draft]: [{"id": 1}]'
+        assert _first_json(raw, list) == [{"id": 1}]
+
+    def test_raises_without_json(self):
+        with pytest.raises(ValueError, match="No JSON array"):
+            _first_json("I could not grade these.", list)
+
+
+@pytest.fixture
+def claude_script(tmp_path, monkeypatch):
+    """Install a fake `claude` shell script with the given body on PATH."""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    def _install(body: str):
+        script = bin_dir / "claude"
+        script.write_text(f"#!/bin/sh\n{body}\n")
+        script.chmod(0o755)
+    return _install
+
+
+@pytest.mark.skipif(os.name != "posix", reason="fake CLI is a shell script")
+class TestClaudeJson:
+    """Tests for running the claude CLI and reading its JSON answer."""
+
+    def test_returns_as_soon_as_value_arrives(self, claude_script):
+        claude_script("""echo 'Here you go:'
+echo '{"score": 5,'
+echo ' "comments": "ok"}'
+sleep 30""")
+
+        started = time.monotonic()
+        assert _claude_json("prompt", 20, dict) == {"score": 5, "comments": "ok"}
+        assert time.monotonic() - started < 10
+
+    def test_timeout_kills_the_whole_tree(self, claude_script):
+        # The backgrounded sleep keeps stdout open after claude itself dies
+        claude_script("sleep 30 &\nsleep 30")
+
+        started = time.monotonic()
+        with pytest.raises(subprocess.TimeoutExpired):
+            _claude_json("prompt", 1, dict)
+        assert time.monotonic() - started < 10
+
+    def test_raises_value_error_without_json(self, claude_script):
+        claude_script("echo 'I cannot help with that.'")
+
+        with pytest.raises(ValueError):
+            _claude_json("prompt", 20, list)
+
+    def test_error_carries_stderr_tail(self, claude_script):
+        claude_script("echo 'Invalid API key' >&2\nexit 1")
+
+        with pytest.raises(ValueError, match="Invalid API key"):
+            _claude_json("prompt", 20, dict)
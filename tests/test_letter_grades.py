@@ -0,0 +1,36 @@
+"""Tests for the shared letter-grade scale."""
+
+from src.letter_grades import score_to_letter
+
+
+class TestScoreToLetter:
+    """Tests for mapping a score to its letter grade."""
+
+    def test_thresholds_are_inclusive(self):
+        expected = {
+            97: "A+", 93: "A", 90: "A-", 87: "B+", 83: "B", 80: "B-",
+            77: "C+", 73: "C", 70: "C-", 67: "D+", 63: "D", 60: "D-",
+        }
+        for score, letter in expected.items():
+            assert score_to_letter(score) == letter
+            assert score_to_letter(score - 0.5) != letter
+
+    def test_low_and_full_scores(self):
+        assert score_to_letter(0) == "F"
+        assert score_to_letter(59) == "F"
+        assert score_to_letter(100) == "A+"
+
+    def test_scales_by_total(self):
+        assert score_to_letter(9, 10) == "A-"
+        assert score_to_letter(4.5, 5) == "A-"
+
+    def test_exact_boundary_is_not_lost_to_rounding(self):
+        # 9.7 * 100 / 10 is 96.999… in floating point; still an A+
+        assert score_to_letter(9.7, 10) == "A+"
+        assert score_to_letter(18.9, 30) == "D"
+
+    def test_non_positive_total(self):
+        assert score_to_letter(5, 0) == "—"
+
+    def test_negative_score_is_f(self):
+        assert score_to_letter(-3) == "F"
@@ -1,34 +1,22 @@
 """Tests for Module 6: Discord Notifier."""
 
-from unittest.mock import MagicMock, patch, call
+import os
+from unittest.mock import MagicMock, patch
 
 import pytest
+import requests
 
 from src.notifier import (
     check_new_submissions,
+    check_new_submissions_iter,
     format_notification_message,
+    load_seen,
+    save_seen,
+    send_all,
+    send_discord_batch,
     send_discord_notification,
 )
-
-
-# ---------------------------------------------------------------------------
-# Helpers
-# ---------------------------------------------------------------------------
-
-def _make_mock_submission(submission_id, user_id, body="Some answer",
-                          submitted_at="2025-11-01T10:00:00Z",
-                          workflow_state="submitted", score=None,
-                          user_name="Jane Doe"):
-    """Helper to create a mock Canvas submission object."""
-    sub = MagicMock()
-    sub.id = submission_id
-    sub.user_id = user_id
-    sub.body = body
-    sub.submitted_at = submitted_at
-    sub.workflow_state = workflow_state
-    sub.score = score
-    sub.user = {"id": user_id, "name": user_name}
-    return sub
+from tests._factories import make_submission, raising
 
 
 # ===========================================================================
@@ -46,9 +34,9 @@ class TestCheckNewSubmissions:
         mock_course.get_assignment.return_value = mock_assignment
 
         subs = [
-            _make_mock_submission(1, 101, user_name="Alice"),
-            _make_mock_submission(2, 102, user_name="Bob"),
-            _make_mock_submission(3, 103, user_name="Charlie"),
+            make_submission(1, 101, user_name="Alice"),
+            make_submission(2, 102, user_name="Bob"),
+            make_submission(3, 103, user_name="Charlie"),
         ]
         mock_assignment.get_submissions.return_value = subs
 
@@ -58,6 +46,18 @@ class TestCheckNewSubmissions:
         ids = {s["id"] for s in result}
         assert ids == {2, 3}
 
+    def test_requests_full_pages(self):
+        mock_canvas = MagicMock()
+        mock_course = MagicMock()
+        mock_assignment = MagicMock()
+        mock_canvas.get_course.return_value = mock_course
+        mock_course.get_assignment.return_value = mock_assignment
+        mock_assignment.get_submissions.return_value = []
+
+        check_new_submissions(mock_canvas, 1001, 42, set())
+        call_kwargs = mock_assignment.get_submissions.call_args[1]
+        assert call_kwargs["per_page"] == 100
+
     def test_returns_empty_when_all_seen(self):
         mock_canvas = MagicMock()
         mock_course = MagicMock()
@@ -66,8 +66,8 @@ class TestCheckNewSubmissions:
         mock_course.get_assignment.return_value = mock_assignment
 
         subs = [
-            _make_mock_submission(1, 101),
-            _make_mock_submission(2, 102),
+            make_submission(1, 101),
+            make_submission(2, 102),
         ]
         mock_assignment.get_submissions.return_value = subs
 
@@ -83,8 +83,8 @@ class TestCheckNewSubmissions:
         mock_course.get_assignment.return_value = mock_assignment
 
         subs = [
-            _make_mock_submission(1, 101, user_name="Alice"),
-            _make_mock_submission(2, 102, user_name="Bob"),
+            make_submission(1, 101, user_name="Alice"),
+            make_submission(2, 102, user_name="Bob"),
         ]
         mock_assignment.get_submissions.return_value = subs
 
@@ -111,9 +111,9 @@ class TestCheckNewSubmissions:
         mock_course.get_assignment.return_value = mock_assignment
 
         subs = [
-            _make_mock_submission(1, 101, workflow_state="submitted", user_name="Alice"),
-            _make_mock_submission(2, 102, workflow_state="unsubmitted", user_name="Bob"),
-            _make_mock_submission(3, 103, workflow_state="graded", user_name="Charlie"),
+            make_submission(1, 101, workflow_state="submitted", user_name="Alice"),
+            make_submission(2, 102, workflow_state="unsubmitted", user_name="Bob"),
+            make_submission(3, 103, workflow_state="graded", user_name="Charlie"),
         ]
         mock_assignment.get_submissions.return_value = subs
 
@@ -131,7 +131,7 @@ class TestCheckNewSubmissions:
         mock_course.get_assignment.return_value = mock_assignment
 
         subs = [
-            _make_mock_submission(
+            make_submission(
                 10, 201, body="My essay",
                 submitted_at="2025-11-05T08:30:00Z",
                 workflow_state="submitted",
@@ -142,6 +142,7 @@ class TestCheckNewSubmissions:
 
         result = check_new_submissions(mock_canvas, 1001, 42, set())
         s = result[0]
+        assert isinstance(s, dict)
         assert s["id"] == 10
         assert s["user_id"] == 201
         assert s["user_name"] == "Alice"
@@ -149,11 +150,61 @@ class TestCheckNewSubmissions:
 
     def test_raises_on_api_error(self):
         mock_canvas = MagicMock()
-        mock_canvas.get_course.side_effect = Exception("API failure")
+        mock_canvas.get_course = raising(Exception("API failure"))
 
         with pytest.raises(RuntimeError, match="Failed to check submissions"):
             check_new_submissions(mock_canvas, 1001, 42, set())
 
+    def test_iter_matches_list_version(self):
+        mock_canvas = MagicMock()
+        mock_course = MagicMock()
+        mock_assignment = MagicMock()
+        mock_canvas.get_course.return_value = mock_course
+        mock_course.get_assignment.return_value = mock_assignment
+
+        subs = [
+            make_submission(1, 101, user_name="Alice"),
+            make_submission(2, 102, workflow_state="unsubmitted"),
+            make_submission(3, 103, user_name="Charlie"),
+            make_submission(4, 104, user_name="Dana"),
+        ]
+        mock_assignment.get_submissions.return_value = subs
+
+        streamed = check_new_submissions_iter(mock_canvas, 1001, 42, {3})
+        assert list(streamed) == check_new_submissions(mock_canvas, 1001, 42, {3})
+
+    def test_iter_raises_on_api_error(self):
+        mock_canvas = MagicMock()
+        mock_canvas.get_course = raising(Exception("API failure"))
+
+        with pytest.raises(RuntimeError, match="Failed to check submissions"):
+            list(check_new_submissions_iter(mock_canvas, 1001, 42, set()))
+
+
+# ===========================================================================
+# load_seen / save_seen
+# ===========================================================================
+
+class TestSeenPersistence:
+    """Tests for persisting seen submission ids between runs."""
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "seen.json"
+        save_seen(path, {3, 1, 2})
+        assert load_seen(path) == {1, 2, 3}
+
+    def test_missing_file_returns_empty(self, tmp_path):
+        assert load_seen(tmp_path / "nope.json") == set()
+
+    def test_corrupt_file_returns_empty(self, tmp_path):
+        path = tmp_path / "seen.json"
+        path.write_text("{not json")
+        assert load_seen(path) == set()
+
+    def test_save_raises_on_unwritable_path(self, tmp_path):
+        with pytest.raises(RuntimeError, match="Failed to save"):
+            save_seen(tmp_path / "missing-dir" / "seen.json", {1})
+
 
 # ===========================================================================
 # format_notification_message
@@ -198,6 +249,7 @@ class TestFormatNotificationMessage:
 # send_discord_notification
 # ===========================================================================
 
+@patch.dict(os.environ, {"DISCORD_WEBHOOK_URL": ""})
 class TestSendDiscordNotification:
     """Tests for sending Discord notifications via openclaw CLI."""
 
@@ -270,3 +322,117 @@ class TestSendDiscordNotification:
 
         result = send_discord_notification(sub, "CS101", "Homework 1")
         assert result is False
+
+
+# ===========================================================================
+# Discord webhook
+# ===========================================================================
+
+_WEBHOOK = "https://discord.test/api/webhooks/1/abc"
+
+
+@patch.dict(os.environ, {"DISCORD_WEBHOOK_URL": _WEBHOOK})
+class TestDiscordWebhook:
+    """Tests for posting through DISCORD_WEBHOOK_URL."""
+
+    @patch("src.notifier.subprocess.run")
+    @patch("src.notifier.http_session")
+    def test_posts_to_webhook_without_openclaw(self, mock_session, mock_run):
+        mock_session.return_value.post.return_value = MagicMock(ok=True)
+        sub = {"id": 1, "user_id": 101, "user_name": "Alice",
+               "submitted_at": "2025-11-01T10:00:00Z"}
+
+        assert send_discord_notification(sub, "CS101", "Homework 1") is True
+        url = mock_session.return_value.post.call_args[0][0]
+        content = mock_session.return_value.post.call_args[1]["json"]["content"]
+        assert url == _WEBHOOK
+        assert "Alice" in content
+        mock_run.assert_not_called()
+
+    @patch("src.notifier.subprocess.run")
+    @patch("src.notifier.http_session")
+    def test_falls_back_to_openclaw_when_unreachable(self, mock_session, mock_run):
+        mock_session.return_value.post = raising(requests.ConnectionError("refused"))
+        mock_run.return_value = MagicMock(returncode=0)
+        sub = {"id": 1, "user_id": 101, "user_name": "Alice",
+               "submitted_at": "2025-11-01T10:00:00Z"}
+
+        assert send_discord_notification(sub, "CS101", "Homework 1") is True
+        mock_run.assert_called_once()
+
+    @pytest.mark.parametrize("post", [
+        raising(requests.ReadTimeout("no answer")),
+        lambda *a, **kw: MagicMock(ok=False, status_code=502),
+    ], ids=["read-timeout", "server-error"])
+    @patch("src.notifier.subprocess.run")
+    @patch("src.notifier.http_session")
+    def test_no_openclaw_once_discord_may_have_it(self, mock_session, mock_run, post):
+        mock_session.return_value.post = post
+        sub = {"id": 1, "user_id": 101, "user_name": "Alice",
+               "submitted_at": "2025-11-01T10:00:00Z"}
+
+        assert send_discord_notification(sub, "CS101", "Homework 1") is False
+        mock_run.assert_not_called()
+
+    @patch("src.notifier.time.sleep")
+    @patch("src.notifier.subprocess.run")
+    @patch("src.notifier.http_session")
+    def test_rate_limit_waits_and_retries_webhook(self, mock_session, mock_run,
+                                                  mock_sleep):
+        mock_session.return_value.post.side_effect = [
+            MagicMock(ok=False, status_code=429, headers={"Retry-After": "1.5"}),
+            MagicMock(ok=True),
+        ]
+        sub = {"id": 1, "user_id": 101, "user_name": "Alice",
+               "submitted_at": "2025-11-01T10:00:00Z"}
+
+        assert send_discord_notification(sub, "CS101", "Homework 1") is True
+        mock_sleep.assert_called_once_with(1.5)
+        assert mock_session.return_value.post.call_count == 2
+        mock_run.assert_not_called()
+
+    @patch("src.notifier.http_session")
+    def test_batch_sends_one_message(self, mock_session):
+        mock_session.return_value.post.return_value = MagicMock(ok=True)
+        subs = [{"id": i, "user_id": i, "user_name": f"Student {i}",
+                 "submitted_at": "2025-11-01T10:00:00Z"} for i in range(5)]
+
+        assert send_discord_batch(subs, "CS101", "Homework 1") is True
+        mock_session.return_value.post.assert_called_once()
+        content = mock_session.return_value.post.call_args[1]["json"]["content"]
+        for i in range(5):
+            assert f"Student {i}" in content
+
+    @patch("src.notifier.http_session")
+    def test_batch_splits_at_discord_limit(self, mock_session):
+        mock_session.return_value.post.return_value = MagicMock(ok=True)
+        subs = [{"id": i, "user_id": i, "user_name": "x" * 500,
+                 "submitted_at": "2025-11-01T10:00:00Z"} for i in range(10)]
+
+        assert send_discord_batch(subs, "CS101", "Homework 1") is True
+        calls = mock_session.return_value.post.call_args_list
+        assert len(calls) > 1
+        assert all(len(c[1]["json"]["content"]) <= 2000 for c in calls)
+
+    @patch("src.notifier.http_session")
+    def test_batch_empty_sends_nothing(self, mock_session):
+        assert send_discord_batch([], "CS101", "Homework 1") is True
+        mock_session.return_value.post.assert_not_called()
+
+    @patch("src.notifier.subprocess.run")
+    @patch("src.notifier.http_session")
+    def test_send_all_returns_results_in_order(self, mock_session, mock_run):
+        mock_session.return_value.post.side_effect = (
+            lambda url, json, timeout: MagicMock(ok="Student 2" not in json["content"])
+        )
+        mock_run.return_value = MagicMock(returncode=1)
+        subs = [{"id": i, "user_id": i, "user_name": f"Student {i}",
+                 "submitted_at": "2025-11-01T10:00:00Z"} for i in range(4)]
+
+        assert send_all(subs, "CS101", "Homework 1") == [True, True, False, True]
+        assert mock_session.return_value.post.call_count == 4
+
+    @patch("src.notifier.http_session")
+    def test_send_all_empty_sends_nothing(self, mock_session):
+        assert send_all([], "CS101", "Homework 1") == []
+        mock_session.return_value.post.assert_not_called()
@@ -1,64 +1,60 @@
 """Tests for Module 3: Student & Grade Management."""
 
-from unittest.mock import MagicMock
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock
 
 import pytest
 
-from src.students import get_students, format_student_grade
+from src.students import format_all_students, format_student_grade, get_students
+from tests._factories import fail_call, make_enrollment
 
 
-def _make_mock_enrollment(user_id, user_name, sortable_name,
-                          current_score=None, current_grade=None,
-                          final_score=None, final_grade=None):
-    """Helper to create a mock Canvas enrollment object with grade info."""
-    enrollment = MagicMock()
-    enrollment.user_id = user_id
-    enrollment.type = "StudentEnrollment"
+# Canned enrollments, built once; get_students() only reads them, and
+# the read-only grades make sure it stays that way
+_GRADES_ALICE = MappingProxyType({"current_score": 95.0, "current_grade": "A",
+                                  "final_score": 92.0, "final_grade": "A-"})
+_GRADES_BOB   = MappingProxyType({"current_score": 82.5, "current_grade": "B",
+                                  "final_score": 80.0, "final_grade": "B-"})
 
-    # User info nested in enrollment
-    enrollment.user = {"id": user_id, "name": user_name, "sortable_name": sortable_name}
+_ALICE = make_enrollment(1, "Alice Smith", "Smith, Alice", grades=_GRADES_ALICE)
+_BOB   = make_enrollment(2, "Bob Jones", "Jones, Bob", grades=_GRADES_BOB)
 
-    # Grades dict as returned by Canvas API
-    enrollment.grades = {
-        "current_score": current_score,
-        "current_grade": current_grade,
-        "final_score": final_score,
-        "final_grade": final_grade,
-    }
+_ONE_STUDENT  = [_ALICE]
+_TWO_STUDENTS = [_ALICE, _BOB]
 
-    return enrollment
 
+@pytest.fixture
+def mock_course():
+    return Mock()
 
-class TestGetStudents:
-    """Tests for fetching students with grades from a course."""
 
-    def test_returns_list_of_students_with_grades(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+@pytest.fixture
+def mock_canvas(mock_course):
+    canvas = Mock()
+    canvas.get_course.return_value = mock_course
+    return canvas
 
-        enrollments = [
-            _make_mock_enrollment(1, "Alice Smith", "Smith, Alice", 95.0, "A", 92.0, "A-"),
-            _make_mock_enrollment(2, "Bob Jones", "Jones, Bob", 82.5, "B", 80.0, "B-"),
-        ]
-        mock_course.get_enrollments.return_value = enrollments
 
-        students = get_students(mock_canvas, 1001)
-        assert len(students) == 2
+class TestGetStudents:
+    """Tests for fetching students with grades from a course."""
 
-    def test_fetches_course_by_id(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+    @pytest.mark.parametrize("enrollments,expected_len", [
+        (_TWO_STUDENTS, 2),
+        (_ONE_STUDENT, 1),
+        ([], 0),
+    ], ids=["two", "one", "none"])
+    def test_returns_one_student_per_enrollment(self, canvas_with_enrollments,
+                                                enrollments, expected_len):
+        students = get_students(canvas_with_enrollments(enrollments), 1001)
+        assert len(students) == expected_len
+
+    def test_fetches_course_by_id(self, mock_canvas, mock_course):
         mock_course.get_enrollments.return_value = []
 
         get_students(mock_canvas, 9999)
         mock_canvas.get_course.assert_called_once_with(9999)
 
-    def test_requests_student_enrollments_with_grades(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+    def test_requests_student_enrollments_with_grades(self, mock_canvas, mock_course):
         mock_course.get_enrollments.return_value = []
 
         get_students(mock_canvas, 1001)
@@ -67,17 +63,15 @@ class TestGetStudents:
         assert call_kwargs["type"] == ["StudentEnrollment"]
         assert "current_points" in call_kwargs["include"]
 
-    def test_returns_dicts_with_expected_keys(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
+    def test_requests_full_pages(self, mock_canvas, mock_course):
+        mock_course.get_enrollments.return_value = []
 
-        enrollments = [
-            _make_mock_enrollment(1, "Alice Smith", "Smith, Alice", 95.0, "A", 92.0, "A-"),
-        ]
-        mock_course.get_enrollments.return_value = enrollments
+        get_students(mock_canvas, 1001)
+        call_kwargs = mock_course.get_enrollments.call_args[1]
+        assert call_kwargs["per_page"] == 100
 
-        students = get_students(mock_canvas, 1001)
+    def test_returns_dicts_with_expected_keys(self, canvas_with_enrollments):
+        students = get_students(canvas_with_enrollments(_ONE_STUDENT), 1001)
         student = students[0]
         assert student["user_id"] == 1
         assert student["name"] == "Alice Smith"
@@ -87,168 +81,102 @@ class TestGetStudents:
         assert student["final_score"] == 92.0
         assert student["final_grade"] == "A-"
 
-    def test_returns_empty_list_when_no_students(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_enrollments.return_value = []
-
-        students = get_students(mock_canvas, 1001)
-        assert students == []
-
-    def test_handles_missing_grades_gracefully(self):
-        """Students with no grade data should get None values."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-
-        enrollment = _make_mock_enrollment(
-            3, "Charlie Brown", "Brown, Charlie",
-            current_score=None, current_grade=None,
-            final_score=None, final_grade=None,
-        )
-        mock_course.get_enrollments.return_value = [enrollment]
-
-        students = get_students(mock_canvas, 1001)
+    @pytest.mark.parametrize("enrollment", [
+        # Grades present but all empty
+        make_enrollment(3, "Charlie Brown", "Brown, Charlie"),
+        # Enrollment object missing the grades attribute entirely
+        SimpleNamespace(
+            user_id=4,
+            user={"id": 4, "name": "Dana White", "sortable_name": "White, Dana"},
+        ),
+    ], ids=["empty_grades", "no_grades_attribute"])
+    def test_missing_grades_become_none(self, canvas_with_enrollments, enrollment):
+        students = get_students(canvas_with_enrollments([enrollment]), 1001)
         student = students[0]
+        assert student["user_id"] == enrollment.user_id
         assert student["current_score"] is None
         assert student["current_grade"] is None
         assert student["final_score"] is None
         assert student["final_grade"] is None
 
-    def test_handles_enrollment_with_no_grades_attribute(self):
-        """Enrollment object missing the grades attribute entirely."""
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-
-        enrollment = MagicMock()
-        enrollment.user_id = 4
-        enrollment.user = {"id": 4, "name": "Dana White", "sortable_name": "White, Dana"}
-        del enrollment.grades
-
-        mock_course.get_enrollments.return_value = [enrollment]
-
-        students = get_students(mock_canvas, 1001)
-        student = students[0]
-        assert student["user_id"] == 4
-        assert student["current_score"] is None
-        assert student["current_grade"] is None
-        assert student["final_score"] is None
-        assert student["final_grade"] is None
-
-    def test_raises_on_api_error(self):
-        mock_canvas = MagicMock()
-        mock_canvas.get_course.side_effect = Exception("API error")
+    @pytest.mark.parametrize("owner,attr", [
+        ("mock_canvas", "get_course"),
+        ("mock_course", "get_enrollments"),
+    ])
+    def test_raises_on_api_error(self, request, mock_canvas, owner, attr):
+        fail_call(request.getfixturevalue(owner), attr)
 
         with pytest.raises(RuntimeError, match="Failed to fetch students"):
             get_students(mock_canvas, 1001)
 
-    def test_raises_on_enrollment_api_error(self):
-        mock_canvas = MagicMock()
-        mock_course = MagicMock()
-        mock_canvas.get_course.return_value = mock_course
-        mock_course.get_enrollments.side_effect = Exception("Enrollment fetch failed")
 
-        with pytest.raises(RuntimeError, match="Failed to fetch students"):
-            get_students(mock_canvas, 1001)
+def _student(user_id, name, sortable_name, current_score, current_grade,
+             final_score, final_grade):
+    return {
+        "user_id": user_id,
+        "name": name,
+        "sortable_name": sortable_name,
+        "current_score": current_score,
+        "current_grade": current_grade,
+        "final_score": final_score,
+        "final_grade": final_grade,
+    }
+
+
+# (student, expected) pairs, built once at import
+_FMT_CASES = [
+    pytest.param(
+        _student(1, "Alice Smith", "Smith, Alice", 95.0, "A", 92.0, "A-"),
+        _student(1, "Alice Smith", "Smith, Alice", "95.0%", "A", "92.0%", "A-"),
+        id="full_grades",
+    ),
+    pytest.param(
+        _student(2, "Bob Jones", "Jones, Bob", None, None, 80.0, "B-"),
+        _student(2, "Bob Jones", "Jones, Bob", None, None, "80.0%", "B-"),
+        id="no_current_grade",
+    ),
+    pytest.param(
+        _student(3, "Charlie Brown", "Brown, Charlie", 88.0, "B+", None, None),
+        _student(3, "Charlie Brown", "Brown, Charlie", "88.0%", "B+", None, None),
+        id="no_final_grade",
+    ),
+    pytest.param(
+        _student(4, "Dana White", "White, Dana", None, None, None, None),
+        _student(4, "Dana White", "White, Dana", None, None, None, None),
+        id="no_grades_at_all",
+    ),
+    # Score exists but letter grade is None (pass/fail courses)
+    pytest.param(
+        _student(5, "Eve Adams", "Adams, Eve", 75.0, None, 70.0, None),
+        _student(5, "Eve Adams", "Adams, Eve", "75.0%", None, "70.0%", None),
+        id="score_without_letter",
+    ),
+]
 
 
 class TestFormatStudentGrade:
     """Tests for formatting a student's grade summary for display."""
 
-    def test_formats_student_with_full_grades(self):
-        student = {
-            "user_id": 1,
-            "name": "Alice Smith",
-            "sortable_name": "Smith, Alice",
-            "current_score": 95.0,
-            "current_grade": "A",
-            "final_score": 92.0,
-            "final_grade": "A-",
-        }
-        result = format_student_grade(student)
-        assert result["name"] == "Alice Smith"
-        assert result["sortable_name"] == "Smith, Alice"
-        assert result["current_grade"] == "A"
-        assert result["current_score"] == "95.0%"
-        assert result["final_grade"] == "A-"
-        assert result["final_score"] == "92.0%"
-
-    def test_formats_student_with_no_current_grade(self):
-        student = {
-            "user_id": 2,
-            "name": "Bob Jones",
-            "sortable_name": "Jones, Bob",
-            "current_score": None,
-            "current_grade": None,
-            "final_score": 80.0,
-            "final_grade": "B-",
-        }
-        result = format_student_grade(student)
-        assert result["current_grade"] is None
-        assert result["current_score"] is None
-        assert result["final_grade"] == "B-"
-        assert result["final_score"] == "80.0%"
-
-    def test_formats_student_with_no_final_grade(self):
-        student = {
-            "user_id": 3,
-            "name": "Charlie Brown",
-            "sortable_name": "Brown, Charlie",
-            "current_score": 88.0,
-            "current_grade": "B+",
-            "final_score": None,
-            "final_grade": None,
-        }
-        result = format_student_grade(student)
-        assert result["current_grade"] == "B+"
-        assert result["current_score"] == "88.0%"
-        assert result["final_grade"] is None
-        assert result["final_score"] is None
-
-    def test_formats_student_with_no_grades_at_all(self):
-        student = {
-            "user_id": 4,
-            "name": "Dana White",
-            "sortable_name": "White, Dana",
-            "current_score": None,
-            "current_grade": None,
-            "final_score": None,
-            "final_grade": None,
-        }
-        result = format_student_grade(student)
-        assert result["current_grade"] is None
-        assert result["current_score"] is None
-        assert result["final_grade"] is None
-        assert result["final_score"] is None
-
-    def test_formats_score_with_no_letter_grade(self):
-        """Score exists but letter grade is None (pass/fail courses)."""
-        student = {
-            "user_id": 5,
-            "name": "Eve Adams",
-            "sortable_name": "Adams, Eve",
-            "current_score": 75.0,
-            "current_grade": None,
-            "final_score": 70.0,
-            "final_grade": None,
-        }
-        result = format_student_grade(student)
-        assert result["current_score"] == "75.0%"
-        assert result["current_grade"] is None
-        assert result["final_score"] == "70.0%"
-        assert result["final_grade"] is None
-
-    def test_includes_user_id(self):
-        student = {
-            "user_id": 1,
-            "name": "Alice Smith",
-            "sortable_name": "Smith, Alice",
-            "current_score": 95.0,
-            "current_grade": "A",
-            "final_score": 92.0,
-            "final_grade": "A-",
-        }
-        result = format_student_grade(student)
-        assert result["user_id"] == 1
+    @pytest.mark.parametrize("student,expected", _FMT_CASES)
+    def test_format_student_grade(self, student, expected):
+        assert format_student_grade(student) == expected
+
+
+class TestFormatAllStudents:
+    """Tests for formatting a whole roster at once."""
+
+    def test_matches_per_student_formatting_in_order(self):
+        students = [
+            {"user_id": 1, "name": "Alice Smith", "sortable_name": "Smith, Alice",
+             "current_score": 95.0, "current_grade": "A",
+             "final_score": 92.0, "final_grade": "A-"},
+            {"user_id": 2, "name": "Bob Jones", "sortable_name": "Jones, Bob",
+             "current_score": None, "current_grade": None,
+             "final_score": None, "final_grade": None},
+        ]
+        assert format_all_students(students) == [
+            format_student_grade(s) for s in students
+        ]
+
+    def test_empty_roster(self):
+        assert format_all_students([]) == []